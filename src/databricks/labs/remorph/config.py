@@ -109,6 +109,8 @@ class ReconcileMetadataConfig:
     catalog: str = "remorph"
     schema: str = "reconcile"
     volume: str = "reconcile_volume"
+    # where the unmatched rows live during a run: volume (parquet), delta, disk or memory (Spark storage levels)
+    intermediate_storage: str = "volume"
 
 
 @dataclass
@@ -123,6 +125,8 @@ class ReconcileConfig:
     metadata_config: ReconcileMetadataConfig
     job_id: str | None = None
     tables: ReconcileTablesConfig | None = None
+    # number of tables reconciled at once, defaults to a per source system limit
+    table_concurrency: int | None = None
 
 
 @dataclass
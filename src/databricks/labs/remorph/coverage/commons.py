@@ -5,8 +5,11 @@ import json
 import logging
 import os
 import subprocess
+import tempfile
 import time
-from collections.abc import Generator
+import tracemalloc
+from collections.abc import Generator, Iterable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import TextIO
@@ -17,8 +20,13 @@ from sqlglot.dialects.dialect import Dialect
 from sqlglot.dialects.databricks import Databricks
 from sqlglot.errors import ErrorLevel
 
+from databricks.labs.blueprint.wheels import ProductInfo
+
 logger = logging.getLogger(__name__)
 
+# the batches handed to the process pool ahead of its workers, so only these are read and held in memory at once
+_BATCHES_PER_WORKER = 2
+
 
 @dataclasses.dataclass
 class ReportEntry:
@@ -35,18 +43,72 @@ class ReportEntry:
     transpiled: int = 0  # 1 for success, 0 for failure
     transpiled_statements: int = 0  # number of statements transpiled
     transpilation_error: str | None = None
+    input_size: int = 0  # number of characters in the input file
+    output_size: int = 0  # number of characters in the generated statements
+    parsing_time_ms: float = 0.0
+    transpilation_time_ms: float = 0.0  # time spent generating the target SQL
+    peak_memory_bytes: int = 0  # peak memory allocated while parsing and generating, as traced by tracemalloc
 
+    @property
+    def total_time_ms(self) -> float:
+        return self.parsing_time_ms + self.transpilation_time_ms
 
-def sqlglot_run_coverage(dialect, subfolder):
+
+@dataclasses.dataclass(frozen=True)
+class TimingRegression:
+    project: str
+    source_dialect: str
+    target_dialect: str
+    file: str
+    baseline_time_ms: float
+    current_time_ms: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_time_ms / self.baseline_time_ms
+
+
+@dataclasses.dataclass(frozen=True)
+class CoverageJob:
+    """One cell of the project x dialect coverage matrix."""
+
+    project: str
+    commit_hash: str
+    version: str
+    source_dialect: type[Dialect]
+    target_dialect: type[Dialect]
+    subfolder: str
+
+
+def get_io_dirs() -> tuple[Path, Path]:
+    """
+    Get the input and output directories of a coverage run from the environment.
+
+    :return: Returns the parent directory of the dialect subfolders and the directory the reports are written to.
+    """
     input_dir = get_env_var("INPUT_DIR_PARENT", required=True)
     output_dir = get_env_var("OUTPUT_DIR", required=True)
-    sqlglot_version = sqlglot.__version__
-    SQLGLOT_COMMIT_HASH = ""  # C0103 pylint
 
     if not input_dir:
         raise ValueError("Environment variable `INPUT_DIR_PARENT` is required")
     if not output_dir:
         raise ValueError("Environment variable `OUTPUT_DIR` is required")
+    return Path(input_dir), Path(output_dir)
+
+
+def get_remorph_version() -> tuple[str, str]:
+    """
+    Get the commit hash and the version of the remorph checkout the coverage runs on.
+
+    :return: Returns the commit hash, empty when it is unknown, and the unreleased version.
+    """
+    return get_current_commit_hash() or "", ProductInfo(__file__).unreleased_version()
+
+
+def sqlglot_run_coverage(dialect, subfolder):
+    input_dir, output_dir = get_io_dirs()
+    sqlglot_version = sqlglot.__version__
+    SQLGLOT_COMMIT_HASH = ""  # C0103 pylint
 
     collect_transpilation_stats(
         "SQLGlot",
@@ -54,23 +116,27 @@ def sqlglot_run_coverage(dialect, subfolder):
         sqlglot_version,
         dialect,
         Databricks,
-        Path(input_dir) / subfolder,
-        Path(output_dir),
+        input_dir / subfolder,
+        output_dir,
     )
 
 
-def local_report(output_dir: Path):
-    all = collections.defaultdict(list)
+def read_report_entries(output_dir: Path) -> Generator[ReportEntry, None, None]:
     for file in output_dir.rglob("*.json"):
         with file.open("r", encoding="utf8") as f:
             for line in f:
-                raw = json.loads(line)
-                entry = ReportEntry(**raw)
-                all[(entry.project, entry.source_dialect)].append(entry)
-    for (project, dialect), entries in sorted(all.items()):
-        total = len(entries)
-        parsed = sum(entry.parsed for entry in entries)
-        transpiled = sum(entry.transpiled for entry in entries)
+                yield ReportEntry(**json.loads(line))
+
+
+def local_report(output_dir: Path):
+    # Only running totals are kept per (project, dialect), so the report runs in constant memory over any history.
+    counts: dict[tuple[str, str], list[int]] = collections.defaultdict(lambda: [0, 0, 0])
+    for entry in read_report_entries(output_dir):
+        totals = counts[(entry.project, entry.source_dialect)]
+        totals[0] += 1
+        totals[1] += entry.parsed
+        totals[2] += entry.transpiled
+    for (project, dialect), (total, parsed, transpiled) in sorted(counts.items()):
         parse_ratio = parsed / total
         transpile_ratio = transpiled / total
         print(
@@ -78,6 +144,61 @@ def local_report(output_dir: Path):
         )
 
 
+def _latest_transpilation_times(output_dir: Path) -> dict[tuple[str, str, str, str], float]:
+    latest: dict[tuple[str, str, str, str], ReportEntry] = {}
+    for entry in read_report_entries(output_dir):
+        if not entry.transpiled:
+            continue
+        key = (entry.project, entry.source_dialect, entry.target_dialect, entry.file)
+        if key not in latest or entry.timestamp > latest[key].timestamp:
+            latest[key] = entry
+    return {key: entry.total_time_ms for key, entry in latest.items()}
+
+
+def compare_transpilation_times(
+    baseline_dir: Path,
+    current_dir: Path,
+    *,
+    threshold: float = 0.25,
+    min_delta_ms: float = 5.0,
+) -> list[TimingRegression]:
+    """
+    Compare the transpilation times of two coverage output directories.
+
+    Only files that transpiled in both runs are compared, using the latest entry per file when a directory holds
+    several runs.
+
+    :param baseline_dir: The output directory of the reference run.
+    :param current_dir: The output directory of the run to check.
+    :param threshold: The relative slowdown above which a file is reported, e.g. 0.25 for 25% slower.
+    :param min_delta_ms: The absolute slowdown a file needs to exceed as well, to filter out timer noise on fast files.
+    :return: Returns the regressed files, the largest slowdown first.
+    """
+    baseline = _latest_transpilation_times(baseline_dir)
+    regressions = []
+    for key, current_time_ms in _latest_transpilation_times(current_dir).items():
+        baseline_time_ms = baseline.get(key)
+        if not baseline_time_ms:
+            continue
+        if current_time_ms - baseline_time_ms <= min_delta_ms:
+            continue
+        if current_time_ms <= baseline_time_ms * (1 + threshold):
+            continue
+        regressions.append(TimingRegression(*key, baseline_time_ms, current_time_ms))
+    return sorted(regressions, key=lambda regression: regression.ratio, reverse=True)
+
+
+def timing_regression_report(baseline_dir: Path, current_dir: Path, threshold: float) -> list[TimingRegression]:
+    regressions = compare_transpilation_times(baseline_dir, current_dir, threshold=threshold)
+    for regression in regressions:
+        print(
+            f"{regression.project} -> {regression.source_dialect}: {regression.file} "
+            f"{regression.baseline_time_ms:.1f}ms -> {regression.current_time_ms:.1f}ms ({regression.ratio:.2f}x)"
+        )
+    print(f"{len(regressions)} file(s) regressed by more than {threshold:.0%}")
+    return regressions
+
+
 def get_supported_sql_files(input_dir: Path) -> Generator[Path, None, None]:
     yield from filter(lambda item: item.is_file() and item.suffix.lower() in [".sql", ".ddl"], input_dir.rglob("*"))
 
@@ -172,23 +293,51 @@ def _prepare_report_entry(
         source_dialect=source_dialect.__name__,
         target_dialect=target_dialect.__name__,
         file=file_path,
+        input_size=len(sql),
     )
+    # The peak memory is traced in the timed pass. A trace the caller started is kept, only its peak is reset.
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline_memory, _ = tracemalloc.get_traced_memory()
+    try:
+        _parse_and_generate(report_entry, sql, source_dialect, target_dialect)
+    finally:
+        _, peak_memory = tracemalloc.get_traced_memory()
+        if not was_tracing:
+            tracemalloc.stop()
+    report_entry.peak_memory_bytes = max(peak_memory - baseline_memory, 0)
+    return report_entry
+
+
+def _parse_and_generate(
+    report_entry: ReportEntry,
+    sql: str,
+    source_dialect: type[Dialect],
+    target_dialect: type[Dialect],
+):
+    start = time.perf_counter()
     try:
         expressions = parse_sql(sql, source_dialect)
         report_entry.parsed = 1
         report_entry.statements = len(expressions)
     except Exception as pe:
         report_entry.parsing_error = str(pe)
-        return report_entry
+        return
+    finally:
+        report_entry.parsing_time_ms = (time.perf_counter() - start) * 1000
 
+    start = time.perf_counter()
     try:
         generated_sqls = generate_sql(expressions, target_dialect)
         report_entry.transpiled = 1
         report_entry.transpiled_statements = len([sql for sql in generated_sqls if sql.strip()])
+        report_entry.output_size = sum(len(sql) for sql in generated_sqls)
     except Exception as te:
         report_entry.transpilation_error = str(te)
-
-    return report_entry
+    finally:
+        report_entry.transpilation_time_ms = (time.perf_counter() - start) * 1000
 
 
 def collect_transpilation_stats(
@@ -217,3 +366,105 @@ def collect_transpilation_stats(
                 sql,
             )
             write_json_line(report_file, report_entry)
+
+
+def _read_sql_batches(input_dir: Path, batch_size: int) -> Generator[list[tuple[str, str]], None, None]:
+    batch: list[tuple[str, str]] = []
+    for input_file in get_supported_sql_files(input_dir):
+        sql = input_file.read_text(encoding="utf-8-sig")
+        file_path = str(input_file.absolute().relative_to(input_dir.parent.absolute()))
+        batch.append((file_path, sql))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _collect_batch_stats(
+    jobs: Sequence[tuple[int, CoverageJob]],
+    batch: Sequence[tuple[str, str]],
+    part_dir: Path,
+):
+    # Every worker process appends to its own part file per job, so no two processes ever share a file handle.
+    pid = os.getpid()
+    part_files: dict[int, TextIO] = {}
+    try:
+        for file_path, sql in batch:
+            for index, job in jobs:
+                if index not in part_files:
+                    part_files[index] = (part_dir / f"{index}_{pid}.jsonl").open("a", encoding="utf8")
+                report_entry = _prepare_report_entry(
+                    job.project,
+                    job.commit_hash,
+                    job.version,
+                    job.source_dialect,
+                    job.target_dialect,
+                    file_path,
+                    sql,
+                )
+                write_json_line(part_files[index], report_entry)
+    finally:
+        for part_file in part_files.values():
+            part_file.close()
+
+
+def _merge_part_files(part_files: Iterable[Path], report_file_path: Path):
+    with report_file_path.open("w", encoding="utf8") as report_file:
+        for part_file in sorted(part_files):
+            with part_file.open("r", encoding="utf8") as part:
+                for line in part:
+                    report_file.write(line)
+
+
+def _raise_batch_errors(futures: Iterable[Future]):
+    for future in futures:
+        future.result()
+
+
+def collect_transpilation_stats_matrix(
+    jobs: Sequence[CoverageJob],
+    input_dir_parent: Path,
+    result_dir: Path,
+    *,
+    max_workers: int | None = None,
+    batch_size: int = 50,
+):
+    """
+    Collect the transpilation stats of a project x dialect matrix in a single invocation.
+
+    Each input file is read once and transpiled by every job that shares its dialect subfolder. Batches of files are
+    processed in a process pool and only a couple of batches per worker are read ahead, so the memory of the run does
+    not grow with the corpus. Every worker writes JSON lines to its own part files, and the parts are merged into one
+    report file per job, in the same layout as `collect_transpilation_stats`.
+
+    :param jobs: The (project, dialect) pairs to collect stats for.
+    :param input_dir_parent: The parent directory of the dialect subfolders.
+    :param result_dir: The directory the report files are written to.
+    :param max_workers: The number of worker processes, defaults to the number of CPUs.
+    :param batch_size: The number of files handed to a worker at once.
+    """
+    jobs_by_subfolder: dict[str, list[tuple[int, CoverageJob]]] = collections.defaultdict(list)
+    for index, job in enumerate(jobs):
+        jobs_by_subfolder[job.subfolder].append((index, job))
+
+    for subfolder in jobs_by_subfolder:
+        _ensure_valid_io_paths(input_dir_parent / subfolder, result_dir)
+
+    with tempfile.TemporaryDirectory(dir=result_dir, prefix=".parts_") as tmp_dir:
+        part_dir = Path(tmp_dir)
+        # Only a few batches per worker are read ahead, the files are read as the workers free up
+        max_pending = (max_workers or os.cpu_count() or 1) * _BATCHES_PER_WORKER
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending: set[Future] = set()
+            for subfolder, subfolder_jobs in jobs_by_subfolder.items():
+                for batch in _read_sql_batches(input_dir_parent / subfolder, batch_size):
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        _raise_batch_errors(done)
+                    pending.add(executor.submit(_collect_batch_stats, subfolder_jobs, batch, part_dir))
+            _raise_batch_errors(wait(pending).done)
+
+        for index, job in enumerate(jobs):
+            report_file_path = _get_report_file_path(job.project, job.source_dialect, job.target_dialect, result_dir)
+            _merge_part_files(part_dir.glob(f"{index}_*.jsonl"), report_file_path)
@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from databricks.labs.remorph.coverage import commons
+from databricks.labs.remorph.coverage.report_store import CoverageReportStore
+
+if __name__ == "__main__":
+    output_dir = commons.get_env_var("OUTPUT_DIR", required=True)
+    history_db = commons.get_env_var("COVERAGE_HISTORY_DB", required=True)
+    if not output_dir:
+        raise ValueError("Environment variable `OUTPUT_DIR` is required")
+    if not history_db:
+        raise ValueError("Environment variable `COVERAGE_HISTORY_DB` is required")
+
+    with CoverageReportStore(Path(history_db)) as store:
+        store.ingest(Path(output_dir))
+        for trend in store.trend(
+            project=commons.get_env_var("PROJECT"),
+            source_dialect=commons.get_env_var("SOURCE_DIALECT"),
+        ):
+            print(
+                f"{trend.day} {trend.project} {trend.version} -> {trend.source_dialect}: "
+                f"{trend.parse_ratio:.2%} parsed ({trend.parsed}/{trend.total}), "
+                f"{trend.transpile_ratio:.2%} transpiled ({trend.transpiled}/{trend.total})"
+            )
@@ -1,22 +1,10 @@
-from pathlib import Path
-
-from databricks.labs.blueprint.wheels import ProductInfo
 from databricks.labs.remorph.coverage import commons
 from databricks.labs.remorph.snow.databricks import Databricks
 from databricks.labs.remorph.snow.snowflake import Snow
 
 if __name__ == "__main__":
-    input_dir = commons.get_env_var("INPUT_DIR_PARENT", required=True)
-    output_dir = commons.get_env_var("OUTPUT_DIR", required=True)
-
-    REMORPH_COMMIT_HASH = commons.get_current_commit_hash() or ""  # C0103 pylint
-    product_info = ProductInfo(__file__)
-    remorph_version = product_info.unreleased_version()
-
-    if not input_dir:
-        raise ValueError("Environment variable `INPUT_DIR_PARENT` is required")
-    if not output_dir:
-        raise ValueError("Environment variable `OUTPUT_DIR` is required")
+    input_dir, output_dir = commons.get_io_dirs()
+    REMORPH_COMMIT_HASH, remorph_version = commons.get_remorph_version()  # C0103 pylint
 
     commons.collect_transpilation_stats(
         "Remorph",
@@ -24,6 +12,6 @@ if __name__ == "__main__":
         remorph_version,
         Snow,
         Databricks,
-        Path(input_dir) / 'snowflake',
-        Path(output_dir),
+        input_dir / 'snowflake',
+        output_dir,
     )
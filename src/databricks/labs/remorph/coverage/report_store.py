@@ -0,0 +1,172 @@
+import dataclasses
+import json
+import logging
+import sqlite3
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from databricks.labs.remorph.coverage.commons import ReportEntry
+
+if TYPE_CHECKING:
+    # typing.Self is only available from Python 3.11
+    from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = [field.name for field in dataclasses.fields(ReportEntry)]
+
+_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS report_entries (
+        project TEXT NOT NULL,
+        commit_hash TEXT,
+        version TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        source_dialect TEXT NOT NULL,
+        target_dialect TEXT NOT NULL,
+        file TEXT NOT NULL,
+        parsed INTEGER NOT NULL,
+        statements INTEGER NOT NULL,
+        parsing_error TEXT,
+        transpiled INTEGER NOT NULL,
+        transpiled_statements INTEGER NOT NULL,
+        transpilation_error TEXT,
+        input_size INTEGER NOT NULL,
+        output_size INTEGER NOT NULL,
+        parsing_time_ms REAL NOT NULL,
+        transpilation_time_ms REAL NOT NULL,
+        peak_memory_bytes INTEGER NOT NULL,
+        report_file TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS report_entries_trend
+    ON report_entries (project, source_dialect, version, timestamp)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ingested_files (
+        path TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL
+    )
+    """,
+]
+
+_TREND_QUERY = """
+SELECT project, source_dialect, version, substr(timestamp, 1, 10) AS day,
+       COUNT(*), SUM(parsed), SUM(transpiled), AVG(parsing_time_ms + transpilation_time_ms)
+FROM report_entries
+WHERE (:project IS NULL OR project = :project)
+  AND (:source_dialect IS NULL OR source_dialect = :source_dialect)
+  AND (:version IS NULL OR version = :version)
+GROUP BY project, source_dialect, version, day
+ORDER BY project, source_dialect, day, version
+"""
+
+
+@dataclasses.dataclass(frozen=True)
+class CoverageTrend:
+    project: str
+    source_dialect: str
+    version: str
+    day: str
+    total: int
+    parsed: int
+    transpiled: int
+    avg_time_ms: float
+
+    @property
+    def parse_ratio(self) -> float:
+        return self.parsed / self.total
+
+    @property
+    def transpile_ratio(self) -> float:
+        return self.transpiled / self.total
+
+
+class CoverageReportStore:
+    """
+    Keeps the history of coverage runs in a SQLite database.
+
+    Report files are streamed into the database line by line and only ingested once, so nightly runs only add the
+    new files. Trend queries are aggregated by SQLite and never load the individual entries into memory.
+    """
+
+    def __init__(self, db_path: Path, *, batch_size: int = 10_000):
+        self._connection = sqlite3.connect(db_path)
+        self._batch_size = batch_size
+        with self._connection:
+            for ddl in _DDL:
+                self._connection.execute(ddl)
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self) -> "Self":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def ingest(self, output_dir: Path) -> int:
+        """
+        Ingest the report files under the output directory that are new or changed since the last ingestion.
+
+        :param output_dir: The coverage output directory.
+        :return: Returns the number of ingested entries.
+        """
+        ingested = 0
+        for file in sorted(output_dir.rglob("*.json")):
+            stat = file.stat()
+            path = str(file.absolute())
+            row = self._connection.execute(
+                "SELECT size, mtime_ns FROM ingested_files WHERE path = ?", (path,)
+            ).fetchone()
+            if row == (stat.st_size, stat.st_mtime_ns):
+                continue
+            with self._connection:
+                if row is not None:
+                    logger.info(f"Report file {file} changed since its last ingestion, replacing its entries")
+                    self._connection.execute("DELETE FROM report_entries WHERE report_file = ?", (path,))
+                ingested += self._insert_entries(path, self._read_entries(file))
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?)", (path, stat.st_size, stat.st_mtime_ns)
+                )
+        return ingested
+
+    def trend(
+        self,
+        *,
+        project: str | None = None,
+        source_dialect: str | None = None,
+        version: str | None = None,
+    ) -> Iterator[CoverageTrend]:
+        """
+        Yield the daily coverage per project, dialect and version, optionally filtered.
+        """
+        parameters = {"project": project, "source_dialect": source_dialect, "version": version}
+        for row in self._connection.execute(_TREND_QUERY, parameters):
+            yield CoverageTrend(*row)
+
+    @staticmethod
+    def _read_entries(file: Path) -> Iterator[ReportEntry]:
+        with file.open("r", encoding="utf8") as f:
+            for line in f:
+                yield ReportEntry(**json.loads(line))
+
+    def _insert_entries(self, report_file: str, entries: Iterable[ReportEntry]) -> int:
+        columns = [*_COLUMNS, "report_file"]
+        statement = f"INSERT INTO report_entries ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        inserted = 0
+        batch = []
+        for entry in entries:
+            batch.append((*dataclasses.astuple(entry), report_file))
+            if len(batch) >= self._batch_size:
+                self._connection.executemany(statement, batch)
+                inserted += len(batch)
+                batch = []
+        if batch:
+            self._connection.executemany(statement, batch)
+            inserted += len(batch)
+        return inserted
@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+from databricks.labs.remorph.coverage import commons
+
+if __name__ == "__main__":
+    baseline_dir = commons.get_env_var("BASELINE_DIR", required=True)
+    output_dir = commons.get_env_var("OUTPUT_DIR", required=True)
+    threshold = commons.get_env_var("REGRESSION_THRESHOLD") or "0.25"
+    if not baseline_dir:
+        raise ValueError("Environment variable `BASELINE_DIR` is required")
+    if not output_dir:
+        raise ValueError("Environment variable `OUTPUT_DIR` is required")
+    if commons.timing_regression_report(Path(baseline_dir), Path(output_dir), float(threshold)):
+        sys.exit(1)
@@ -0,0 +1,24 @@
+import sqlglot
+from sqlglot.dialects.databricks import Databricks as SQLGlotDatabricks
+from sqlglot.dialects.snowflake import Snowflake
+from sqlglot.dialects.tsql import TSQL
+
+from databricks.labs.remorph.coverage import commons
+from databricks.labs.remorph.snow.databricks import Databricks
+from databricks.labs.remorph.snow.snowflake import Snow
+
+if __name__ == "__main__":
+    input_dir, output_dir = commons.get_io_dirs()
+    max_workers = commons.get_env_var("MAX_WORKERS")
+    REMORPH_COMMIT_HASH, remorph_version = commons.get_remorph_version()  # C0103 pylint
+
+    commons.collect_transpilation_stats_matrix(
+        [
+            commons.CoverageJob("Remorph", REMORPH_COMMIT_HASH, remorph_version, Snow, Databricks, "snowflake"),
+            commons.CoverageJob("SQLGlot", "", sqlglot.__version__, Snowflake, SQLGlotDatabricks, "snowflake"),
+            commons.CoverageJob("SQLGlot", "", sqlglot.__version__, TSQL, SQLGlotDatabricks, "tsql"),
+        ],
+        input_dir,
+        output_dir,
+        max_workers=int(max_workers) if max_workers else None,
+    )
@@ -18,6 +18,17 @@ logger = logging.getLogger(__name__)
 _RECON_PREFIX = "Reconciliation"
 RECON_JOB_NAME = f"{_RECON_PREFIX} Runner"
 RECON_METRICS_DASHBOARD_NAME = f"{_RECON_PREFIX} Metrics"
+# the metadata tables, each deployed from the DDL file of the same name
+_RECON_TABLE_NAMES = (
+    "main",
+    "metrics",
+    "details",
+    "watermarks",
+    "sample_metrics",
+    "aggregate_rules",
+    "aggregate_metrics",
+    "aggregate_details",
+)
 
 
 class ReconDeployment:
@@ -70,13 +81,10 @@ class ReconDeployment:
         schema = recon_config.metadata_config.schema
         resources = files(databricks.labs.remorph.resources)
         query_dir = resources.joinpath("reconcile/queries/installation")
-        main_table_file = query_dir.joinpath("main.sql")
-        metrics_table_file = query_dir.joinpath("metrics.sql")
-        details_table_file = query_dir.joinpath("details.sql")
-
-        self._table_deployer.deploy_table_from_ddl_file(catalog, schema, "main", main_table_file)
-        self._table_deployer.deploy_table_from_ddl_file(catalog, schema, "metrics", metrics_table_file)
-        self._table_deployer.deploy_table_from_ddl_file(catalog, schema, "details", details_table_file)
+        for table_name in _RECON_TABLE_NAMES:
+            self._table_deployer.deploy_table_from_ddl_file(
+                catalog, schema, table_name, query_dir.joinpath(f"{table_name}.sql")
+            )
 
     def _deploy_dashboards(self, recon_config: ReconcileConfig):
         logger.info("Deploying reconciliation dashboards.")
@@ -1,10 +1,13 @@
 import logging
+import re
 from importlib.abc import Traversable
 
 from databricks.labs.lsql.backends import SqlBackend
 
 logger = logging.getLogger(__name__)
 
+_CLUSTER_BY = re.compile(r"\)\s*CLUSTER\s+BY\s*\(([^)]*)\)\s*;?\s*$", re.IGNORECASE)
+
 
 class TableDeployment:
     def __init__(self, sql_backend: SqlBackend):
@@ -28,3 +31,10 @@ class TableDeployment:
         logger.info(f"Deploying table {table_name} in {catalog}.{schema}")
         logger.info(f"SQL Backend used for deploying table: {type(self._sql_backend).__name__}")
         self._sql_backend.execute(query, catalog=catalog, schema=schema)
+        cluster_by = _CLUSTER_BY.search(query)
+        if cluster_by:
+            # CREATE TABLE IF NOT EXISTS leaves a table deployed by an earlier version as it is, this clusters it too
+            logger.info(f"Clustering table {table_name} by {cluster_by.group(1)}")
+            self._sql_backend.execute(
+                f"ALTER TABLE {table_name} CLUSTER BY ({cluster_by.group(1)})", catalog=catalog, schema=schema
+            )
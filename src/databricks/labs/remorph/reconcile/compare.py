@@ -1,7 +1,8 @@
 import logging
+import math
 from functools import reduce
-from pyspark.sql import DataFrame, SparkSession
-from pyspark.sql.functions import col, expr, lit
+from pyspark.sql import DataFrame, Observation
+from pyspark.sql.functions import coalesce, col, collect_list, count, expr, lit, sum as sum_, when
 
 from databricks.labs.remorph.reconcile.exception import ColumnMismatchException
 from databricks.labs.remorph.reconcile.recon_capture import (
@@ -10,6 +11,8 @@ from databricks.labs.remorph.reconcile.recon_capture import (
 from databricks.labs.remorph.reconcile.recon_config import (
     DataReconcileOutput,
     MismatchOutput,
+    RateEstimate,
+    SampleReconcileOutput,
     AggregateRule,
     ColumnMapping,
 )
@@ -17,7 +20,11 @@ from databricks.labs.remorph.reconcile.recon_config import (
 logger = logging.getLogger(__name__)
 
 _HASH_COLUMN_NAME = "hash_value_recon"
-_SAMPLE_ROWS = 50
+_BUCKET_COLUMN_NAME = "bucket_id"
+_BUCKET_SUMMARY_COLUMNS = ["row_count", "hash_sum_1", "hash_sum_2"]
+# the z score of the two sided 95% confidence interval
+_CONFIDENCE_LEVEL = 0.95
+_Z_SCORE = 1.959964
 
 
 def raise_column_mismatch_exception(msg: str, source_missing: list[str], target_missing: list[str]) -> Exception:
@@ -42,17 +49,35 @@ def reconcile_data(
     target: DataFrame,
     key_columns: list[str],
     report_type: str,
-    spark: SparkSession,
-    path: str,
+    intermediate_persist: ReconIntermediatePersist,
+    sample_rows: int,
+    compact_hash: bool = False,
+    threshold_columns: list[str] | None = None,
 ) -> DataReconcileOutput:
+    """
+    Join the hash datasets of the source and target and persist the rows that do not match.
+
+    The threshold columns, read alongside the hashes, are not part of the hash: the rows found on both sides whose
+    threshold columns differ are persisted as well and returned as the source and target threshold data, to be
+    compared without another read of the tables.
+    """
     source_alias = "src"
     target_alias = "tgt"
-    if report_type not in {"data", "all"}:
+    if report_type not in {"data", "all", "sample"}:
         key_columns = [_HASH_COLUMN_NAME]
+    if compact_hash:
+        # the engines return the integer hash with different numeric types
+        source = source.withColumn(_HASH_COLUMN_NAME, col(_HASH_COLUMN_NAME).cast("bigint"))
+        target = target.withColumn(_HASH_COLUMN_NAME, col(_HASH_COLUMN_NAME).cast("bigint"))
+    # the record counts are collected by the same job that writes the join, no extra scan of source or target.
+    # Spark Connect drops the metrics of an observation nested under another one, so none is added above the join.
+    source_observation = Observation()
+    target_observation = Observation()
     df = (
-        source.alias(source_alias)
+        source.observe(source_observation, count(lit(1)).alias("count"))
+        .alias(source_alias)
         .join(
-            other=target.alias(target_alias),
+            other=target.observe(target_observation, count(lit(1)).alias("count")).alias(target_alias),
             on=_generate_join_condition(source_alias, target_alias, key_columns),
             how="full",
         )
@@ -62,11 +87,28 @@ def reconcile_data(
         )
     )
 
-    # Write unmatched df to volume
-    df = ReconIntermediatePersist(spark, path).write_and_read_unmatched_df_with_volumes(df)
-    logger.warning(f"Unmatched data is written to {path} successfully")
+    # Only the unmatched rows are written to the volume, usually that is a tiny fraction of the join
+    src_hash = col(f"{source_alias}_{_HASH_COLUMN_NAME}")
+    tgt_hash = col(f"{target_alias}_{_HASH_COLUMN_NAME}")
+    threshold_columns = threshold_columns or []
+    matched = reduce(
+        lambda a, b: a & b,
+        [col(f"{source_alias}_{name}").eqNullSafe(col(f"{target_alias}_{name}")) for name in threshold_columns],
+        src_hash.isNotNull() & tgt_hash.isNotNull() & (src_hash == tgt_hash),
+    )
+    df = df.filter(~matched)
 
-    mismatch = _get_mismatch_data(df, source_alias, target_alias) if report_type in {"all", "data"} else None
+    # Write unmatched df to volume
+    df = intermediate_persist.write_and_read_unmatched_df_with_volumes(df)
+    logger.warning(f"Unmatched data is written to {intermediate_persist.path} successfully")
+    source_record_count = source_observation.get.get("count")
+    target_record_count = target_observation.get.get("count")
+
+    mismatch = (
+        _get_mismatch_data(df, source_alias, target_alias, threshold_columns)
+        if report_type in {"all", "data", "sample"}
+        else None
+    )
 
     missing_in_src = (
         df.filter(col(f"{source_alias}_{_HASH_COLUMN_NAME}").isNull())
@@ -77,7 +119,7 @@ def reconcile_data(
                 if col_name.startswith(f'{target_alias}_')
             ]
         )
-        .drop(_HASH_COLUMN_NAME)
+        .drop(_HASH_COLUMN_NAME, *threshold_columns)
     )
 
     missing_in_tgt = (
@@ -89,26 +131,138 @@ def reconcile_data(
                 if col_name.startswith(f'{source_alias}_')
             ]
         )
-        .drop(_HASH_COLUMN_NAME)
+        .drop(_HASH_COLUMN_NAME, *threshold_columns)
     )
-    mismatch_count = 0
-    if mismatch:
-        mismatch_count = mismatch.count()
-
-    missing_in_src_count = missing_in_src.count()
-    missing_in_tgt_count = missing_in_tgt.count()
+    mismatch_count, missing_in_src_count, missing_in_tgt_count = _get_diff_counts(df, source_alias, target_alias)
+    # every source row is either matched, mismatched or missing in target, so the matched rows need no scan
+    matched_count = 0
+    if source_record_count is not None:
+        matched_count = max(source_record_count - mismatch_count - missing_in_tgt_count, 0)
 
     return DataReconcileOutput(
-        mismatch_count=mismatch_count,
+        mismatch_count=mismatch_count if mismatch is not None else 0,
         missing_in_src_count=missing_in_src_count,
         missing_in_tgt_count=missing_in_tgt_count,
-        missing_in_src=missing_in_src.limit(_SAMPLE_ROWS),
-        missing_in_tgt=missing_in_tgt.limit(_SAMPLE_ROWS),
+        missing_in_src=missing_in_src.limit(sample_rows),
+        missing_in_tgt=missing_in_tgt.limit(sample_rows),
         mismatch=MismatchOutput(mismatch_df=mismatch),
+        matched_count=matched_count,
+        source_record_count=source_record_count,
+        target_record_count=target_record_count,
+        threshold_data=(
+            _get_threshold_data(df, source_alias, target_alias, threshold_columns) if threshold_columns else None
+        ),
+    )
+
+
+def _get_threshold_data(
+    df: DataFrame,
+    src_alias: str,
+    tgt_alias: str,
+    threshold_columns: list[str],
+) -> tuple[DataFrame, DataFrame]:
+    # the key and threshold columns of the rows found on both sides, the rows whose threshold columns are equal
+    # were not persisted and cannot breach a threshold
+    both_sides = df.filter(
+        col(f"{src_alias}_{_HASH_COLUMN_NAME}").isNotNull() & col(f"{tgt_alias}_{_HASH_COLUMN_NAME}").isNotNull()
     )
 
+    def side(alias: str) -> DataFrame:
+        return both_sides.select(
+            *[
+                col(col_name).alias(col_name.replace(f'{alias}_', '', 1).lower())
+                for col_name in df.columns
+                if col_name.startswith(f'{alias}_') and col_name != f"{alias}_{_HASH_COLUMN_NAME}"
+            ]
+        )
+
+    return side(src_alias), side(tgt_alias)
+
 
-def _get_mismatch_data(df: DataFrame, src_alias: str, tgt_alias: str) -> DataFrame:
+def estimate_sample_rates(reconcile_output: DataReconcileOutput, sample_percentage: float) -> SampleReconcileOutput:
+    """
+    Estimate the mismatch and missing rates of the whole table from the reconciled sample. The mismatches and the
+    rows missing in target are rates of the sampled source rows, the rows missing in source of the sampled target rows.
+    """
+    source_count = reconcile_output.source_record_count or 0
+    target_count = reconcile_output.target_record_count or 0
+    return SampleReconcileOutput(
+        sample_percentage=sample_percentage,
+        confidence_level=_CONFIDENCE_LEVEL,
+        mismatch_rate=_wilson_interval(reconcile_output.mismatch_count, source_count),
+        missing_in_src_rate=_wilson_interval(reconcile_output.missing_in_src_count, target_count),
+        missing_in_tgt_rate=_wilson_interval(reconcile_output.missing_in_tgt_count, source_count),
+        source_sample_count=source_count,
+        target_sample_count=target_count,
+    )
+
+
+def _wilson_interval(hits: int, total: int) -> RateEstimate:
+    # unlike the normal approximation, the Wilson score interval stays within [0, 1] and is not empty for a rate of 0,
+    # which is the usual outcome of a healthy table
+    if total == 0:
+        return RateEstimate(rate=0.0, lower_bound=0.0, upper_bound=1.0)
+    rate = hits / total
+    z_squared = _Z_SCORE**2
+    denominator = 1 + z_squared / total
+    centre = (rate + z_squared / (2 * total)) / denominator
+    margin = _Z_SCORE * math.sqrt(rate * (1 - rate) / total + z_squared / (4 * total**2)) / denominator
+    lower_bound = max(centre - margin, 0.0) if hits > 0 else 0.0
+    return RateEstimate(rate=rate, lower_bound=lower_bound, upper_bound=min(centre + margin, 1.0))
+
+
+def compare_hash_buckets(source: DataFrame, target: DataFrame) -> tuple[list[int], int, int]:
+    """
+    Compare the per bucket hash summaries of the source and target, see `HashQueryBuilder.build_bucket_query`.
+
+    :return: the ids of the buckets that differ, with the source and target record counts.
+    """
+
+    def summary(df: DataFrame, alias: str) -> DataFrame:
+        # the engines return the sums with different numeric types
+        return df.select(
+            col(_BUCKET_COLUMN_NAME).cast("bigint").alias(_BUCKET_COLUMN_NAME),
+            *[col(column).cast("decimal(38,0)").alias(f"{alias}_{column}") for column in _BUCKET_SUMMARY_COLUMNS],
+        )
+
+    differs = reduce(
+        lambda a, b: a | b,
+        [~col(f"src_{column}").eqNullSafe(col(f"tgt_{column}")) for column in _BUCKET_SUMMARY_COLUMNS],
+    )
+    result = (
+        summary(source, "src")
+        .join(summary(target, "tgt"), on=_BUCKET_COLUMN_NAME, how="full")
+        .agg(
+            collect_list(when(differs, col(_BUCKET_COLUMN_NAME))).alias("buckets"),
+            sum_(col("src_row_count")).alias("source_count"),
+            sum_(col("tgt_row_count")).alias("target_count"),
+        )
+        .collect()[0]
+    )
+    return sorted(result["buckets"]), int(result["source_count"] or 0), int(result["target_count"] or 0)
+
+
+def _get_diff_counts(df: DataFrame, src_alias: str, tgt_alias: str) -> tuple[int, int, int]:
+    """
+    Count the mismatched, missing in source and missing in target rows of the joined data with one scan, instead of
+    one count per filter.
+    """
+    src_hash = col(f"{src_alias}_{_HASH_COLUMN_NAME}")
+    tgt_hash = col(f"{tgt_alias}_{_HASH_COLUMN_NAME}")
+    counts = df.agg(
+        count(when(src_hash.isNotNull() & tgt_hash.isNotNull() & (src_hash != tgt_hash), True)).alias("mismatch"),
+        count(when(src_hash.isNull(), True)).alias("missing_in_src"),
+        count(when(tgt_hash.isNull(), True)).alias("missing_in_tgt"),
+    ).collect()[0]
+    return counts["mismatch"], counts["missing_in_src"], counts["missing_in_tgt"]
+
+
+def _get_mismatch_data(
+    df: DataFrame,
+    src_alias: str,
+    tgt_alias: str,
+    threshold_columns: list[str],
+) -> DataFrame:
     return (
         df.filter(
             (col(f"{src_alias}_{_HASH_COLUMN_NAME}").isNotNull())
@@ -126,7 +280,7 @@ def _get_mismatch_data(df: DataFrame, src_alias: str, tgt_alias: str) -> DataFra
                 if col_name.startswith(f'{src_alias}_')
             ]
         )
-        .drop(_HASH_COLUMN_NAME)
+        .drop(_HASH_COLUMN_NAME, *threshold_columns)
     )
 
 
@@ -142,19 +296,20 @@ def capture_mismatch_data_and_columns(source: DataFrame, target: DataFrame, key_
 
     check_columns = [column for column in source_columns if column not in key_columns]
     mismatch_df = _get_mismatch_df(source, target, key_columns, check_columns)
-    mismatch_columns = _get_mismatch_columns(mismatch_df, check_columns)
-    return MismatchOutput(mismatch_df, mismatch_columns)
+    mismatch_column_counts = _get_mismatch_column_counts(mismatch_df, check_columns)
+    mismatch_columns = [column for column, mismatch_count in mismatch_column_counts.items() if mismatch_count > 0]
+    return MismatchOutput(mismatch_df, mismatch_columns, mismatch_column_counts)
 
 
-def _get_mismatch_columns(df: DataFrame, columns: list[str]):
-    # Collect the DataFrame to a local variable
-    local_df = df.collect()
-    mismatch_columns = []
-    for column in columns:
-        # Check if any row has False in the column
-        if any(not row[column + "_match"] for row in local_df):
-            mismatch_columns.append(column)
-    return mismatch_columns
+def _get_mismatch_column_counts(df: DataFrame, columns: list[str]) -> dict[str, int]:
+    # One aggregation counts the rows of every column not matching, only a count per column reaches the driver,
+    # an aggregation without a grouping always returns a single row
+    if not columns:
+        return {}
+    counts = df.agg(
+        *[count(when(~coalesce(col(column + "_match"), lit(False)), 1)).alias(column) for column in columns]
+    ).collect()[0]
+    return {column: counts[column] for column in columns}
 
 
 def _get_mismatch_df(source: DataFrame, target: DataFrame, key_columns: list[str], column_list: list[str]):
@@ -301,6 +456,7 @@ def reconcile_agg_data_per_rule(
     source_columns: list[str],
     target_columns: list[str],
     rule: AggregateRule,
+    sample_rows: int,
 ) -> DataReconcileOutput:
     """ "
     Generates the reconciliation output for the given rule
@@ -353,8 +509,8 @@ def reconcile_agg_data_per_rule(
         mismatch_count=mismatch_count,
         missing_in_src_count=missing_in_src.count(),
         missing_in_tgt_count=missing_in_tgt.count(),
-        missing_in_src=missing_in_src.limit(_SAMPLE_ROWS),
-        missing_in_tgt=missing_in_tgt.limit(_SAMPLE_ROWS),
+        missing_in_src=missing_in_src.limit(sample_rows),
+        missing_in_tgt=missing_in_tgt.limit(sample_rows),
         mismatch=MismatchOutput(mismatch_df=mismatch),
     )
 
@@ -365,8 +521,8 @@ def join_aggregate_data(
     source: DataFrame,
     target: DataFrame,
     key_columns: list[str] | None,
-    spark: SparkSession,
-    path: str,
+    intermediate_persist: ReconIntermediatePersist,
+    sub_path: str = "",
 ) -> DataFrame:
     # TODO:  Integrate with reconcile_data function
 
@@ -396,7 +552,7 @@ def join_aggregate_data(
     )
 
     # Write the joined df to volume path
-    joined_volume_df = ReconIntermediatePersist(spark, path).write_and_read_unmatched_df_with_volumes(joined_df).cache()
-    logger.warning(f"Unmatched data is written to {path} successfully")
+    joined_volume_df = intermediate_persist.write_and_read_unmatched_df_with_volumes(joined_df, sub_path).cache()
+    logger.warning(f"Unmatched data is written to {intermediate_persist.path}{sub_path} successfully")
 
     return joined_volume_df
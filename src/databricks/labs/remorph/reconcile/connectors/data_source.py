@@ -31,6 +31,28 @@ class DataSource(ABC):
     ) -> list[Schema]:
         return NotImplemented
 
+    def get_schemas(
+        self,
+        catalog: str | None,
+        schema: str,
+        tables: list[str],
+    ) -> dict[str, list[Schema]]:
+        """
+        Fetch the schemas of several tables in the same catalog and schema, keyed by table name.
+
+        Sources that can list the columns of many tables with a single metadata query override this, by default the
+        schemas are fetched table by table.
+        """
+        return {table: self.get_schema(catalog, schema, table) for table in tables}
+
+    @staticmethod
+    def _group_schemas(tables: list[str], rows: list[tuple[str, str, str]]) -> dict[str, list[Schema]]:
+        # rows are (table_name, column_name, data_type), tables without columns get an empty schema like get_schema
+        schemas: dict[str, list[Schema]] = {table.lower(): [] for table in tables}
+        for table_name, column_name, data_type in rows:
+            schemas.setdefault(table_name.lower(), []).append(Schema(column_name.lower(), data_type.lower()))
+        return {table: schemas[table.lower()] for table in tables}
+
     @classmethod
     def log_and_throw_exception(cls, exception: Exception, fetch_type: str, query: str):
         error_msg = f"Runtime exception occurred while fetching {fetch_type} using {query} : {exception}"
@@ -32,6 +32,20 @@ def _get_schema_query(catalog: str, schema: str, table: str):
     return re.sub(r'\s+', ' ', query)
 
 
+def _get_schemas_query(catalog: str, schema: str, tables: list[str]):
+    table_names = ", ".join(f"'{table.lower()}'" for table in tables)
+    query = f"""select 
+                            lower(table_name) as table_name,
+                            lower(column_name) as col_name,
+                             full_data_type as data_type
+                       from {catalog}.information_schema.columns
+                       where lower(table_catalog)='{catalog}' 
+                                    and lower(table_schema)='{schema}'
+                                     and lower(table_name) in ({table_names})
+                       order by table_name, col_name"""
+    return re.sub(r'\s+', ' ', query)
+
+
 class DatabricksDataSource(DataSource, SecretsMixin):
 
     def __init__(
@@ -41,10 +55,9 @@ class DatabricksDataSource(DataSource, SecretsMixin):
         ws: WorkspaceClient,
         secret_scope: str,
     ):
+        SecretsMixin.__init__(self, ws, secret_scope)
         self._engine = engine
         self._spark = spark
-        self._ws = ws
-        self._secret_scope = secret_scope
 
     def read_data(
         self,
@@ -81,3 +94,25 @@ class DatabricksDataSource(DataSource, SecretsMixin):
             return [Schema(field.col_name.lower(), field.data_type.lower()) for field in schema_metadata]
         except (RuntimeError, PySparkException) as e:
             return self.log_and_throw_exception(e, "schema", schema_query)
+
+    def get_schemas(
+        self,
+        catalog: str | None,
+        schema: str,
+        tables: list[str],
+    ) -> dict[str, list[Schema]]:
+        catalog_str = catalog if catalog else "hive_metastore"
+        if catalog_str == "hive_metastore":
+            # hive_metastore has no information_schema, every table is described on its own
+            return super().get_schemas(catalog, schema, tables)
+        schema_query = _get_schemas_query(catalog_str, schema, tables)
+        try:
+            logger.debug(f"Fetching schemas using query: \n`{schema_query}`")
+            logger.info(f"Fetching Schemas of {len(tables)} tables: Started at: {datetime.now()}")
+            schema_metadata = self._spark.sql(schema_query).distinct().collect()
+            logger.info(f"Schemas fetched successfully. Completed at: {datetime.now()}")
+            return self._group_schemas(
+                tables, [(field.table_name, field.col_name, field.data_type) for field in schema_metadata]
+            )
+        except (RuntimeError, PySparkException) as e:
+            return self.log_and_throw_exception(e, "schema", schema_query)
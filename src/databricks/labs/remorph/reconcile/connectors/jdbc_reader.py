@@ -2,6 +2,8 @@ from pyspark.sql import SparkSession
 
 from databricks.labs.remorph.reconcile.recon_config import JdbcReaderOptions
 
+_DEFAULT_FETCH_SIZE = 100
+
 
 class JDBCReaderMixin:
     _spark: SparkSession
@@ -21,10 +23,18 @@ class JDBCReaderMixin:
 
     @staticmethod
     def _get_jdbc_reader_options(options: JdbcReaderOptions):
-        return {
-            "numPartitions": options.number_partitions,
-            "partitionColumn": options.partition_column,
-            "lowerBound": options.lower_bound,
-            "upperBound": options.upper_bound,
-            "fetchsize": options.fetch_size,
-        }
+        reader_options: dict[str, str | int] = {"fetchsize": options.fetch_size or _DEFAULT_FETCH_SIZE}
+        if (
+            options.number_partitions
+            and options.number_partitions > 1
+            and options.partition_column
+            and options.lower_bound is not None
+            and options.upper_bound is not None
+        ):
+            reader_options |= {
+                "numPartitions": options.number_partitions,
+                "partitionColumn": options.partition_column,
+                "lowerBound": options.lower_bound,
+                "upperBound": options.upper_bound,
+            }
+        return reader_options
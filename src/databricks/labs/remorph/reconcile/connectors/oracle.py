@@ -29,6 +29,21 @@ class OracleDataSource(DataSource, SecretsMixin, JDBCReaderMixin):
                                               end data_type
                                               FROM ALL_TAB_COLUMNS
                             WHERE lower(TABLE_NAME) = '{table}' and lower(owner) = '{owner}'"""
+    _SCHEMAS_QUERY = """select table_name, column_name, case when (data_precision is not null
+                                              and data_scale <> 0)
+                                              then data_type || '(' || data_precision || ',' || data_scale || ')'
+                                              when (data_precision is not null and data_scale = 0)
+                                              then data_type || '(' || data_precision || ')'
+                                              when data_precision is null and (lower(data_type) in ('date') or
+                                              lower(data_type) like 'timestamp%') then  data_type
+                                              when CHAR_LENGTH == 0 then data_type
+                                              else data_type || '(' || CHAR_LENGTH || ')'
+                                              end data_type
+                                              FROM ALL_TAB_COLUMNS
+                            WHERE lower(TABLE_NAME) in ({tables}) and lower(owner) = '{owner}'
+                            ORDER BY table_name, column_id"""
+    # Oracle accepts at most 1000 expressions in an IN list
+    _SCHEMAS_BATCH_SIZE = 1000
 
     def __init__(
         self,
@@ -37,10 +52,9 @@ class OracleDataSource(DataSource, SecretsMixin, JDBCReaderMixin):
         ws: WorkspaceClient,
         secret_scope: str,
     ):
+        SecretsMixin.__init__(self, ws, secret_scope)
         self._engine = engine
         self._spark = spark
-        self._ws = ws
-        self._secret_scope = secret_scope
 
     @property
     def get_jdbc_url(self) -> str:
@@ -87,6 +101,34 @@ class OracleDataSource(DataSource, SecretsMixin, JDBCReaderMixin):
         except (RuntimeError, PySparkException) as e:
             return self.log_and_throw_exception(e, "schema", schema_query)
 
+    def get_schemas(
+        self,
+        catalog: str | None,
+        schema: str,
+        tables: list[str],
+    ) -> dict[str, list[Schema]]:
+        schemas: dict[str, list[Schema]] = {}
+        for start in range(0, len(tables), OracleDataSource._SCHEMAS_BATCH_SIZE):
+            batch = tables[start : start + OracleDataSource._SCHEMAS_BATCH_SIZE]
+            schema_query = re.sub(
+                r'\s+',
+                ' ',
+                OracleDataSource._SCHEMAS_QUERY.format(
+                    tables=", ".join(f"'{table.lower()}'" for table in batch), owner=schema
+                ),
+            )
+            try:
+                logger.debug(f"Fetching schemas using query: \n`{schema_query}`")
+                logger.info(f"Fetching Schemas of {len(batch)} tables: Started at: {datetime.now()}")
+                schema_metadata = self.reader(schema_query).load().collect()
+                logger.info(f"Schemas fetched successfully. Completed at: {datetime.now()}")
+            except (RuntimeError, PySparkException) as e:
+                return self.log_and_throw_exception(e, "schema", schema_query)
+            schemas |= self._group_schemas(
+                batch, [(field.table_name, field.column_name, field.data_type) for field in schema_metadata]
+            )
+        return schemas
+
     @staticmethod
     def _get_timestamp_options() -> dict[str, str]:
         return {
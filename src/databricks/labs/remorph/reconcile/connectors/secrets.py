@@ -1,5 +1,7 @@
 import base64
 import logging
+import threading
+import time
 
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.errors import NotFound
@@ -8,10 +10,41 @@ logger = logging.getLogger(__name__)
 
 
 class SecretsMixin:
-    _ws: WorkspaceClient
-    _secret_scope: str
+    # secrets are reused for this many seconds before they are fetched again, so rotated credentials are picked up
+    _secret_ttl_seconds: float = 15 * 60
+
+    def __init__(self, ws: WorkspaceClient, secret_scope: str):
+        self._ws = ws
+        self._secret_scope = secret_scope
+        self._secrets: dict[str, tuple[str, float]] = {}
+        self._secrets_lock = threading.Lock()
+        # a lock per secret key, so a fetch only waits on the fetches of the same secret
+        self._secret_key_locks: dict[str, threading.Lock] = {}
+
+    def _get_cached_secret(self, secret_key: str) -> str | None:
+        with self._secrets_lock:
+            cached = self._secrets.get(secret_key)
+        if cached is not None and time.monotonic() - cached[1] < self._secret_ttl_seconds:
+            return cached[0]
+        return None
 
     def _get_secret(self, secret_key: str) -> str:
+        """Get the secret value given a secret scope & secret key, cached per data source for the secret TTL."""
+        value = self._get_cached_secret(secret_key)
+        if value is not None:
+            return value
+        with self._secrets_lock:
+            key_lock = self._secret_key_locks.setdefault(secret_key, threading.Lock())
+        with key_lock:
+            # the secret may have been fetched while waiting on the lock
+            value = self._get_cached_secret(secret_key)
+            if value is None:
+                value = self._fetch_secret(secret_key)
+                with self._secrets_lock:
+                    self._secrets[secret_key] = (value, time.monotonic())
+        return value
+
+    def _fetch_secret(self, secret_key: str) -> str:
         """Get the secret value given a secret scope & secret key. Log a warning if secret does not exist"""
         try:
             # Return the decoded secret value in string format
@@ -42,6 +42,19 @@ class SnowflakeDataSource(DataSource, SecretsMixin, JDBCReaderMixin):
                                                       from {catalog}.INFORMATION_SCHEMA.COLUMNS
                                                       where lower(table_name)='{table}' and table_schema = '{schema}' 
                                                       order by ordinal_position"""
+    _SCHEMAS_QUERY = """select table_name, column_name,
+                                                      case
+                                                            when numeric_precision is not null and numeric_scale is not null
+                                                            then 
+                                                                concat(data_type, '(', numeric_precision, ',' , numeric_scale, ')')
+                                                            when lower(data_type) = 'text'
+                                                            then 
+                                                                concat('varchar', '(', CHARACTER_MAXIMUM_LENGTH, ')')
+                                                            else data_type
+                                                      end as data_type
+                                                      from {catalog}.INFORMATION_SCHEMA.COLUMNS
+                                                      where lower(table_name) in ({tables}) and table_schema = '{schema}' 
+                                                      order by table_name, ordinal_position"""
 
     def __init__(
         self,
@@ -50,10 +63,9 @@ class SnowflakeDataSource(DataSource, SecretsMixin, JDBCReaderMixin):
         ws: WorkspaceClient,
         secret_scope: str,
     ):
+        SecretsMixin.__init__(self, ws, secret_scope)
         self._engine = engine
         self._spark = spark
-        self._ws = ws
-        self._secret_scope = secret_scope
 
     @property
     def get_jdbc_url(self) -> str:
@@ -114,6 +126,33 @@ class SnowflakeDataSource(DataSource, SecretsMixin, JDBCReaderMixin):
         except (RuntimeError, PySparkException) as e:
             return self.log_and_throw_exception(e, "schema", schema_query)
 
+    def get_schemas(
+        self,
+        catalog: str | None,
+        schema: str,
+        tables: list[str],
+    ) -> dict[str, list[Schema]]:
+        """
+        Fetch the Schema of all the tables with a single query on the INFORMATION_SCHEMA.COLUMNS table in Snowflake.
+        """
+        schema_query = re.sub(
+            r'\s+',
+            ' ',
+            SnowflakeDataSource._SCHEMAS_QUERY.format(
+                catalog=catalog, schema=schema.upper(), tables=", ".join(f"'{table.lower()}'" for table in tables)
+            ),
+        )
+        try:
+            logger.debug(f"Fetching schemas using query: \n`{schema_query}`")
+            logger.info(f"Fetching Schemas of {len(tables)} tables: Started at: {datetime.now()}")
+            schema_metadata = self.reader(schema_query).load().collect()
+            logger.info(f"Schemas fetched successfully. Completed at: {datetime.now()}")
+            return self._group_schemas(
+                tables, [(field.TABLE_NAME, field.COLUMN_NAME, field.DATA_TYPE) for field in schema_metadata]
+            )
+        except (RuntimeError, PySparkException) as e:
+            return self.log_and_throw_exception(e, "schema", schema_query)
+
     def reader(self, query: str) -> DataFrameReader:
         options = {
             "sfUrl": self._get_secret('sfUrl'),
@@ -25,3 +25,4 @@ class ReconReportType(AutoName):
     SCHEMA = auto()
     ROW = auto()
     ALL = auto()
+    SAMPLE = auto()
@@ -1,23 +1,32 @@
+import dataclasses
 import logging
 import sys
 import os
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import reduce
+from typing import TypeVar
 from uuid import uuid4
 
 from pyspark.errors import PySparkException
-from pyspark.sql import DataFrame, SparkSession
+from pyspark.sql import DataFrame, Row, SparkSession
+from pyspark.sql.functions import col, lit
 from sqlglot import Dialect
 
 from databricks.labs.remorph.config import (
     DatabaseConfig,
     TableRecon,
     get_dialect,
+    get_key_from_dialect,
     ReconcileConfig,
     ReconcileMetadataConfig,
 )
 from databricks.labs.remorph.reconcile.compare import (
     capture_mismatch_data_and_columns,
     reconcile_data,
+    compare_hash_buckets,
+    estimate_sample_rates,
     join_aggregate_data,
     reconcile_agg_data_per_rule,
 )
@@ -28,7 +37,17 @@ from databricks.labs.remorph.reconcile.exception import (
     InvalidInputException,
     ReconciliationException,
 )
-from databricks.labs.remorph.reconcile.query_builder.aggregate_query import AggregateQueryBuilder
+from databricks.labs.remorph.reconcile.jdbc_partitioning import (
+    get_hash_partitions,
+    get_parallelism,
+    get_unpartitioned_options,
+    resolve_fetch_size,
+    resolve_jdbc_reader_options,
+)
+from databricks.labs.remorph.reconcile.query_builder.aggregate_query import (
+    GROUPING_ID_COLUMN_NAME,
+    AggregateQueryBuilder,
+)
 from databricks.labs.remorph.reconcile.query_builder.count_query import CountQueryBuilder
 from databricks.labs.remorph.reconcile.query_builder.hash_query import HashQueryBuilder
 from databricks.labs.remorph.reconcile.query_builder.sampling_query import (
@@ -39,14 +58,14 @@ from databricks.labs.remorph.reconcile.query_builder.threshold_query import (
 )
 from databricks.labs.remorph.reconcile.recon_capture import (
     ReconCapture,
-    generate_final_reconcile_output,
     ReconIntermediatePersist,
-    generate_final_reconcile_aggregate_output,
 )
 from databricks.labs.remorph.reconcile.recon_config import (
     DataReconcileOutput,
+    JdbcReaderOptions,
     ReconcileOutput,
     ReconcileProcessDuration,
+    ReconcileTableOutput,
     Schema,
     SchemaReconcileOutput,
     Table,
@@ -56,17 +75,37 @@ from databricks.labs.remorph.reconcile.recon_config import (
     AggregateQueryRules,
 )
 from databricks.labs.remorph.reconcile.schema_compare import SchemaCompare
+from databricks.labs.remorph.reconcile.table_scheduler import (
+    TableReconScheduler,
+    get_query_concurrency,
+    get_table_concurrency,
+)
+from databricks.labs.remorph.reconcile.watermark import (
+    WatermarkStore,
+    apply_watermark_window,
+    build_watermark_query,
+    get_watermark_window,
+    is_temporal_watermark,
+    to_watermark_value,
+)
 from databricks.labs.remorph.transpiler.execute import verify_workspace_client
 from databricks.sdk import WorkspaceClient
 from databricks.labs.blueprint.installation import Installation
 from databricks.connect import DatabricksSession
 
 logger = logging.getLogger(__name__)
-_SAMPLE_ROWS = 50
+# the metadata rows are appended every so many tables, which bounds what a crashed run leaves unrecorded
+_CAPTURE_FLUSH_EVERY_TABLES = 50
 
 RECONCILE_OPERATION_NAME = "reconcile"
 AGG_RECONCILE_OPERATION_NAME = "aggregates-reconcile"
 
+# the most aggregate queries of a table reconciled at the same time, within the concurrency of the source
+_AGGREGATE_QUERY_WORKERS = 4
+
+_S = TypeVar("_S")
+_T = TypeVar("_T")
+
 
 def validate_input(input_value: str, list_of_value: set, message: str):
     if input_value not in list_of_value:
@@ -183,7 +222,7 @@ def recon(
     # validate the report type
     report_type = reconcile_config.report_type.lower()
     logger.info(f"report_type: {report_type}, data_source: {reconcile_config.data_source} ")
-    validate_input(report_type, {"schema", "data", "row", "all"}, "Invalid report type")
+    validate_input(report_type, {"schema", "data", "row", "all", "sample"}, "Invalid report type")
 
     source, target = initialise_data_source(
         engine=get_dialect(reconcile_config.data_source),
@@ -215,15 +254,35 @@ def recon(
         spark=spark,
         metadata_config=reconcile_config.metadata_config,
         local_test_run=local_test_run,
+        flush_every_tables=_CAPTURE_FLUSH_EVERY_TABLES,
+    )
+
+    watermark_store = WatermarkStore(
+        spark=spark,
+        database_config=reconcile_config.database_config,
+        recon_id=recon_id,
+        metadata_config=reconcile_config.metadata_config,
+        local_test_run=local_test_run,
     )
 
-    for table_conf in table_recon.tables:
+    src_schemas, tgt_schemas = _prefetch_schemas(source, target, table_recon.tables, reconcile_config.database_config)
+
+    def reconcile_table(table_conf: Table):
         recon_process_duration = ReconcileProcessDuration(start_ts=str(datetime.now()), end_ts=None)
         schema_reconcile_output = SchemaReconcileOutput(is_valid=True)
         data_reconcile_output = DataReconcileOutput()
+        # the incremental tables only compare the rows of their watermark window
+        data_table_conf, watermark_value = table_conf, None
+        # the unmatched rows of the table are kept until the table is cleaned
+        intermediate_persist = _intermediate_persist(spark, ws_client, table_conf, reconcile_config)
         try:
             src_schema, tgt_schema = _get_schema(
-                source=source, target=target, table_conf=table_conf, database_config=reconcile_config.database_config
+                source=source,
+                target=target,
+                table_conf=table_conf,
+                database_config=reconcile_config.database_config,
+                src_schemas=src_schemas,
+                tgt_schemas=tgt_schemas,
             )
         except DataSourceRuntimeException as e:
             schema_reconcile_output = SchemaReconcileOutput(is_valid=False, exception=str(e))
@@ -234,33 +293,78 @@ def recon(
                 )
                 logger.warning("Schema comparison is completed.")
 
-            if report_type in {"data", "row", "all"}:
-                data_reconcile_output = _run_reconcile_data(
-                    reconciler=reconciler, table_conf=table_conf, src_schema=src_schema, tgt_schema=tgt_schema
-                )
+            if report_type in {"data", "row", "all", "sample"}:
+                try:
+                    if table_conf.watermark:
+                        data_table_conf, watermark_value = _apply_watermark(
+                            reconciler, watermark_store, table_conf, tgt_schema
+                        )
+                except (DataSourceRuntimeException, InvalidInputException) as e:
+                    data_reconcile_output = DataReconcileOutput(exception=str(e))
+                else:
+                    data_reconcile_output = _run_reconcile_data(
+                        reconciler=reconciler,
+                        table_conf=data_table_conf,
+                        src_schema=src_schema,
+                        tgt_schema=tgt_schema,
+                        intermediate_persist=intermediate_persist,
+                    )
                 logger.warning(f"Reconciliation for '{report_type}' report completed.")
 
         recon_process_duration.end_ts = str(datetime.now())
+        record_count = reconciler.get_record_count(data_table_conf, report_type, data_reconcile_output)
         # Persist the data to the delta tables
-        recon_capture.start(
+        # the rows of the table are collected before they join the rows buffered by the other tables
+        table_output = recon_capture.start(
             data_reconcile_output=data_reconcile_output,
             schema_reconcile_output=schema_reconcile_output,
             table_conf=table_conf,
             recon_process_duration=recon_process_duration,
-            record_count=reconciler.get_record_count(table_conf, report_type),
+            record_count=record_count,
         )
+        if watermark_value is not None and _is_successful(table_output):
+            # the window matched, the next run starts where this one ended. A failed window is compared again.
+            watermark_store.add_watermark(table_conf, watermark_value)
         if report_type != "schema":
-            ReconIntermediatePersist(
-                spark=spark, path=generate_volume_path(table_conf, reconcile_config.metadata_config)
-            ).clean_unmatched_df_from_volume()
+            cleanups.append(cleaner.submit(intermediate_persist.clean_unmatched_df_from_volume))
 
-    return _verify_successful_reconciliation(
-        generate_final_reconcile_output(
-            recon_id=recon_id,
-            spark=spark,
-            metadata_config=reconcile_config.metadata_config,
-            local_test_run=local_test_run,
-        )
+    # the intermediate data of a table is deleted in the background while the next tables are reconciled
+    cleanups: list[Future] = []
+    try:
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="recon-clean") as cleaner:
+            TableReconScheduler(
+                get_table_concurrency(reconcile_config.data_source, reconcile_config.table_concurrency)
+            ).run(table_recon.tables, reconcile_table)
+    finally:
+        # the tables reconciled before a failure are recorded as well
+        recon_capture.flush()
+        # the watermarks only move once the metrics of their windows are recorded
+        watermark_store.flush()
+    _wait_for_cleanups(cleanups)
+
+    return _verify_successful_reconciliation(recon_capture.get_reconcile_output())
+
+
+def _apply_watermark(
+    reconciler: "Reconciliation",
+    watermark_store: WatermarkStore,
+    table_conf: Table,
+    tgt_schema: list[Schema],
+) -> tuple[Table, str | None]:
+    is_temporal = is_temporal_watermark(table_conf, tgt_schema)
+    last_watermark = watermark_store.get_last_watermark(table_conf)
+    high_watermark = reconciler.get_high_watermark(table_conf)
+    window = get_watermark_window(table_conf, is_temporal, last_watermark, high_watermark)
+    logger.info(f"Reconciling {table_conf.source_name} incrementally: {window}")
+    # an empty target has no watermark yet, the next run compares every row again
+    return apply_watermark_window(table_conf, window, reconciler.source_engine), high_watermark
+
+
+def _is_successful(table_output: ReconcileTableOutput) -> bool:
+    return not table_output.exception_message and (
+        table_output.status.column is not False
+        and table_output.status.row is not False
+        and table_output.status.schema is not False
     )
 
 
@@ -268,11 +372,7 @@ def _verify_successful_reconciliation(
     reconcile_output: ReconcileOutput, operation_name: str = "reconcile"
 ) -> ReconcileOutput:
     for table_output in reconcile_output.results:
-        if table_output.exception_message or (
-            table_output.status.column is False
-            or table_output.status.row is False
-            or table_output.status.schema is False
-        ):
+        if not _is_successful(table_output):
             raise ReconciliationException(
                 f" Reconciliation failed for one or more tables. Please check the recon metrics for more details."
                 f" **{operation_name}** failed.",
@@ -289,6 +389,46 @@ def generate_volume_path(table_conf: Table, metadata_config: ReconcileMetadataCo
     return f"/Volumes/{catalog}/{schema}/{metadata_config.volume}/{table_conf.source_name}_{table_conf.target_name}/"
 
 
+def _intermediate_persist(
+    spark: SparkSession,
+    ws: WorkspaceClient,
+    table_conf: Table,
+    reconcile_config: ReconcileConfig,
+) -> ReconIntermediatePersist:
+    return ReconIntermediatePersist(
+        spark=spark,
+        path=generate_volume_path(table_conf, reconcile_config.metadata_config),
+        storage=reconcile_config.metadata_config.intermediate_storage,
+        ws=ws,
+    )
+
+
+def _wait_for_cleanups(cleanups: list[Future]):
+    # a cleanup failure is raised once every table has been reconciled and cleaned
+    errors = [cleanup.exception() for cleanup in cleanups]
+    for error in errors:
+        if error is not None:
+            raise error
+
+
+def _run_concurrently(source_task: Callable[[], _S], target_task: Callable[[], _T]) -> tuple[_S, _T]:
+    """
+    Run the source and the target side of a reconciliation step at the same time, so a step takes as long as the
+    slower side instead of the sum of both. The source result, or its error, is always returned first.
+    """
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="recon-read") as executor:
+        source_future = executor.submit(source_task)
+        target_future = executor.submit(target_task)
+        return source_future.result(), target_future.result()
+
+
+def _get_grouping_set(data: DataFrame, query_rules: AggregateQueryRules) -> DataFrame:
+    """The rows and columns of the group by of the query rules, out of the result of its GROUPING SETS query."""
+    return data.filter(col(GROUPING_ID_COLUMN_NAME).eqNullSafe(lit(query_rules.grouping_id))).select(
+        *query_rules.columns or []
+    )
+
+
 def initialise_data_source(
     ws: WorkspaceClient,
     spark: SparkSession,
@@ -301,22 +441,41 @@ def initialise_data_source(
     return source, target
 
 
-def _get_missing_data(
+def _read_sample(
     reader: DataSource,
     sampler: SamplingQueryBuilder,
-    missing_df: DataFrame,
-    catalog: str,
+    keys_df: DataFrame,
+    catalog: str | None,
     schema: str,
     table_name: str,
 ) -> DataFrame:
-    sample_query = sampler.build_query(missing_df)
-    return reader.read_data(
-        catalog=catalog,
-        schema=schema,
-        table=table_name,
-        query=sample_query,
-        options=None,
-    )
+    sample_queries = sampler.build_queries(keys_df)
+    sample = _read_queries(reader, catalog, schema, table_name, sample_queries)
+    if not sampler.staging_views:
+        return sample
+    # the rows are read before the staged keys are dropped, a sample is small enough to be collected
+    spark = keys_df.sparkSession
+    try:
+        return spark.createDataFrame(sample.collect(), schema=sample.schema)
+    finally:
+        sampler.drop_staging_views(spark)
+
+
+def _read_queries(
+    reader: DataSource,
+    catalog: str | None,
+    schema: str,
+    table_name: str,
+    queries: list[str],
+    options: JdbcReaderOptions | None = None,
+) -> DataFrame:
+    # a read split into several queries, such as a large sample or a hash query partitioned by the hash of the keys,
+    # each over its own connection, their rows are unioned in Spark
+    dfs = [
+        reader.read_data(catalog=catalog, schema=schema, table=table_name, query=query, options=options)
+        for query in queries
+    ]
+    return reduce(DataFrame.unionByName, dfs)
 
 
 def reconcile_aggregates(
@@ -363,6 +522,9 @@ def reconcile_aggregates(
         get_dialect(reconcile_config.data_source),
         spark,
         metadata_config=reconcile_config.metadata_config,
+        aggregate_query_workers=get_query_concurrency(
+            reconcile_config.data_source, reconcile_config.table_concurrency, _AGGREGATE_QUERY_WORKERS
+        ),
     )
 
     # initialise the recon capture class
@@ -375,10 +537,13 @@ def reconcile_aggregates(
         spark=spark,
         metadata_config=reconcile_config.metadata_config,
         local_test_run=local_test_run,
+        flush_every_tables=_CAPTURE_FLUSH_EVERY_TABLES,
     )
 
+    src_schemas, tgt_schemas = _prefetch_schemas(source, target, table_recon.tables, reconcile_config.database_config)
+
     # Get the Aggregated Reconciliation Output for each table
-    for table_conf in table_recon.tables:
+    def reconcile_table_aggregates(table_conf: Table):
         recon_process_duration = ReconcileProcessDuration(start_ts=str(datetime.now()), end_ts=None)
         try:
             src_schema, tgt_schema = _get_schema(
@@ -386,17 +551,21 @@ def reconcile_aggregates(
                 target=target,
                 table_conf=table_conf,
                 database_config=reconcile_config.database_config,
+                src_schemas=src_schemas,
+                tgt_schemas=tgt_schemas,
             )
         except DataSourceRuntimeException as e:
             raise ReconciliationException(message=str(e)) from e
 
         assert table_conf.aggregates, "Aggregates must be defined for Aggregates Reconciliation"
 
+        intermediate_persist = _intermediate_persist(spark, ws_client, table_conf, reconcile_config)
         table_reconcile_agg_output_list: list[AggregateQueryOutput] = _run_reconcile_aggregates(
             reconciler=reconciler,
             table_conf=table_conf,
             src_schema=src_schema,
             tgt_schema=tgt_schema,
+            intermediate_persist=intermediate_persist,
         )
 
         recon_process_duration.end_ts = str(datetime.now())
@@ -409,21 +578,20 @@ def reconcile_aggregates(
                 recon_process_duration=recon_process_duration,
             )
 
-        (
-            ReconIntermediatePersist(
-                spark=spark,
-                path=generate_volume_path(table_conf, reconcile_config.metadata_config),
-            ).clean_unmatched_df_from_volume()
-        )
+        cleanups.append(cleaner.submit(intermediate_persist.clean_unmatched_df_from_volume))
+
+    cleanups: list[Future] = []
+    try:
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="recon-clean") as cleaner:
+            TableReconScheduler(
+                get_table_concurrency(reconcile_config.data_source, reconcile_config.table_concurrency)
+            ).run(table_recon.tables, reconcile_table_aggregates)
+    finally:
+        recon_capture.flush()
+    _wait_for_cleanups(cleanups)
 
     return _verify_successful_reconciliation(
-        generate_final_reconcile_aggregate_output(
-            recon_id=recon_id,
-            spark=spark,
-            metadata_config=reconcile_config.metadata_config,
-            local_test_run=local_test_run,
-        ),
-        operation_name=AGG_RECONCILE_OPERATION_NAME,
+        recon_capture.get_reconcile_output(), operation_name=AGG_RECONCILE_OPERATION_NAME
     )
 
 
@@ -439,6 +607,7 @@ class Reconciliation:
         source_engine: Dialect,
         spark: SparkSession,
         metadata_config: ReconcileMetadataConfig,
+        aggregate_query_workers: int = 1,
     ):
         self._source = source
         self._target = target
@@ -449,19 +618,35 @@ class Reconciliation:
         self._source_engine = source_engine
         self._spark = spark
         self._metadata_config = metadata_config
+        self._aggregate_query_workers = aggregate_query_workers
 
     def reconcile_data(
         self,
         table_conf: Table,
         src_schema: list[Schema],
         tgt_schema: list[Schema],
+        intermediate_persist: ReconIntermediatePersist | None = None,
     ) -> DataReconcileOutput:
-        data_reconcile_output = self._get_reconcile_output(table_conf, src_schema, tgt_schema)
+        table_conf = self._resolve_jdbc_reader_options(table_conf, src_schema)
+        data_reconcile_output = self._get_reconcile_output(
+            table_conf, src_schema, tgt_schema, intermediate_persist or self._intermediate_persist(table_conf)
+        )
+        if self._report_type == "sample":
+            # a health check of the table, the rates are estimated from the sample and no rows are fetched
+            data_reconcile_output.sample_output = estimate_sample_rates(
+                data_reconcile_output, table_conf.sample_percentage
+            )
+            # the sampled rows are not the record counts of the tables, those are counted by `get_record_count`
+            data_reconcile_output.source_record_count = None
+            data_reconcile_output.target_record_count = None
+            return data_reconcile_output
         reconcile_output = data_reconcile_output
         if self._report_type in {"data", "all"}:
             reconcile_output = self._get_sample_data(table_conf, data_reconcile_output, src_schema, tgt_schema)
             if table_conf.get_threshold_columns("source"):
-                reconcile_output.threshold_output = self._reconcile_threshold_data(table_conf, src_schema, tgt_schema)
+                reconcile_output.threshold_output = self._reconcile_threshold_data(
+                    table_conf, src_schema, tgt_schema, data_reconcile_output.threshold_data
+                )
 
         if self._report_type == "row" and table_conf.get_threshold_columns("source"):
             logger.warning("Threshold comparison is ignored for 'row' report type")
@@ -481,51 +666,151 @@ class Reconciliation:
         table_conf: Table,
         src_schema: list[Schema],
         tgt_schema: list[Schema],
+        intermediate_persist: ReconIntermediatePersist | None = None,
     ) -> list[AggregateQueryOutput]:
-        return self._get_reconcile_aggregate_output(table_conf, src_schema, tgt_schema)
+        return self._get_reconcile_aggregate_output(
+            table_conf, src_schema, tgt_schema, intermediate_persist or self._intermediate_persist(table_conf)
+        )
+
+    def _intermediate_persist(self, table_conf: Table) -> ReconIntermediatePersist:
+        return ReconIntermediatePersist(
+            spark=self._spark,
+            path=generate_volume_path(table_conf, self._metadata_config),
+            storage=self._metadata_config.intermediate_storage,
+        )
+
+    def _resolve_jdbc_reader_options(self, table_conf: Table, src_schema: list[Schema]) -> Table:
+        # the reader options only apply to the JDBC sources, only the options of the tables configuring them are derived
+        if table_conf.jdbc_reader_options is None or get_key_from_dialect(self._source_engine) == "databricks":
+            return table_conf
+        if self._report_type == "sample":
+            # a sample reads a fraction of the table, it is not worth a probe of the whole table
+            return dataclasses.replace(
+                table_conf, jdbc_reader_options=resolve_fetch_size(table_conf, src_schema, self._source_engine)
+            )
+
+        def probe(query: str) -> Row:
+            # the probes are aggregations without a grouping, they always return a single row
+            return self._source.read_data(
+                catalog=self._database_config.source_catalog,
+                schema=self._database_config.source_schema,
+                table=table_conf.source_name,
+                query=query,
+                options=None,
+            ).collect()[0]
+
+        options = resolve_jdbc_reader_options(
+            table_conf, src_schema, self._source_engine, probe, get_parallelism(self._spark)
+        )
+        return dataclasses.replace(table_conf, jdbc_reader_options=options)
 
     def _get_reconcile_output(
         self,
         table_conf,
         src_schema,
         tgt_schema,
+        intermediate_persist: ReconIntermediatePersist,
     ):
-        src_hash_query = HashQueryBuilder(table_conf, src_schema, "source", self._source_engine).build_query(
-            report_type=self._report_type
+        src_hash_builder = HashQueryBuilder(table_conf, src_schema, "source", self._source_engine)
+        tgt_hash_builder = HashQueryBuilder(table_conf, tgt_schema, "target", self._target_engine)
+        buckets = None
+        source_count, target_count = 0, 0
+        sample_percentage = table_conf.sample_percentage if self._report_type == "sample" else None
+        if table_conf.hash_buckets and sample_percentage is None:
+            buckets, source_count, target_count = self._get_mismatched_buckets(
+                table_conf, src_hash_builder, tgt_hash_builder
+            )
+            if not buckets:
+                logger.info(f"All {table_conf.hash_buckets} hash buckets match, skipping the row level comparison")
+                return DataReconcileOutput(
+                    matched_count=source_count, source_record_count=source_count, target_record_count=target_count
+                )
+            logger.info(f"{len(buckets)} of {table_conf.hash_buckets} hash buckets differ")
+            if len(buckets) == table_conf.hash_buckets:
+                buckets = None
+
+        # the threshold columns are read by the hash queries, unless some rows are not read
+        with_thresholds = (
+            self._report_type in {"data", "all"}
+            and bool(table_conf.get_threshold_columns("source"))
+            and buckets is None
         )
-        tgt_hash_query = HashQueryBuilder(table_conf, tgt_schema, "target", self._target_engine).build_query(
-            report_type=self._report_type
+        src_hash_queries = src_hash_builder.build_queries(
+            report_type=self._report_type,
+            num_partitions=get_hash_partitions(table_conf.jdbc_reader_options),
+            buckets=buckets,
+            sample_percentage=sample_percentage,
+            with_thresholds=with_thresholds,
         )
-        src_data = self._source.read_data(
-            catalog=self._database_config.source_catalog,
-            schema=self._database_config.source_schema,
-            table=table_conf.source_name,
-            query=src_hash_query,
-            options=table_conf.jdbc_reader_options,
+        tgt_hash_query = tgt_hash_builder.build_query(
+            report_type=self._report_type,
+            buckets=buckets,
+            sample_percentage=sample_percentage,
+            with_thresholds=with_thresholds,
         )
-        tgt_data = self._target.read_data(
-            catalog=self._database_config.target_catalog,
-            schema=self._database_config.target_schema,
-            table=table_conf.target_name,
-            query=tgt_hash_query,
-            options=table_conf.jdbc_reader_options,
+        src_data, tgt_data = self._read_source_and_target(
+            table_conf.source_name,
+            table_conf.target_name,
+            src_hash_queries,
+            [tgt_hash_query],
+            table_conf.jdbc_reader_options,
         )
 
-        volume_path = generate_volume_path(table_conf, self._metadata_config)
-        return reconcile_data(
+        reconcile_output = reconcile_data(
             source=src_data,
             target=tgt_data,
             key_columns=table_conf.join_columns,
             report_type=self._report_type,
-            spark=self._spark,
-            path=volume_path,
+            intermediate_persist=intermediate_persist,
+            sample_rows=table_conf.sample_rows,
+            compact_hash=table_conf.compact_hash,
+            threshold_columns=sorted(table_conf.get_threshold_columns("source")) if with_thresholds else None,
+        )
+        if buckets is not None:
+            # only the differing buckets were read, the record counts come from the bucket summaries
+            reconcile_output.source_record_count = source_count
+            reconcile_output.target_record_count = target_count
+            reconcile_output.matched_count = max(
+                source_count - reconcile_output.mismatch_count - reconcile_output.missing_in_tgt_count, 0
+            )
+        return reconcile_output
+
+    @property
+    def source_engine(self) -> Dialect:
+        return self._source_engine
+
+    def get_high_watermark(self, table_conf: Table) -> str | None:
+        watermark_df = self._target.read_data(
+            catalog=self._database_config.target_catalog,
+            schema=self._database_config.target_schema,
+            table=table_conf.target_name,
+            query=build_watermark_query(table_conf),
+            options=None,
+        )
+        return to_watermark_value(watermark_df.collect()[0]["watermark"])
+
+    def _get_mismatched_buckets(
+        self,
+        table_conf: Table,
+        src_hash_builder: HashQueryBuilder,
+        tgt_hash_builder: HashQueryBuilder,
+    ) -> tuple[list[int], int, int]:
+        src_data, tgt_data = self._read_source_and_target(
+            table_conf.source_name,
+            table_conf.target_name,
+            [src_hash_builder.build_bucket_query(report_type=self._report_type)],
+            [tgt_hash_builder.build_bucket_query(report_type=self._report_type)],
+            # the summaries are grouped by the source, there is nothing to partition
+            None,
         )
+        return compare_hash_buckets(src_data, tgt_data)
 
     def _get_reconcile_aggregate_output(
         self,
         table_conf,
         src_schema,
         tgt_schema,
+        intermediate_persist: ReconIntermediatePersist,
     ):
         """
         Creates a single Query, for the aggregates having the same group by columns. (Ex: 1)
@@ -585,66 +870,96 @@ class Reconciliation:
             "source",
             self._source_engine,
         )
-
-        # build Aggregate queries for source,
-        src_agg_queries: list[AggregateQueryRules] = src_query_builder.build_queries()
-
-        # There could be one or more queries per table based on the group by columns
-
-        # build Aggregate queries for target(Databricks),
-        tgt_agg_queries: list[AggregateQueryRules] = AggregateQueryBuilder(
+        tgt_query_builder = AggregateQueryBuilder(
             table_conf,
             tgt_schema,
             "target",
             self._target_engine,
-        ).build_queries()
-
-        volume_path = generate_volume_path(table_conf, self._metadata_config)
-
-        table_agg_output: list[AggregateQueryOutput] = []
-
-        # Iterate over the grouped aggregates and reconcile the data
-        # Zip all the keys, read the source, target data for each Aggregate query
-        # and reconcile on the aggregate data
-        # For e.g., (source_query_GRP1, target_query_GRP1), (source_query_GRP2, target_query_GRP2)
-        for src_query_with_rules, tgt_query_with_rules in zip(src_agg_queries, tgt_agg_queries):
-            # For each Aggregate query, read the Source and Target Data and add a hash column
+        )
 
-            src_data = self._source.read_data(
-                catalog=self._database_config.source_catalog,
-                schema=self._database_config.source_schema,
-                table=table_conf.source_name,
-                query=src_query_with_rules.query,
-                options=table_conf.jdbc_reader_options,
-            )
-            tgt_data = self._target.read_data(
-                catalog=self._database_config.target_catalog,
-                schema=self._database_config.target_schema,
-                table=table_conf.target_name,
-                query=tgt_query_with_rules.query,
-                options=table_conf.jdbc_reader_options,
+        # build Aggregate queries for source and target(Databricks),
+        # There could be one or more queries per table based on the group by columns
+        src_agg_queries: list[AggregateQueryRules] = src_query_builder.build_queries()
+        tgt_agg_queries: list[AggregateQueryRules] = tgt_query_builder.build_queries()
+
+        # With GROUPING SETS, every group by is computed in a single scan of each side,
+        # the rows of each group are split from the result by its grouping id
+        fused_data: tuple[DataFrame, DataFrame] | None = None
+        if table_conf.aggregates_grouping_sets and len(src_agg_queries) > 1:
+            src_agg_queries = src_query_builder.build_grouping_sets_queries()
+            tgt_agg_queries = tgt_query_builder.build_grouping_sets_queries()
+            src_fused, tgt_fused = self._read_aggregate_data(
+                table_conf, src_agg_queries[0].query, tgt_agg_queries[0].query
             )
+            # the result is split once per group, it is read once, before the groups are reconciled concurrently
+            fused_data = (src_fused.cache(), tgt_fused.cache())
+            _run_concurrently(fused_data[0].count, fused_data[1].count)
+
+        def reconcile_query(
+            src_query_with_rules: AggregateQueryRules, tgt_query_with_rules: AggregateQueryRules
+        ) -> list[AggregateQueryOutput]:
+            # For each Aggregate query, read the Source and Target Data
+            if fused_data is None:
+                src_data, tgt_data = self._read_aggregate_data(
+                    table_conf, src_query_with_rules.query, tgt_query_with_rules.query
+                )
+            else:
+                src_data = _get_grouping_set(fused_data[0], src_query_with_rules)
+                tgt_data = _get_grouping_set(fused_data[1], tgt_query_with_rules)
 
             # Join the Source and Target Aggregated data
             joined_df = join_aggregate_data(
                 source=src_data,
                 target=tgt_data,
                 key_columns=src_query_with_rules.group_by_columns,
-                spark=self._spark,
-                path=f"{volume_path}{src_query_with_rules.group_by_columns_as_str}",
+                intermediate_persist=intermediate_persist,
+                sub_path=src_query_with_rules.group_by_columns_as_str,
             )
 
             # For each Aggregated Query, reconcile the data based on the rule
             rules_reconcile_output: list[AggregateQueryOutput] = []
             for rule in src_query_with_rules.rules:
-                rule_reconcile_output = reconcile_agg_data_per_rule(joined_df, src_data.columns, tgt_data.columns, rule)
+                rule_reconcile_output = reconcile_agg_data_per_rule(
+                    joined_df, src_data.columns, tgt_data.columns, rule, table_conf.sample_rows
+                )
                 rules_reconcile_output.append(AggregateQueryOutput(rule, rule_reconcile_output))
+            return rules_reconcile_output
 
-            # For each table, there could be many Aggregated queries.
-            # Collect the list of Rule Reconcile output per each Aggregate query and append it to the list
-            table_agg_output.extend(rules_reconcile_output)
+        # Zip all the keys and reconcile the Aggregate queries at the same time,
+        # For e.g., (source_query_GRP1, target_query_GRP1), (source_query_GRP2, target_query_GRP2)
+        # For each table, there could be many Aggregated queries.
+        # The list of Rule Reconcile output of each Aggregate query is kept in the order of the queries
+        table_agg_output: list[AggregateQueryOutput] = []
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self._aggregate_query_workers, thread_name_prefix="recon-aggregate"
+            ) as executor:
+                for rules_reconcile_output in executor.map(reconcile_query, src_agg_queries, tgt_agg_queries):
+                    table_agg_output.extend(rules_reconcile_output)
+        finally:
+            if fused_data is not None:
+                fused_data[0].unpersist()
+                fused_data[1].unpersist()
         return table_agg_output
 
+    def _read_aggregate_data(self, table_conf: Table, src_query: str, tgt_query: str) -> tuple[DataFrame, DataFrame]:
+        return _run_concurrently(
+            lambda: self._source.read_data(
+                catalog=self._database_config.source_catalog,
+                schema=self._database_config.source_schema,
+                table=table_conf.source_name,
+                query=src_query,
+                options=get_unpartitioned_options(table_conf.jdbc_reader_options),
+            ),
+            lambda: self._target.read_data(
+                catalog=self._database_config.target_catalog,
+                schema=self._database_config.target_schema,
+                table=table_conf.target_name,
+                query=tgt_query,
+                options=get_unpartitioned_options(table_conf.jdbc_reader_options),
+            ),
+        )
+
     def _get_sample_data(
         self,
         table_conf,
@@ -667,14 +982,14 @@ class Reconciliation:
                 mismatch = self._get_mismatch_data(
                     src_sampler,
                     tgt_sampler,
-                    reconcile_output.mismatch.mismatch_df,
+                    reconcile_output.mismatch.mismatch_df.limit(table_conf.sample_rows),
                     table_conf.join_columns,
                     table_conf.source_name,
                     table_conf.target_name,
                 )
 
             if reconcile_output.missing_in_src_count > 0:
-                missing_in_src = _get_missing_data(
+                missing_in_src = _read_sample(
                     self._target,
                     tgt_sampler,
                     reconcile_output.missing_in_src,
@@ -684,7 +999,7 @@ class Reconciliation:
                 )
 
             if reconcile_output.missing_in_tgt_count > 0:
-                missing_in_tgt = _get_missing_data(
+                missing_in_tgt = _read_sample(
                     self._source,
                     src_sampler,
                     reconcile_output.missing_in_tgt,
@@ -700,6 +1015,9 @@ class Reconciliation:
             missing_in_tgt_count=reconcile_output.missing_in_tgt_count,
             missing_in_src=missing_in_src,
             missing_in_tgt=missing_in_tgt,
+            matched_count=reconcile_output.matched_count,
+            source_record_count=reconcile_output.source_record_count,
+            target_record_count=reconcile_output.target_record_count,
         )
 
     def _get_mismatch_data(
@@ -711,23 +1029,24 @@ class Reconciliation:
         src_table: str,
         tgt_table: str,
     ):
-        df = mismatch.limit(_SAMPLE_ROWS).cache()
-        src_mismatch_sample_query = src_sampler.build_query(df)
-        tgt_mismatch_sample_query = tgt_sampler.build_query(df)
-
-        src_data = self._source.read_data(
-            catalog=self._database_config.source_catalog,
-            schema=self._database_config.source_schema,
-            table=src_table,
-            query=src_mismatch_sample_query,
-            options=None,
-        )
-        tgt_data = self._target.read_data(
-            catalog=self._database_config.target_catalog,
-            schema=self._database_config.target_schema,
-            table=tgt_table,
-            query=tgt_mismatch_sample_query,
-            options=None,
+        df = mismatch.cache()
+        src_data, tgt_data = _run_concurrently(
+            lambda: _read_sample(
+                self._source,
+                src_sampler,
+                df,
+                self._database_config.source_catalog,
+                self._database_config.source_schema,
+                src_table,
+            ),
+            lambda: _read_sample(
+                self._target,
+                tgt_sampler,
+                df,
+                self._database_config.target_catalog,
+                self._database_config.target_schema,
+                tgt_table,
+            ),
         )
 
         return capture_mismatch_data_and_columns(source=src_data, target=tgt_data, key_columns=key_columns)
@@ -737,9 +1056,12 @@ class Reconciliation:
         table_conf: Table,
         src_schema: list[Schema],
         tgt_schema: list[Schema],
+        threshold_data: tuple[DataFrame, DataFrame] | None = None,
     ):
-
-        src_data, tgt_data = self._get_threshold_data(table_conf, src_schema, tgt_schema)
+        # the threshold columns are read by the hash queries, the tables are only read again when some rows were not
+        if threshold_data is None:
+            threshold_data = self._get_threshold_data(table_conf, src_schema, tgt_schema)
+        src_data, tgt_data = threshold_data
 
         source_view = f"source_{table_conf.source_name}_df_threshold_vw"
         target_view = f"target_{table_conf.target_name}_df_threshold_vw"
@@ -762,23 +1084,14 @@ class Reconciliation:
             table_conf, tgt_schema, "target", self._target_engine
         ).build_threshold_query()
 
-        src_data = self._source.read_data(
-            catalog=self._database_config.source_catalog,
-            schema=self._database_config.source_schema,
-            table=table_conf.source_name,
-            query=src_threshold_query,
-            options=table_conf.jdbc_reader_options,
-        )
-        tgt_data = self._target.read_data(
-            catalog=self._database_config.target_catalog,
-            schema=self._database_config.target_schema,
-            table=table_conf.target_name,
-            query=tgt_threshold_query,
-            options=table_conf.jdbc_reader_options,
+        return self._read_source_and_target(
+            table_conf.source_name,
+            table_conf.target_name,
+            [src_threshold_query],
+            [tgt_threshold_query],
+            table_conf.jdbc_reader_options,
         )
 
-        return src_data, tgt_data
-
     def _compute_threshold_comparison(self, table_conf: Table, src_schema: list[Schema]) -> ThresholdOutput:
         threshold_comparison_query = ThresholdQueryBuilder(
             table_conf, src_schema, "target", self._target_engine
@@ -797,49 +1110,140 @@ class Reconciliation:
         mismatched_count = mismatched_df.count()
         threshold_df = None
         if mismatched_count > 0:
-            threshold_df = mismatched_df.limit(_SAMPLE_ROWS)
+            threshold_df = mismatched_df.limit(table_conf.sample_rows)
 
         return ThresholdOutput(threshold_df=threshold_df, threshold_mismatch_count=mismatched_count)
 
-    def get_record_count(self, table_conf: Table, report_type: str) -> ReconcileRecordCount:
+    def _read_source_and_target(
+        self,
+        src_table: str,
+        tgt_table: str,
+        src_queries: list[str],
+        tgt_queries: list[str],
+        options: JdbcReaderOptions | None,
+    ) -> tuple[DataFrame, DataFrame]:
+        # Loading a JDBC source already resolves the query schema with a round trip, so both loads are overlapped
+        return _run_concurrently(
+            lambda: _read_queries(
+                self._source,
+                self._database_config.source_catalog,
+                self._database_config.source_schema,
+                src_table,
+                src_queries,
+                options,
+            ),
+            lambda: _read_queries(
+                self._target,
+                self._database_config.target_catalog,
+                self._database_config.target_schema,
+                tgt_table,
+                tgt_queries,
+                options,
+            ),
+        )
+
+    def get_record_count(
+        self,
+        table_conf: Table,
+        report_type: str,
+        data_reconcile_output: DataReconcileOutput | None = None,
+    ) -> ReconcileRecordCount:
+        if (
+            data_reconcile_output is not None
+            and data_reconcile_output.source_record_count is not None
+            and data_reconcile_output.target_record_count is not None
+        ):
+            # counted while the hash datasets were joined
+            return ReconcileRecordCount(
+                source=data_reconcile_output.source_record_count,
+                target=data_reconcile_output.target_record_count,
+            )
         if report_type != "schema":
+            # the hash pass did not run to completion or only read a sample, so the tables are counted on their own
             source_count_query = CountQueryBuilder(table_conf, "source", self._source_engine).build_query()
             target_count_query = CountQueryBuilder(table_conf, "target", self._target_engine).build_query()
-            source_count = self._source.read_data(
-                catalog=self._database_config.source_catalog,
-                schema=self._database_config.source_schema,
-                table=table_conf.source_name,
-                query=source_count_query,
-                options=None,
-            ).collect()[0]["count"]
-            target_count = self._target.read_data(
-                catalog=self._database_config.target_catalog,
-                schema=self._database_config.target_schema,
-                table=table_conf.target_name,
-                query=target_count_query,
-                options=None,
-            ).collect()[0]["count"]
+            # both counts are collected at the same time
+            source_count, target_count = _run_concurrently(
+                lambda: self._source.read_data(
+                    catalog=self._database_config.source_catalog,
+                    schema=self._database_config.source_schema,
+                    table=table_conf.source_name,
+                    query=source_count_query,
+                    options=None,
+                ).collect()[0]["count"],
+                lambda: self._target.read_data(
+                    catalog=self._database_config.target_catalog,
+                    schema=self._database_config.target_schema,
+                    table=table_conf.target_name,
+                    query=target_count_query,
+                    options=None,
+                ).collect()[0]["count"],
+            )
 
             return ReconcileRecordCount(source=int(source_count), target=int(target_count))
         return ReconcileRecordCount()
 
 
+def _fetch_schemas(
+    data_source: DataSource, catalog: str | None, schema: str, tables: list[str]
+) -> dict[str, list[Schema]]:
+    if not tables:
+        return {}
+    try:
+        return data_source.get_schemas(catalog=catalog, schema=schema, tables=tables)
+    except DataSourceRuntimeException as e:
+        # the tables are fetched one by one in that case, so a failure is reported against the table that caused it
+        logger.warning(f"Fetching the schemas of all tables at once failed, falling back to one table at a time: {e}")
+        return {}
+
+
+def _prefetch_schemas(
+    source: DataSource,
+    target: DataSource,
+    tables: list[Table],
+    database_config: DatabaseConfig,
+) -> tuple[dict[str, list[Schema]], dict[str, list[Schema]]]:
+    """
+    Fetch the schemas of every table of the run with one metadata query per source and target schema, instead of two
+    queries per table. The result is kept for the whole run.
+    """
+    src_schemas = _fetch_schemas(
+        source,
+        database_config.source_catalog,
+        database_config.source_schema,
+        list(dict.fromkeys(table_conf.source_name for table_conf in tables)),
+    )
+    tgt_schemas = _fetch_schemas(
+        target,
+        database_config.target_catalog,
+        database_config.target_schema,
+        list(dict.fromkeys(table_conf.target_name for table_conf in tables)),
+    )
+    return src_schemas, tgt_schemas
+
+
 def _get_schema(
     source: DataSource,
     target: DataSource,
     table_conf: Table,
     database_config: DatabaseConfig,
+    src_schemas: dict[str, list[Schema]] | None = None,
+    tgt_schemas: dict[str, list[Schema]] | None = None,
 ) -> tuple[list[Schema], list[Schema]]:
-    src_schema = source.get_schema(
-        catalog=database_config.source_catalog,
-        schema=database_config.source_schema,
-        table=table_conf.source_name,
-    )
-    tgt_schema = target.get_schema(
-        catalog=database_config.target_catalog,
-        schema=database_config.target_schema,
-        table=table_conf.target_name,
-    )
+    src_schema = (src_schemas or {}).get(table_conf.source_name)
+    if src_schema is None:
+        src_schema = source.get_schema(
+            catalog=database_config.source_catalog,
+            schema=database_config.source_schema,
+            table=table_conf.source_name,
+        )
+    tgt_schema = (tgt_schemas or {}).get(table_conf.target_name)
+    if tgt_schema is None:
+        tgt_schema = target.get_schema(
+            catalog=database_config.target_catalog,
+            schema=database_config.target_schema,
+            table=table_conf.target_name,
+        )
 
     return src_schema, tgt_schema
 
@@ -849,9 +1253,15 @@ def _run_reconcile_data(
     table_conf: Table,
     src_schema: list[Schema],
     tgt_schema: list[Schema],
+    intermediate_persist: ReconIntermediatePersist,
 ) -> DataReconcileOutput:
     try:
-        return reconciler.reconcile_data(table_conf=table_conf, src_schema=src_schema, tgt_schema=tgt_schema)
+        return reconciler.reconcile_data(
+            table_conf=table_conf,
+            src_schema=src_schema,
+            tgt_schema=tgt_schema,
+            intermediate_persist=intermediate_persist,
+        )
     except DataSourceRuntimeException as e:
         return DataReconcileOutput(exception=str(e))
 
@@ -873,9 +1283,10 @@ def _run_reconcile_aggregates(
     table_conf: Table,
     src_schema: list[Schema],
     tgt_schema: list[Schema],
+    intermediate_persist: ReconIntermediatePersist,
 ) -> list[AggregateQueryOutput]:
     try:
-        return reconciler.reconcile_aggregates(table_conf, src_schema, tgt_schema)
+        return reconciler.reconcile_aggregates(table_conf, src_schema, tgt_schema, intermediate_persist)
     except DataSourceRuntimeException as e:
         return [AggregateQueryOutput(reconcile_output=DataReconcileOutput(exception=str(e)), rule=None)]
 
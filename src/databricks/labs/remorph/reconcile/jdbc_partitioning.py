@@ -0,0 +1,187 @@
+import dataclasses
+import logging
+import math
+from collections.abc import Callable
+from decimal import Decimal
+
+from pyspark.errors import PySparkException
+from pyspark.sql import Row, SparkSession
+from sqlglot import Dialect
+from sqlglot import expressions as exp
+from sqlglot.errors import ParseError
+
+from databricks.labs.remorph.reconcile.query_builder.expression_generator import supports_partition_hash
+from databricks.labs.remorph.reconcile.recon_config import JdbcReaderOptions, Schema, Table
+
+logger = logging.getLogger(__name__)
+
+# a partition reads about this many rows over its own connection
+_ROWS_PER_PARTITION = 1_000_000
+# the connections opened on the source for a table, whatever the size of the cluster
+_MAX_PARTITIONS = 32
+# the cores assumed when the cluster does not tell
+_DEFAULT_PARALLELISM = 8
+# a fetch round trip brings about this many bytes of rows
+_FETCH_BYTES = 4 * 1024 * 1024
+_MIN_FETCH_SIZE = 100
+_MAX_FETCH_SIZE = 10_000
+_HASH_WIDTH = 64
+_COLUMN_WIDTH = 16
+_TEXT_WIDTH = 256
+_MAX_TEXT_WIDTH = 4000
+
+
+def get_parallelism(spark: SparkSession) -> int:
+    try:
+        return int(spark.conf.get("spark.default.parallelism", str(_DEFAULT_PARALLELISM)) or _DEFAULT_PARALLELISM)
+    except (PySparkException, ValueError):
+        return _DEFAULT_PARALLELISM
+
+
+def _get_data_type(sch: Schema, engine: Dialect) -> exp.DataType | None:
+    try:
+        return exp.DataType.build(sch.data_type, dialect=engine)
+    except (ParseError, ValueError):
+        return None
+
+
+def _get_column_width(sch: Schema, engine: Dialect) -> int:
+    data_type = _get_data_type(sch, engine)
+    if data_type is None or not data_type.is_type(*exp.DataType.TEXT_TYPES):
+        return _COLUMN_WIDTH
+    if data_type.expressions and data_type.expressions[0].this.is_int:
+        return min(int(data_type.expressions[0].this.this), _MAX_TEXT_WIDTH)
+    return _TEXT_WIDTH
+
+
+def estimate_fetch_size(table_conf: Table, src_schema: list[Schema], engine: Dialect) -> int:
+    """The hash query reads most of the rows of a table, its rows are a hash and the key columns."""
+    key_columns = set(table_conf.join_columns or []) | set(table_conf.get_partition_column("source"))
+    columns = [sch for sch in src_schema if not key_columns or sch.column_name in key_columns]
+    row_width = _HASH_WIDTH + sum(_get_column_width(sch, engine) for sch in columns)
+    return max(_MIN_FETCH_SIZE, min(_FETCH_BYTES // row_width, _MAX_FETCH_SIZE))
+
+
+def get_partition_column(table_conf: Table, src_schema: list[Schema], engine: Dialect) -> str | None:
+    """The first join column holding numbers as they are read from the source, None if there is no such column."""
+    user_transformations = table_conf.get_transformation_dict("source")
+    data_types = {sch.column_name: _get_data_type(sch, engine) for sch in src_schema}
+    for column in table_conf.join_columns or []:
+        data_type = data_types.get(column)
+        if user_transformations.get(column, column) != column or data_type is None:
+            continue
+        if data_type.is_type(*exp.DataType.NUMERIC_TYPES):
+            return column
+    return None
+
+
+def build_partition_bounds_query(table_conf: Table, partition_column: str, engine: Dialect) -> str:
+    column = exp.column(partition_column)
+    return (
+        exp.select(
+            exp.Min(this=column).as_("lower_bound"),
+            exp.Max(this=column.copy()).as_("upper_bound"),
+            exp.Count(this=exp.Literal.number(1)).as_("row_count"),
+        )
+        .from_(":tbl")
+        .where(table_conf.get_filter("source"))
+        .sql(dialect=engine)
+    )
+
+
+def build_row_count_query(table_conf: Table, engine: Dialect) -> str:
+    return (
+        exp.select(exp.Count(this=exp.Literal.number(1)).as_("row_count"))
+        .from_(":tbl")
+        .where(table_conf.get_filter("source"))
+        .sql(dialect=engine)
+    )
+
+
+def resolve_fetch_size(table_conf: Table, src_schema: list[Schema], engine: Dialect) -> JdbcReaderOptions | None:
+    """Completes only the fetch size of the JDBC reader options, for the reads not worth a probe of the whole table."""
+    options = table_conf.jdbc_reader_options
+    if options is None:
+        return None
+    return dataclasses.replace(
+        options, fetch_size=options.fetch_size or estimate_fetch_size(table_conf, src_schema, engine)
+    )
+
+
+def get_unpartitioned_options(options: JdbcReaderOptions | None) -> JdbcReaderOptions | None:
+    """
+    The reader options of a query not selecting the partition column, such as an aggregate query: Spark filters the
+    partitions of a read on that column, only the fetch size applies.
+    """
+    if options is None:
+        return None
+    return JdbcReaderOptions(fetch_size=options.fetch_size)
+
+
+def get_hash_partitions(options: JdbcReaderOptions | None) -> int | None:
+    """The number of partitions of the reads split by the hash of the key columns, None if they are not split so"""
+    if options is None or options.partition_column or not options.number_partitions or options.number_partitions < 2:
+        return None
+    return options.number_partitions
+
+
+def _get_number_partitions(row_count: int, parallelism: int) -> int:
+    return max(1, min(math.ceil(row_count / _ROWS_PER_PARTITION), parallelism, _MAX_PARTITIONS))
+
+
+def _to_bound(value, round_up: bool) -> str:
+    if isinstance(value, (int, float, Decimal)):
+        # the bounds of a numeric partition column are read as longs
+        return str(math.ceil(value) if round_up else math.floor(value))
+    return str(value)
+
+
+def resolve_jdbc_reader_options(
+    table_conf: Table,
+    src_schema: list[Schema],
+    engine: Dialect,
+    probe: Callable[[str], Row],
+    parallelism: int,
+) -> JdbcReaderOptions | None:
+    """
+    Completes the JDBC reader options of the table, the options left out are derived from the table. A table without
+    JDBC reader options is read as configured, over a single connection and without any probe.
+
+    The bounds of the partition column and the row count are probed with one query and the number of partitions
+    balances the rows over the cores of the cluster. A table without a numeric join column is read in partitions of
+    the native hash of its key columns instead, see `get_hash_partitions`. The fetch size is estimated from the width
+    of the rows read.
+    """
+    options = table_conf.jdbc_reader_options
+    if options is None:
+        return None
+    fetch_size = options.fetch_size or estimate_fetch_size(table_conf, src_schema, engine)
+    if options.lower_bound is not None and options.upper_bound is not None and options.number_partitions:
+        return dataclasses.replace(options, fetch_size=fetch_size)
+
+    partition_column = options.partition_column or get_partition_column(table_conf, src_schema, engine)
+    if partition_column is None and not supports_partition_hash(engine):
+        logger.warning(f"No numeric join column to partition the reads of {table_conf.source_name} by")
+        return dataclasses.replace(options, number_partitions=1, fetch_size=fetch_size)
+    if partition_column is None:
+        number_partitions = options.number_partitions
+        if not number_partitions:
+            (row_count,) = probe(build_row_count_query(table_conf, engine))
+            number_partitions = _get_number_partitions(row_count, parallelism)
+        resolved = dataclasses.replace(options, number_partitions=number_partitions, fetch_size=fetch_size)
+        logger.info(f"JDBC reads of {table_conf.source_name} split by the hash of the key columns: {resolved}")
+        return resolved
+
+    lower_bound, upper_bound, row_count = probe(build_partition_bounds_query(table_conf, partition_column, engine))
+    number_partitions = options.number_partitions or _get_number_partitions(row_count, parallelism)
+    if lower_bound is None or upper_bound is None:
+        number_partitions = 1
+    resolved = JdbcReaderOptions(
+        number_partitions=number_partitions,
+        partition_column=partition_column,
+        lower_bound=options.lower_bound or (None if lower_bound is None else _to_bound(lower_bound, False)),
+        upper_bound=options.upper_bound or (None if upper_bound is None else _to_bound(upper_bound, True)),
+        fetch_size=fetch_size,
+    )
+    logger.info(f"JDBC reader options of {table_conf.source_name} for {row_count} rows: {resolved}")
+    return resolved
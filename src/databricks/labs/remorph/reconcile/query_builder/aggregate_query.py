@@ -16,6 +16,9 @@ from databricks.labs.remorph.reconcile.recon_config import (
 
 logger = logging.getLogger(__name__)
 
+# the column of the GROUPING SETS query telling the group by of each row
+GROUPING_ID_COLUMN_NAME = "grouping_id"
+
 
 class AggregateQueryBuilder(QueryBuilder):
 
@@ -105,6 +108,39 @@ class AggregateQueryBuilder(QueryBuilder):
         :param group_list: List of Aggregate objects with same Group by columns
         :return: str - SQL Query
         """
+        select_cols_with_alias, select_group_by_cols_with_alias, group_by_col_without_alias, query_agg_rules = (
+            self._get_layer_query_parts(group_list)
+        )
+        query_exp = exp.select(*select_cols_with_alias).from_(":tbl").where(self.filter)
+
+        # Apply Group by if group_by_columns are defined
+        if group_list[0].group_by_columns:
+            query_exp = (
+                exp.select(*select_cols_with_alias + select_group_by_cols_with_alias)
+                .from_(":tbl")
+                .where(self.filter)
+                .group_by(*group_by_col_without_alias)
+            )
+
+        agg_query_rules = AggregateQueryRules(
+            layer=self.layer,
+            group_by_columns=group_list[0].group_by_columns,
+            group_by_columns_as_str=group_list[0].group_by_columns_as_str,
+            query=query_exp.sql(dialect=self.engine),
+            rules=query_agg_rules,
+        )
+        return agg_query_rules
+
+    def _get_layer_query_parts(
+        self, group_list: list[Aggregate]
+    ) -> tuple[list[exp.Expression], list[exp.Expression], list[exp.Expression], list[AggregateRule]]:
+        """
+        Builds the parts of the query of the aggregates with the same group by columns, see `_get_layer_query`
+
+        :param group_list: List of Aggregate objects with same Group by columns
+        :return: the aggregate columns and the group by columns with their alias, the group by columns without alias
+        and the rules of the aggregates
+        """
         cols_with_mapping: list[exp.Expression] = []
         # Generates a Single Query for multiple aggregates with the same group_by_columns,
         #   refer to Example 1
@@ -139,11 +175,11 @@ class AggregateQueryBuilder(QueryBuilder):
 
         # Transformed columns
         select_cols_with_alias = self._agg_query_cols_with_alias(select_cols_with_transform)
-        query_exp = exp.select(*select_cols_with_alias).from_(":tbl").where(self.filter)
 
         assert group_list[0], "At least, one item must be present in the group_list."
 
-        # Apply Group by if group_by_columns are defined
+        select_group_by_cols_with_alias: list[exp.Expression] = []
+        group_by_col_without_alias: list[exp.Expression] = []
         if group_list[0].group_by_columns:
             group_by_cols_with_mapping = self._get_mapping_cols_with_alias(group_list[0].group_by_columns, "GROUP_BY")
 
@@ -164,21 +200,7 @@ class AggregateQueryBuilder(QueryBuilder):
                 if " AS " in group_by_col_with_alias.sql()
             ]
 
-            query_exp = (
-                exp.select(*select_cols_with_alias + select_group_by_cols_with_alias)
-                .from_(":tbl")
-                .where(self.filter)
-                .group_by(*group_by_col_without_alias)
-            )
-
-        agg_query_rules = AggregateQueryRules(
-            layer=self.layer,
-            group_by_columns=group_list[0].group_by_columns,
-            group_by_columns_as_str=group_list[0].group_by_columns_as_str,
-            query=query_exp.sql(dialect=self.engine),
-            rules=query_agg_rules,
-        )
-        return agg_query_rules
+        return select_cols_with_alias, select_group_by_cols_with_alias, group_by_col_without_alias, query_agg_rules
 
     def grouped_aggregates(self):
         """
@@ -285,3 +307,90 @@ class AggregateQueryBuilder(QueryBuilder):
             query_with_rules_list.append(self._get_layer_query(list(group)))
 
         return query_with_rules_list
+
+    def build_grouping_sets_queries(self) -> list[AggregateQueryRules]:
+        """
+        Generates the same query rules as `build_queries`, but all of them share a single query computing the
+        aggregates of every group by in one scan of the table, with GROUPING SETS.
+
+        The rows of the query rules of a group have its `grouping_id`, the bit vector of GROUPING_ID in which a bit is
+        set for each group by column not grouped by, and only its `columns` are kept. An aggregate of several groups
+        is computed once per grouping set.
+
+        Examples:
+            [Aggregate(type="Max", agg_cols=["col3"], group_by_columns=["col1"]),
+             Aggregate(type="Sum", agg_cols=["col2"], group_by_columns=["col4"])]
+            Returns -> SELECT MAX(col3) AS source_max_col3, SUM(col2) AS source_sum_col2, col1 AS source_group_by_col1,
+                        col4 AS source_group_by_col4, GROUPING_ID(col1, col4) AS grouping_id
+                       FROM :tbl GROUP BY GROUPING SETS ((col1), (col4))
+                       with the grouping id 1 for the rules grouped by col1 and 2 for those grouped by col4
+        :return: list[AggregateQueryRules] - the query rules of each group, sharing the query
+        """
+        groups = []
+        for key, group in self.grouped_aggregates():
+            logger.info(f"Building Grouping Set and Rules for key: {key}, layer: {self.layer}")
+            group_list = list(group)
+            groups.append((group_list, self._get_layer_query_parts(group_list)))
+
+        select_cols, group_by_select_cols, group_by_cols = _merge_group_columns([parts for _, parts in groups])
+        grouping_columns = list(group_by_cols)
+        grouping_sets = [
+            exp.Tuple(expressions=[col.copy() for col in group_by_cols_without_alias])
+            for _, (_, _, group_by_cols_without_alias, _) in groups
+        ]
+        grouping_id = build_column(
+            this=exp.Anonymous(this="GROUPING_ID", expressions=[col.copy() for col in group_by_cols.values()]),
+            alias=GROUPING_ID_COLUMN_NAME,
+        )
+        query = (
+            exp.select(*list(select_cols.values()) + list(group_by_select_cols.values()) + [grouping_id])
+            .from_(":tbl")
+            .where(self.filter)
+        )
+        query.set("group", exp.Group(grouping_sets=grouping_sets))
+        query_sql = query.sql(dialect=self.engine)
+        logger.info(f"Grouping Sets Aggregate Query for {self.layer}: {query_sql}")
+
+        query_rules_list = []
+        for group_list, (agg_cols, group_by_cols_with_alias, group_by_cols_without_alias, rules) in groups:
+            query_rules_list.append(
+                AggregateQueryRules(
+                    layer=self.layer,
+                    group_by_columns=group_list[0].group_by_columns,
+                    group_by_columns_as_str=group_list[0].group_by_columns_as_str,
+                    query=query_sql,
+                    rules=rules,
+                    grouping_id=_get_grouping_id(grouping_columns, group_by_cols_without_alias),
+                    columns=[col.alias for col in agg_cols + group_by_cols_with_alias],
+                )
+            )
+        return query_rules_list
+
+
+def _merge_group_columns(
+    groups_parts: list[tuple[list[exp.Expression], list[exp.Expression], list[exp.Expression], list[AggregateRule]]],
+) -> tuple[dict[str, exp.Expression], dict[str, exp.Expression], dict[str, exp.Expression]]:
+    """
+    The aggregate, the aliased group by and the group by columns of all the groups, by alias or SQL. An aggregate or
+    group by column shared by groups is selected once.
+    """
+    select_cols: dict[str, exp.Expression] = {}
+    group_by_select_cols: dict[str, exp.Expression] = {}
+    group_by_cols: dict[str, exp.Expression] = {}
+    for agg_cols, group_by_cols_with_alias, group_by_cols_without_alias, _ in groups_parts:
+        select_cols |= {col.alias: col for col in agg_cols if col.alias not in select_cols}
+        group_by_select_cols |= {
+            col.alias: col for col in group_by_cols_with_alias if col.alias not in group_by_select_cols
+        }
+        group_by_cols |= {col.sql(): col for col in group_by_cols_without_alias if col.sql() not in group_by_cols}
+    return select_cols, group_by_select_cols, group_by_cols
+
+
+def _get_grouping_id(grouping_columns: list[str], group_by_cols: list[exp.Expression]) -> int:
+    """The GROUPING_ID of the rows of a group by, a bit is set for each grouping column it does not group by."""
+    grouped = {col.sql() for col in group_by_cols}
+    return sum(
+        1 << (len(grouping_columns) - 1 - index)
+        for index, column in enumerate(grouping_columns)
+        if column not in grouped
+    )
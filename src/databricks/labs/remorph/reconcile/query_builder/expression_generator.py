@@ -33,6 +33,18 @@ def sha2(expr: exp.Expression, num_bits: str, is_expr: bool = False) -> exp.Expr
     return _apply_func_expr(expr, exp.SHA2, length=exp.Literal(this=num_bits, is_string=False))
 
 
+def sha1(expr: exp.Expression, is_expr: bool = False) -> exp.Expression:
+    if is_expr:
+        return exp.SHA(this=expr)
+    return _apply_func_expr(expr, exp.SHA)
+
+
+def md5(expr: exp.Expression, is_expr: bool = False) -> exp.Expression:
+    if is_expr:
+        return exp.MD5(this=expr)
+    return _apply_func_expr(expr, exp.MD5)
+
+
 def lower(expr: exp.Expression, is_expr: bool = False) -> exp.Expression:
     if is_expr:
         return exp.Lower(this=expr)
@@ -147,11 +159,16 @@ def transform_expression(
     return expr
 
 
-def get_hash_transform(source: Dialect):
-    dialect_algo = list(filter(lambda dialect: dialect.dialect == source, Dialect_hash_algo_mapping))
+def get_hash_transform(source: Dialect, algorithm: str = "sha256"):
+    dialect_algo = list(
+        filter(
+            lambda dialect: dialect.dialect == source and dialect.algorithm == algorithm,
+            Dialect_hash_algo_mapping,
+        )
+    )
     if dialect_algo:
         return dialect_algo[0].algo
-    raise ValueError(f"Source {source} is not supported")
+    raise ValueError(f"Source {source} is not supported for the {algorithm} hash algorithm")
 
 
 def build_from_clause(table_name: str, table_alias: str | None = None) -> exp.From:
@@ -234,6 +251,7 @@ DataType_transform_mapping: dict[str, dict[str, list[partial[exp.Expression]]]]
     },
 }
 
+# the hashes are returned as hex digits, lower cased by the hash query so they compare across dialects
 Dialect_hash_algo_mapping = [
     DialectHashConfig(dialect=get_dialect("snowflake"), algo=[partial(sha2, num_bits="256", is_expr=True)]),
     DialectHashConfig(
@@ -241,4 +259,61 @@ Dialect_hash_algo_mapping = [
         algo=[partial(anonymous, func="RAWTOHEX(STANDARD_HASH({}, 'SHA256'))", is_expr=True)],
     ),
     DialectHashConfig(dialect=get_dialect("databricks"), algo=[partial(sha2, num_bits="256", is_expr=True)]),
+    DialectHashConfig(dialect=get_dialect("snowflake"), algo=[partial(sha1, is_expr=True)], algorithm="sha1"),
+    DialectHashConfig(
+        dialect=get_dialect("oracle"),
+        algo=[partial(anonymous, func="RAWTOHEX(STANDARD_HASH({}, 'SHA1'))", is_expr=True)],
+        algorithm="sha1",
+    ),
+    DialectHashConfig(dialect=get_dialect("databricks"), algo=[partial(sha1, is_expr=True)], algorithm="sha1"),
+    DialectHashConfig(dialect=get_dialect("snowflake"), algo=[partial(md5, is_expr=True)], algorithm="md5"),
+    DialectHashConfig(
+        dialect=get_dialect("oracle"),
+        algo=[partial(anonymous, func="RAWTOHEX(STANDARD_HASH({}, 'MD5'))", is_expr=True)],
+        algorithm="md5",
+    ),
+    DialectHashConfig(dialect=get_dialect("databricks"), algo=[partial(md5, is_expr=True)], algorithm="md5"),
 ]
+
+# converts a string of hex digits to an integer, the mask has an X per digit
+Dialect_hex_to_int_mapping = [
+    (get_dialect("snowflake"), "TO_NUMBER({expr}, '{mask}')"),
+    (get_dialect("oracle"), "TO_NUMBER({expr}, '{mask}')"),
+    (get_dialect("databricks"), "CAST(CONV({expr}, 16, 10) AS BIGINT)"),
+]
+
+
+def hex_to_int(expr: exp.Expression, source: Dialect, start: int, length: int = 8) -> exp.Expression:
+    """Converts the `length` hex digits of a hash starting at the given (1 based) position to an integer"""
+    funcs = [func for dialect, func in Dialect_hex_to_int_mapping if dialect == source]
+    if not funcs:
+        raise ValueError(f"Source {source} is not supported")
+    hex_digits = exp.Substring(this=expr, start=exp.Literal.number(start), length=exp.Literal.number(length))
+    return exp.Column(this=funcs[0].format(expr=hex_digits.sql(dialect=source), mask="X" * length))
+
+
+# the partition of a row from the native hash of its key columns, cheaper than the hash of the row, and the separator
+# of the keys: ORA_HASH takes a single expression so the keys are hashed as one string
+Dialect_partition_hash_mapping = [
+    (get_dialect("snowflake"), "ABS(MOD(HASH({keys}), {num_partitions}))", ", "),
+    (get_dialect("oracle"), "NVL(ORA_HASH({keys}, {max_partition}), 0)", " || '|' || "),
+]
+
+
+def supports_partition_hash(source: Dialect) -> bool:
+    return any(dialect == source for dialect, _, _ in Dialect_partition_hash_mapping)
+
+
+def get_partition_hash(keys: list[exp.Expression], num_partitions: int, source: Dialect) -> exp.Expression:
+    """The partition of a row, from 0 to `num_partitions` - 1, derived from the native hash of its key columns"""
+    funcs = [(func, separator) for dialect, func, separator in Dialect_partition_hash_mapping if dialect == source]
+    if not funcs:
+        raise ValueError(f"Source {source} is not supported")
+    func, separator = funcs[0]
+    return exp.Column(
+        this=func.format(
+            keys=separator.join(key.sql(dialect=source) for key in keys),
+            num_partitions=num_partitions,
+            max_partition=num_partitions - 1,
+        )
+    )
@@ -3,12 +3,18 @@ import logging
 import sqlglot.expressions as exp
 from sqlglot import Dialect
 
+from databricks.labs.remorph.config import get_dialect
+from databricks.labs.remorph.reconcile.exception import InvalidInputException
 from databricks.labs.remorph.reconcile.query_builder.base import QueryBuilder
 from databricks.labs.remorph.reconcile.query_builder.expression_generator import (
     build_column,
+    build_literal,
     concat,
     get_hash_transform,
+    get_partition_hash,
+    hex_to_int,
     lower,
+    supports_partition_hash,
     transform_expression,
 )
 
@@ -18,23 +24,89 @@ logger = logging.getLogger(__name__)
 def _hash_transform(
     node: exp.Expression,
     source: Dialect,
+    algorithm: str,
 ):
-    transform = get_hash_transform(source)
+    transform = get_hash_transform(source, algorithm)
     return transform_expression(node, transform)
 
 
 _HASH_COLUMN_NAME = "hash_value_recon"
+_BUCKET_COLUMN_NAME = "bucket_id"
+# a sample is drawn in steps of 0.01%
+_SAMPLE_BUCKETS = 10_000
+# the hex digits of a compact hash, 60 bits fit in a BIGINT on every dialect
+_COMPACT_HASH_DIGITS = 15
 
 
 class HashQueryBuilder(QueryBuilder):
 
-    def build_query(self, report_type: str) -> str:
+    def build_query(
+        self,
+        report_type: str,
+        buckets: list[int] | None = None,
+        sample_percentage: float | None = None,
+        with_thresholds: bool = False,
+    ) -> str:
+        """
+        Builds the query returning the hash of every row with its key columns.
+
+        :param report_type: the reconcile report type
+        :param buckets: only return the rows of these hash buckets, see `build_bucket_query`
+        :param sample_percentage: only return this share of the rows, picked by the hash of the join columns so both
+        sides return the same keys
+        :param with_thresholds: also return the threshold columns, which are not part of the hash, so the threshold
+        comparison needs no read of its own
+
+        The hash is the lower case hex digest of the row, or the integer of its first 60 bits for a table with
+        `compact_hash`.
+        """
+        res = self._build_query(report_type, buckets, sample_percentage, with_thresholds).sql(dialect=self.engine)
+
+        logger.info(f"Hash Query for {self.layer}: {res}")
+        return res
+
+    def build_queries(
+        self,
+        report_type: str,
+        num_partitions: int | None = None,
+        buckets: list[int] | None = None,
+        sample_percentage: float | None = None,
+        with_thresholds: bool = False,
+    ) -> list[str]:
+        """
+        Builds the hash query split in `num_partitions` queries by the native hash of the key columns, so the rows
+        of a table without a numeric key can be read over several connections. The queries read disjoint sets of
+        rows, their results are meant to be unioned. A single query is returned for the sources without a native
+        hash.
+        """
+        if not num_partitions or num_partitions < 2 or not supports_partition_hash(self.engine):
+            return [self.build_query(report_type, buckets, sample_percentage, with_thresholds)]
+
+        key_cols = self._get_hash_columns() if report_type == "row" else sorted(self.join_columns or set())
+        partition_hash = get_partition_hash([exp.column(col) for col in key_cols], num_partitions, self.engine)
+        query = self._build_query(report_type, buckets, sample_percentage, with_thresholds)
+        res = [
+            query.where(exp.EQ(this=partition_hash.copy(), expression=exp.Literal.number(partition))).sql(
+                dialect=self.engine
+            )
+            for partition in range(num_partitions)
+        ]
 
+        logger.info(f"Hash Queries for {self.layer} in {num_partitions} partitions: {res}")
+        return res
+
+    def _build_query(
+        self,
+        report_type: str,
+        buckets: list[int] | None,
+        sample_percentage: float | None,
+        with_thresholds: bool = False,
+    ) -> exp.Select:
         if report_type != 'row':
             self._validate(self.join_columns, f"Join Columns are compulsory for {report_type} type")
 
         _join_columns = self.join_columns if self.join_columns else set()
-        hash_cols = sorted((_join_columns | self.select_columns) - self.threshold_columns - self.drop_columns)
+        hash_cols = self._get_hash_columns()
 
         key_cols = hash_cols if report_type == "row" else sorted(_join_columns | self.partition_column)
 
@@ -43,30 +115,109 @@ class HashQueryBuilder(QueryBuilder):
             for col in key_cols
         ]
 
-        # in case if we have column mapping, we need to sort the target columns in the order of source columns to get
-        # same hash value
-        hash_cols_with_alias = [
-            {"this": col, "alias": self.table_conf.get_layer_tgt_to_src_col_mapping(col, self.layer)}
-            for col in hash_cols
-        ]
-        sorted_hash_cols_with_alias = sorted(hash_cols_with_alias, key=lambda column: column["alias"])
-        hashcols_sorted_as_src_seq = [column["this"] for column in sorted_hash_cols_with_alias]
+        if with_thresholds:
+            cols_with_alias += [
+                build_column(this=col, alias=self.table_conf.get_layer_tgt_to_src_col_mapping(col, self.layer))
+                for col in sorted(self.threshold_columns)
+            ]
 
         key_cols_with_transform = (
             self._apply_user_transformation(cols_with_alias) if self.user_transformations else cols_with_alias
         )
-        hash_col_with_transform = [self._generate_hash_algorithm(hashcols_sorted_as_src_seq, _HASH_COLUMN_NAME)]
+        hash_col_with_transform = [self._generate_hash_algorithm(self._sorted_as_src_seq(hash_cols), _HASH_COLUMN_NAME)]
+        if self.table_conf.compact_hash:
+            # the integer of the leading hex digits is shipped, joined and written instead of the hex string
+            compact_hash = hex_to_int(hash_col_with_transform[0].this, self.engine, 1, _COMPACT_HASH_DIGITS)
+            hash_col_with_transform = [build_column(this=compact_hash, alias=_HASH_COLUMN_NAME)]
+
+        query = exp.select(*hash_col_with_transform + key_cols_with_transform).from_(":tbl").where(self.filter)
+        if buckets is not None:
+            bucket_ids = [exp.Literal.number(bucket) for bucket in buckets]
+            query = query.where(
+                exp.In(
+                    this=self._get_bucket_expression(report_type, self._get_num_buckets()),
+                    expressions=bucket_ids,
+                )
+            )
+        if sample_percentage is not None:
+            sampled_buckets = exp.Literal.number(max(round(sample_percentage * _SAMPLE_BUCKETS / 100), 1))
+            query = query.where(
+                exp.LT(this=self._get_bucket_expression(report_type, _SAMPLE_BUCKETS), expression=sampled_buckets)
+            )
+        return query
+
+    def build_bucket_query(self, report_type: str) -> str:
+        """
+        Builds the query summarising the row hashes per bucket, the bucket of a row is derived from the hash of its
+        join columns so a row falls in the same bucket on both sides. The count and the sums of two 32 bit slices of
+        the row hashes of a bucket are equal on both sides only if its rows match, so the row hashes only have to be
+        read for the buckets that differ.
+        """
+        if report_type != 'row':
+            self._validate(self.join_columns, f"Join Columns are compulsory for {report_type} type")
+        num_buckets = self._get_num_buckets()
 
-        res = (
-            exp.select(*hash_col_with_transform + key_cols_with_transform)
+        row_hashes = (
+            exp.select(
+                self._generate_hash_algorithm(self._sorted_as_src_seq(self._get_hash_columns()), _HASH_COLUMN_NAME),
+                build_column(this=self._get_bucket_expression(report_type, num_buckets), alias=_BUCKET_COLUMN_NAME),
+            )
             .from_(":tbl")
             .where(self.filter)
+            .subquery(alias="row_hashes")
+        )
+        hash_value = build_column(this=_HASH_COLUMN_NAME)
+        res = (
+            exp.select(
+                build_column(this=_BUCKET_COLUMN_NAME),
+                build_column(this=exp.Count(this=build_literal(this="1", is_string=False)), alias="row_count"),
+                build_column(this=self._sum_hash_slice(hash_value, 1), alias="hash_sum_1"),
+                build_column(this=self._sum_hash_slice(hash_value, 9), alias="hash_sum_2"),
+            )
+            .from_(row_hashes)
+            .group_by(_BUCKET_COLUMN_NAME)
             .sql(dialect=self.engine)
         )
 
-        logger.info(f"Hash Query for {self.layer}: {res}")
+        logger.info(f"Bucket Hash Query for {self.layer}: {res}")
         return res
 
+    def _get_num_buckets(self) -> int:
+        num_buckets = self.table_conf.hash_buckets
+        if num_buckets is None or num_buckets < 1:
+            message = (
+                f"Exception for {self.table_conf.target_name} target table in {self.layer} layer --> "
+                f"Hash buckets must be a positive number, got {num_buckets}"
+            )
+            logger.error(message)
+            raise InvalidInputException(message)
+        return num_buckets
+
+    def _sum_hash_slice(self, hash_value: exp.Expression, start: int) -> exp.Expression:
+        hash_slice = hex_to_int(hash_value, self.engine, start)
+        if self.engine == get_dialect("databricks"):
+            # the 32 bit slices of a few billion rows overflow a BIGINT sum, the other engines sum NUMBER(38)
+            return exp.Sum(this=exp.Cast(this=hash_slice, to=exp.DataType.build("DECIMAL(38, 0)")))
+        return exp.Sum(this=hash_slice)
+
+    def _get_hash_columns(self) -> list[str]:
+        _join_columns = self.join_columns if self.join_columns else set()
+        return sorted((_join_columns | self.select_columns) - self.threshold_columns - self.drop_columns)
+
+    def _sorted_as_src_seq(self, cols: list[str] | set[str]) -> list[str]:
+        # in case if we have column mapping, we need to sort the target columns in the order of source columns to get
+        # same hash value
+        return sorted(cols, key=lambda col: self.table_conf.get_layer_tgt_to_src_col_mapping(col, self.layer))
+
+    def _get_bucket_expression(self, report_type: str, num_buckets: int) -> exp.Expression:
+        key_cols = self._get_hash_columns() if report_type == "row" else (self.join_columns or set())
+        key_hash = self._generate_hash_algorithm(self._sorted_as_src_seq(key_cols), _BUCKET_COLUMN_NAME).this
+        # MOD() rather than %, which Oracle does not support
+        return exp.Anonymous(
+            this="MOD",
+            expressions=[hex_to_int(key_hash, self.engine, 1), exp.Literal.number(num_buckets)],
+        )
+
     def _generate_hash_algorithm(
         self,
         cols: list[str],
@@ -77,6 +228,8 @@ class HashQueryBuilder(QueryBuilder):
         col_exprs = exp.select(*cols_with_transform).iter_expressions()
         concat_expr = concat(list(col_exprs))
 
-        hash_expr = concat_expr.transform(_hash_transform, self.engine).transform(lower, is_expr=True)
+        hash_expr = concat_expr.transform(_hash_transform, self.engine, self.table_conf.hash_algorithm).transform(
+            lower, is_expr=True
+        )
 
         return build_column(hash_expr, alias=column_alias)
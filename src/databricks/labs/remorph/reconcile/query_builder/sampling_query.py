@@ -1,41 +1,55 @@
 import logging
+from uuid import uuid4
 
 import sqlglot.expressions as exp
-from pyspark.sql import DataFrame
-from sqlglot import select
+from pyspark.sql import DataFrame, Row, SparkSession
+from pyspark.sql.types import NumericType, StringType
+from sqlglot import Dialect, parse_one, select
 
 from databricks.labs.remorph.config import get_key_from_dialect
 from databricks.labs.remorph.reconcile.query_builder.base import QueryBuilder
 from databricks.labs.remorph.reconcile.query_builder.expression_generator import (
     build_column,
     build_literal,
-    _get_is_string,
-    build_join_clause,
     trim,
-    coalesce,
 )
-
-_SAMPLE_ROWS = 50
+from databricks.labs.remorph.reconcile.recon_config import Schema, Table
 
 logger = logging.getLogger(__name__)
 
-
-def _union_concat(
-    unions: list[exp.Select],
-    result: exp.Union | exp.Select,
-    cnt=0,
-) -> exp.Select | exp.Union:
-    if len(unions) == 1:
-        return result
-    if cnt == len(unions) - 2:
-        return exp.union(result, unions[cnt + 1])
-    cnt = cnt + 1
-    res = exp.union(result, unions[cnt])
-    return _union_concat(unions, res, cnt)
+# Oracle rejects an IN list of more than 1000 expressions
+_IN_LIST_MAX_KEYS = 1000
 
 
 class SamplingQueryBuilder(QueryBuilder):
-    def build_query(self, df: DataFrame):
+    def __init__(
+        self,
+        table_conf: Table,
+        schema: list[Schema],
+        layer: str,
+        engine: Dialect,
+    ):
+        super().__init__(table_conf, schema, layer, engine)
+        self._staging_views: list[str] = []
+
+    @property
+    def staging_views(self) -> list[str]:
+        return self._staging_views
+
+    def drop_staging_views(self, spark: SparkSession) -> None:
+        """Drops the views staging the keys of the samples, once the rows of the samples are read."""
+        while self._staging_views:
+            spark.catalog.dropTempView(self._staging_views.pop())
+
+    def build_queries(self, df: DataFrame) -> list[str]:
+        """
+        Builds the queries reading the rows of the keys in the given sample.
+
+        The keys are shipped in an IN list, filtering on the key columns themselves so an index on them can be used.
+        A sample of more than `_IN_LIST_MAX_KEYS` keys is staged in a temporary view when the table is read by Spark
+        and otherwise split into one query per `_IN_LIST_MAX_KEYS` keys, whose results are meant to be unioned. The
+        staging views are named uniquely and kept until `drop_staging_views`.
+        """
         self._validate(self.join_columns, "Join Columns are compulsory for sampling query")
         join_columns = self.join_columns if self.join_columns else set()
         if self.layer == "source":
@@ -43,63 +57,103 @@ class SamplingQueryBuilder(QueryBuilder):
         else:
             key_cols = sorted(self.table_conf.get_tgt_to_src_col_mapping_list(join_columns))
         keys_df = df.select(*key_cols)
-        with_clause = self._get_with_clause(keys_df)
+        keys = keys_df.collect()
 
         cols = sorted((join_columns | self.select_columns) - self.threshold_columns - self.drop_columns)
-
         cols_with_alias = [
             build_column(this=col, alias=self.table_conf.get_layer_tgt_to_src_col_mapping(col, self.layer))
             for col in cols
         ]
-
         sql_with_transforms = self.add_transformations(cols_with_alias, self.engine)
-        query_sql = select(*sql_with_transforms).from_(":tbl").where(self.filter)
-        if self.layer == "source":
-            with_select = [build_column(this=col, table_name="src") for col in sorted(cols)]
-        else:
-            with_select = [
-                build_column(this=col, table_name="src")
-                for col in sorted(self.table_conf.get_tgt_to_src_col_mapping_list(cols))
-            ]
 
-        join_clause = SamplingQueryBuilder._get_join_clause(key_cols)
-
-        query = (
-            with_clause.with_(alias="src", as_=query_sql)
-            .select(*with_select)
-            .from_("src")
-            .join(join_clause)
-            .sql(dialect=self.engine)
-        )
-        logger.info(f"Sampling Query for {self.layer}: {query}")
-        return query
-
-    @classmethod
-    def _get_join_clause(cls, key_cols: list):
-        return (
-            build_join_clause(
-                "recon", key_cols, source_table_alias="src", target_table_alias="recon", kind="inner", func=exp.EQ
+        if len(keys) > _IN_LIST_MAX_KEYS and get_key_from_dialect(self.engine) == "databricks":
+            # concurrent tables and samplers of the same table each stage their own keys
+            staging_view = f"{self.layer}_{self.table_conf.target_name}_sample_keys_{uuid4().hex}_vw"
+            keys_df.createOrReplaceTempView(staging_view)
+            self._staging_views.append(staging_view)
+            query = (
+                select(*sql_with_transforms)
+                .from_(":tbl AS src")
+                .where(self.filter)
+                .where(self._get_staged_keys_condition(key_cols, staging_view))
+                .sql(dialect=self.engine)
             )
-            .transform(coalesce, default="_null_recon_", is_string=True)
-            .transform(trim)
-        )
-
-    def _get_with_clause(self, df: DataFrame) -> exp.Select:
-        union_res = []
-        for row in df.take(_SAMPLE_ROWS):
-            column_types = [(str(f.name).lower(), f.dataType) for f in df.schema.fields]
-            column_types_dict = dict(column_types)
-            row_select = [
+            logger.info(f"Sampling Query for {self.layer} with {len(keys)} staged keys: {query}")
+            return [query]
+
+        key_types = {field.name.lower(): field.dataType for field in keys_df.schema.fields}
+        queries = []
+        # an empty sample still gets a query, reading no rows but the columns of the table
+        for start in range(0, max(len(keys), 1), _IN_LIST_MAX_KEYS):
+            chunk = keys[start : start + _IN_LIST_MAX_KEYS]
+            query = (
+                select(*sql_with_transforms)
+                .from_(":tbl")
+                .where(self.filter)
+                .where(self._get_keys_condition(key_cols, key_types, chunk))
+                .sql(dialect=self.engine)
+            )
+            queries.append(query)
+        logger.info(f"Sampling Queries for {self.layer}: {queries}")
+        return queries
+
+    def _get_key_expression(self, key_col: str, table_alias: str | None = None) -> exp.Expression:
+        column_name = self.table_conf.get_layer_src_to_tgt_col_mapping(key_col, self.layer)
+        # the keys of the sample are read by the hash query, with the user transformations applied
+        if column_name in self.user_transformations:
+            key_expr = parse_one(self.user_transformations[column_name])
+        else:
+            key_expr = exp.column(column_name)
+        if table_alias:
+            key_expr = key_expr.transform(
+                lambda node: exp.column(node.name, table=table_alias) if isinstance(node, exp.Column) else node
+            )
+        return key_expr
+
+    def _get_keys_condition(self, key_cols: list[str], key_types: dict, keys: list[Row]) -> exp.Expression:
+        key_exprs = []
+        for key_col in key_cols:
+            key_expr = self._get_key_expression(key_col)
+            if not isinstance(key_types.get(key_col), (NumericType, StringType)):
+                # dates and the like are shipped as text, so they are compared as text as well
+                key_expr = trim(key_expr)
+            key_exprs.append(key_expr)
+
+        def literal(key_col: str, value) -> exp.Expression:
+            return build_literal(this=str(value), is_string=not isinstance(key_types.get(key_col), NumericType))
+
+        # NULL never equals an IN list element, the keys with a NULL are matched one by one
+        complete_keys = [key for key in keys if all(value is not None for value in key)]
+        conditions: list[exp.Expression] = []
+        if complete_keys and len(key_cols) == 1:
+            in_list = [literal(key_cols[0], key[0]) for key in complete_keys]
+            conditions.append(exp.In(this=key_exprs[0], expressions=in_list))
+        elif complete_keys:
+            in_list = [
+                exp.Tuple(expressions=[literal(col, value) for col, value in zip(key_cols, key)])
+                for key in complete_keys
+            ]
+            conditions.append(exp.In(this=exp.Tuple(expressions=key_exprs), expressions=in_list))
+        for key in keys:
+            if all(value is not None for value in key):
+                continue
+            key_conditions = [
                 (
-                    build_literal(this=str(value), alias=col, is_string=_get_is_string(column_types_dict, col))
-                    if value is not None
-                    else exp.Alias(this=exp.Null(), alias=col)
+                    exp.Is(this=key_expr.copy(), expression=exp.Null())
+                    if value is None
+                    else exp.EQ(this=key_expr.copy(), expression=literal(col, value))
                 )
-                for col, value in zip(df.columns, row)
+                for col, key_expr, value in zip(key_cols, key_exprs, key)
             ]
-            if get_key_from_dialect(self.engine) == "oracle":
-                union_res.append(select(*row_select).from_("dual"))
-            else:
-                union_res.append(select(*row_select))
-        union_statements = _union_concat(union_res, union_res[0], 0)
-        return exp.Select().with_(alias='recon', as_=union_statements)
+            conditions.append(exp.and_(*key_conditions))
+        if not conditions:
+            return exp.false()
+        return exp.or_(*conditions)
+
+    def _get_staged_keys_condition(self, key_cols: list[str], staging_view: str) -> exp.Expression:
+        matches = [
+            exp.NullSafeEQ(this=exp.column(key_col, table="recon"), expression=self._get_key_expression(key_col, "src"))
+            for key_col in key_cols
+        ]
+        staged_keys = select("1").from_(f"{staging_view} AS recon").where(exp.and_(*matches))
+        return exp.Exists(this=staged_keys)
@@ -1,8 +1,10 @@
 import logging
+import threading
 from datetime import datetime
 from functools import reduce
 
-from pyspark.sql import DataFrame, SparkSession
+from pyspark import StorageLevel
+from pyspark.sql import DataFrame, Row, SparkSession
 from pyspark.sql.functions import col, collect_list, create_map, lit
 from pyspark.sql.types import StringType, StructField, StructType
 from pyspark.errors import PySparkException
@@ -13,6 +15,7 @@ from databricks.labs.remorph.reconcile.exception import (
     WriteToTableException,
     ReadAndWriteWithVolumeException,
     CleanFromVolumeException,
+    InvalidInputException,
 )
 from databricks.labs.remorph.reconcile.recon_config import (
     DataReconcileOutput,
@@ -24,8 +27,12 @@ from databricks.labs.remorph.reconcile.recon_config import (
     TableThresholds,
     ReconcileRecordCount,
     AggregateQueryOutput,
+    RateEstimate,
+    ReconRunContext,
+    SampleReconcileOutput,
 )
 from databricks.sdk import WorkspaceClient
+from databricks.sdk.errors import DatabricksError, NotFound
 
 logger = logging.getLogger(__name__)
 
@@ -34,34 +41,97 @@ _RECON_METRICS_TABLE_NAME = "metrics"
 _RECON_DETAILS_TABLE_NAME = "details"
 _RECON_AGGREGATE_RULES_TABLE_NAME = "aggregate_rules"
 _RECON_AGGREGATE_METRICS_TABLE_NAME = "aggregate_metrics"
+_RECON_SAMPLE_METRICS_TABLE_NAME = "sample_metrics"
 _RECON_AGGREGATE_DETAILS_TABLE_NAME = "aggregate_details"
-_SAMPLE_ROWS = 50
+
+# the rows collected for each metadata table, with their schema
+_TableRows = dict[str, list[tuple[StructType, list[Row]]]]
+
+
+_STORAGE_LEVELS = {"disk": StorageLevel.DISK_ONLY, "memory": StorageLevel.MEMORY_AND_DISK}
+_INTERMEDIATE_STORAGES = {"volume", "delta", *_STORAGE_LEVELS}
 
 
 class ReconIntermediatePersist:
+    """
+    Keeps the unmatched rows of a table for the duration of its reconciliation.
+
+    The rows are written as parquet (``volume``) or Delta (``delta``) files to the path, or kept by Spark with the
+    ``disk`` or ``memory`` storage levels, which avoids the volume writes for short runs and small diffs. The
+    persisted DataFrames are kept by the instance until it cleans the table.
+    """
 
-    def __init__(self, spark: SparkSession, path: str):
+    def __init__(self, spark: SparkSession, path: str, storage: str = "volume", ws: WorkspaceClient | None = None):
+        if storage not in _INTERMEDIATE_STORAGES:
+            raise InvalidInputException(
+                f"Invalid intermediate storage {storage}, must be one of {sorted(_INTERMEDIATE_STORAGES)}"
+            )
         self.spark = spark
         self.path = path
+        self.storage = storage
+        self._ws = ws
+        self._persisted_dfs: list[DataFrame] = []
+        self._persisted_dfs_lock = threading.Lock()
 
     def _write_unmatched_df_to_volumes(
         self,
         unmatched_df: DataFrame,
+        path: str,
     ) -> None:
-        unmatched_df.write.format("parquet").mode("overwrite").save(self.path)
-
-    def _read_unmatched_df_from_volumes(self) -> DataFrame:
-        return self.spark.read.format("parquet").load(self.path)
+        if self.storage == "delta":
+            (
+                unmatched_df.write.format("delta")
+                .mode("overwrite")
+                .option("overwriteSchema", "true")
+                .option("delta.autoOptimize.optimizeWrite", "true")
+                .save(path)
+            )
+            return
+        unmatched_df.write.format("parquet").mode("overwrite").save(path)
+
+    def _read_unmatched_df_from_volumes(self, path: str) -> DataFrame:
+        file_format = "delta" if self.storage == "delta" else "parquet"
+        return self.spark.read.format(file_format).load(path)
+
+    def _persist_unmatched_df(self, unmatched_df: DataFrame) -> DataFrame:
+        persisted_df = unmatched_df.persist(_STORAGE_LEVELS[self.storage])
+        # materialise once, so the counts and samples that follow reuse the persisted rows
+        persisted_df.count()
+        with self._persisted_dfs_lock:
+            self._persisted_dfs.append(persisted_df)
+        return persisted_df
+
+    def _delete_directory(self, path: str):
+        assert self._ws is not None
+        try:
+            entries = list(self._ws.files.list_directory_contents(path))
+        except NotFound:
+            return
+        for entry in entries:
+            if entry.path is None:
+                continue
+            if entry.is_directory:
+                self._delete_directory(entry.path)
+            else:
+                self._ws.files.delete(entry.path)
+        self._ws.files.delete_directory(path)
 
     def clean_unmatched_df_from_volume(self):
         try:
-            # TODO: for now we are overwriting the intermediate cache path. We should delete the volume in future
-            # workspace_client.dbfs.get_status(path)
-            # workspace_client.dbfs.delete(path, recursive=True)
-            empty_df = self.spark.createDataFrame([], schema=StructType([StructField("empty", StringType(), True)]))
-            empty_df.write.format("parquet").mode("overwrite").save(self.path)
+            if self.storage in _STORAGE_LEVELS:
+                # the aggregates reconciliation persists one DataFrame per group
+                with self._persisted_dfs_lock:
+                    persisted_dfs, self._persisted_dfs = self._persisted_dfs, []
+                for persisted_df in persisted_dfs:
+                    persisted_df.unpersist()
+            elif self._ws is not None:
+                self._delete_directory(self.path.rstrip("/"))
+            else:
+                # without a workspace client the files cannot be deleted, the path is overwritten with no rows
+                empty_df = self.spark.createDataFrame([], schema=StructType([StructField("empty", StringType(), True)]))
+                empty_df.write.format("parquet").mode("overwrite").save(self.path)
             logger.warning(f"Unmatched DF cleaned up from {self.path} successfully.")
-        except PySparkException as e:
+        except (PySparkException, DatabricksError) as e:
             message = f"Error cleaning up unmatched DF from {self.path} volumes --> {e}"
             logger.error(message)
             raise CleanFromVolumeException(message) from e
@@ -69,12 +139,17 @@ class ReconIntermediatePersist:
     def write_and_read_unmatched_df_with_volumes(
         self,
         unmatched_df: DataFrame,
+        sub_path: str = "",
     ) -> DataFrame:
+        # the aggregates reconciliation writes each group below the table path
+        path = f"{self.path}{sub_path}"
         try:
-            self._write_unmatched_df_to_volumes(unmatched_df)
-            return self._read_unmatched_df_from_volumes()
+            if self.storage in _STORAGE_LEVELS:
+                return self._persist_unmatched_df(unmatched_df)
+            self._write_unmatched_df_to_volumes(unmatched_df, path)
+            return self._read_unmatched_df_from_volumes(path)
         except PySparkException as e:
-            message = f"Exception in reading or writing unmatched DF with volumes {self.path} --> {e}"
+            message = f"Exception in reading or writing unmatched DF with volumes {path} --> {e}"
             logger.error(message)
             raise ReadAndWriteWithVolumeException(message) from e
 
@@ -89,135 +164,6 @@ def _write_df_to_delta(df: DataFrame, table_name: str, mode="append"):
         raise WriteToTableException(message) from e
 
 
-def generate_final_reconcile_output(
-    recon_id: str,
-    spark: SparkSession,
-    metadata_config: ReconcileMetadataConfig = ReconcileMetadataConfig(),
-    local_test_run: bool = False,
-) -> ReconcileOutput:
-    _db_prefix = "default" if local_test_run else f"{metadata_config.catalog}.{metadata_config.schema}"
-    recon_df = spark.sql(
-        f"""
-    SELECT 
-    CASE 
-        WHEN COALESCE(MAIN.SOURCE_TABLE.CATALOG, '') <> '' THEN CONCAT(MAIN.SOURCE_TABLE.CATALOG, '.', MAIN.SOURCE_TABLE.SCHEMA, '.', MAIN.SOURCE_TABLE.TABLE_NAME) 
-        ELSE CONCAT(MAIN.SOURCE_TABLE.SCHEMA, '.', MAIN.SOURCE_TABLE.TABLE_NAME) 
-    END AS SOURCE_TABLE, 
-    CONCAT(MAIN.TARGET_TABLE.CATALOG, '.', MAIN.TARGET_TABLE.SCHEMA, '.', MAIN.TARGET_TABLE.TABLE_NAME) AS TARGET_TABLE, 
-    CASE WHEN lower(MAIN.report_type) in ('all', 'row', 'data') THEN
-    CASE 
-        WHEN METRICS.recon_metrics.row_comparison.missing_in_source = 0 AND METRICS.recon_metrics.row_comparison.missing_in_target = 0 THEN TRUE 
-        ELSE FALSE 
-    END 
-    ELSE NULL END AS ROW, 
-    CASE WHEN lower(MAIN.report_type) in ('all', 'data') THEN
-    CASE 
-        WHEN (METRICS.run_metrics.status = true) or 
-         (METRICS.recon_metrics.column_comparison.absolute_mismatch = 0 AND METRICS.recon_metrics.column_comparison.threshold_mismatch = 0 AND METRICS.recon_metrics.column_comparison.mismatch_columns = '') THEN TRUE 
-        ELSE FALSE 
-    END 
-    ELSE NULL END AS COLUMN, 
-    CASE WHEN lower(MAIN.report_type) in ('all', 'schema') THEN
-    CASE 
-        WHEN METRICS.recon_metrics.schema_comparison = true THEN TRUE 
-        ELSE FALSE 
-    END
-    ELSE NULL END AS SCHEMA,
-    METRICS.run_metrics.exception_message AS EXCEPTION_MESSAGE 
-    FROM 
-        {_db_prefix}.{_RECON_TABLE_NAME} MAIN 
-    INNER JOIN 
-        {_db_prefix}.{_RECON_METRICS_TABLE_NAME} METRICS 
-    ON 
-        (MAIN.recon_table_id = METRICS.recon_table_id) 
-    WHERE 
-        MAIN.recon_id = '{recon_id}' 
-    """
-    )
-    table_output = []
-    for row in recon_df.collect():
-        if row.EXCEPTION_MESSAGE is not None and row.EXCEPTION_MESSAGE != "":
-            table_output.append(
-                ReconcileTableOutput(
-                    target_table_name=row.TARGET_TABLE,
-                    source_table_name=row.SOURCE_TABLE,
-                    status=StatusOutput(),
-                    exception_message=row.EXCEPTION_MESSAGE,
-                )
-            )
-        else:
-            table_output.append(
-                ReconcileTableOutput(
-                    target_table_name=row.TARGET_TABLE,
-                    source_table_name=row.SOURCE_TABLE,
-                    status=StatusOutput(row=row.ROW, column=row.COLUMN, schema=row.SCHEMA),
-                    exception_message=row.EXCEPTION_MESSAGE,
-                )
-            )
-    final_reconcile_output = ReconcileOutput(recon_id=recon_id, results=table_output)
-    logger.info(f"Final reconcile output: {final_reconcile_output}")
-    return final_reconcile_output
-
-
-def generate_final_reconcile_aggregate_output(
-    recon_id: str,
-    spark: SparkSession,
-    metadata_config: ReconcileMetadataConfig = ReconcileMetadataConfig(),
-    local_test_run: bool = False,
-) -> ReconcileOutput:
-    _db_prefix = "default" if local_test_run else f"{metadata_config.catalog}.{metadata_config.schema}"
-    recon_df = spark.sql(
-        f"""
-        SELECT source_table,
-         target_table,
-          EVERY(status) AS status,
-           ARRAY_JOIN(COLLECT_SET(exception_message), '\n') AS exception_message
-        FROM  
-        (SELECT 
-            IF(ISNULL(main.source_table.catalog)
-                , CONCAT_WS('.', main.source_table.schema, main.source_table.table_name)
-                , CONCAT_WS('.', main.source_table.catalog, main.source_table.schema, main.source_table.table_name)) AS source_table,     
-            CONCAT_WS('.', main.target_table.catalog, main.target_table.schema, main.target_table.table_name) AS target_table, 
-            IF(metrics.run_metrics.status='true', TRUE , FALSE) AS status, 
-            metrics.run_metrics.exception_message AS exception_message
-            FROM 
-                {_db_prefix}.{_RECON_TABLE_NAME} main 
-            INNER JOIN 
-                {_db_prefix}.{_RECON_AGGREGATE_METRICS_TABLE_NAME} metrics 
-            ON 
-                (MAIN.recon_table_id = METRICS.recon_table_id 
-                AND MAIN.operation_name = 'aggregates-reconcile') 
-            WHERE 
-                MAIN.recon_id = '{recon_id}'  
-        )
-        GROUP BY source_table, target_table; 
-    """
-    )
-    table_output = []
-    for row in recon_df.collect():
-        if row.exception_message is not None and row.exception_message != "":
-            table_output.append(
-                ReconcileTableOutput(
-                    target_table_name=row.target_table,
-                    source_table_name=row.source_table,
-                    status=StatusOutput(),
-                    exception_message=row.exception_message,
-                )
-            )
-        else:
-            table_output.append(
-                ReconcileTableOutput(
-                    target_table_name=row.target_table,
-                    source_table_name=row.source_table,
-                    status=StatusOutput(aggregate=row.status),
-                    exception_message=row.exception_message,
-                )
-            )
-    final_reconcile_output = ReconcileOutput(recon_id=recon_id, results=table_output)
-    logger.info(f"Final reconcile output: {final_reconcile_output}")
-    return final_reconcile_output
-
-
 class ReconCapture:
 
     def __init__(
@@ -230,7 +176,16 @@ class ReconCapture:
         spark: SparkSession,
         metadata_config: ReconcileMetadataConfig = ReconcileMetadataConfig(),
         local_test_run: bool = False,
+        flush_every_tables: int = 1,
     ):
+        """
+        The metadata rows of the reconciled tables are buffered and appended with one write per metadata table,
+        every `flush_every_tables` tables and by `flush`. The rows of a table are buffered all at once, so a flush
+        never records a part of a table.
+
+        Tables can be captured from several threads. The rows of a table, including its samples, are collected
+        before the lock of the buffer is taken, so the sample reads of concurrent tables are not serialised.
+        """
         self.database_config = database_config
         self.recon_id = recon_id
         self.report_type = report_type
@@ -238,6 +193,52 @@ class ReconCapture:
         self.ws = ws
         self.spark = spark
         self._db_prefix = "default" if local_test_run else f"{metadata_config.catalog}.{metadata_config.schema}"
+        self._flush_every_tables = flush_every_tables
+        self._lock = threading.Lock()
+        self._buffer: _TableRows = {}
+        self._buffered_tables = 0
+        self._table_outputs: list[ReconcileTableOutput] = []
+        # resolved once, before any table is captured, instead of a current user lookup for every metrics row
+        self.run_context = ReconRunContext(run_by_user=self.ws.current_user.me().user_name)
+        logger.info(f"Capturing the reconcile metrics of {self.recon_id}: {self.run_context}")
+
+    def _run_metrics(self, status: bool, exception_msg: str) -> str:
+        return f"""named_struct(
+                    'status', {status}, 
+                    'run_by_user', '{self.run_context.run_by_user}', 
+                    'exception_message', "{exception_msg}"
+                )"""
+
+    def _append(self, table_rows: _TableRows, df: DataFrame, table_name: str) -> None:
+        # the rows are collected, the DataFrames may read intermediate data deleted once the table is reconciled
+        table_rows.setdefault(f"{self._db_prefix}.{table_name}", []).append((df.schema, df.collect()))
+
+    def _buffer_table_rows(self, table_rows: _TableRows, table_output: ReconcileTableOutput) -> None:
+        with self._lock:
+            for table_name, rows in table_rows.items():
+                self._buffer.setdefault(table_name, []).extend(rows)
+            self._table_outputs.append(table_output)
+            self._buffered_tables += 1
+            flush_now = self._buffered_tables >= self._flush_every_tables
+        if flush_now:
+            self.flush()
+
+    def flush(self) -> None:
+        """Appends the buffered rows, with one write per metadata table."""
+        with self._lock:
+            buffer, self._buffer = self._buffer, {}
+            self._buffered_tables = 0
+        # a metadata table leaves the buffer once written, a failed flush only keeps the rows not written yet
+        try:
+            for table_name in list(buffer):
+                dfs = [self.spark.createDataFrame(rows, schema=schema) for schema, rows in buffer[table_name] if rows]
+                if dfs:
+                    _write_df_to_delta(self._union_dataframes(dfs), table_name)
+                del buffer[table_name]
+        finally:
+            with self._lock:
+                for table_name, rows in buffer.items():
+                    self._buffer[table_name] = rows + self._buffer.get(table_name, [])
 
     def _generate_recon_main_id(
         self,
@@ -255,6 +256,7 @@ class ReconCapture:
 
     def _insert_into_main_table(
         self,
+        table_rows: _TableRows,
         recon_table_id: int,
         table_conf: Table,
         recon_process_duration: ReconcileProcessDuration,
@@ -287,7 +289,7 @@ class ReconCapture:
                 cast('{recon_process_duration.end_ts}' as timestamp) as end_ts
             """
         )
-        _write_df_to_delta(df, f"{self._db_prefix}.{_RECON_TABLE_NAME}")
+        self._append(table_rows, df, _RECON_TABLE_NAME)
 
     @classmethod
     def _is_mismatch_within_threshold_limits(
@@ -319,20 +321,22 @@ class ReconCapture:
             if mode == "absolute":
                 res = lower_bound <= total_mismatch_count <= upper_bound
             if mode == "percentage":
-                lower_bound = int(round((lower_bound / 100) * record_count.source))
-                upper_bound = int(round((upper_bound / 100) * record_count.source))
+                # the mismatches of a sample are a share of the sampled rows
+                sample_output = data_reconcile_output.sample_output
+                total_count = record_count.source if sample_output is None else sample_output.source_sample_count
+                lower_bound = int(round((lower_bound / 100) * total_count))
+                upper_bound = int(round((upper_bound / 100) * total_count))
                 res = lower_bound <= total_mismatch_count <= upper_bound
 
         return res
 
-    def _insert_into_metrics_table(
+    def _get_run_status(
         self,
-        recon_table_id: int,
         data_reconcile_output: DataReconcileOutput,
         schema_reconcile_output: SchemaReconcileOutput,
         table_conf: Table,
         record_count: ReconcileRecordCount,
-    ) -> None:
+    ) -> tuple[bool, str]:
         status = False
         if data_reconcile_output.exception in {None, ''} and schema_reconcile_output.exception in {None, ''}:
             status = (
@@ -350,6 +354,72 @@ class ReconCapture:
             exception_msg = schema_reconcile_output.exception.replace("'", '').replace('"', '')
         if data_reconcile_output.exception is not None:
             exception_msg = data_reconcile_output.exception.replace("'", '').replace('"', '')
+        return status, exception_msg
+
+    def _get_table_names(self, table_conf: Table) -> tuple[str, str]:
+        source_table_name = (
+            f"{self.database_config.source_catalog}.{self.database_config.source_schema}.{table_conf.source_name}"
+            if self.database_config.source_catalog
+            else f"{self.database_config.source_schema}.{table_conf.source_name}"
+        )
+        target_table_name = (
+            f"{self.database_config.target_catalog}.{self.database_config.target_schema}.{table_conf.target_name}"
+        )
+        return source_table_name, target_table_name
+
+    def _get_table_output(
+        self,
+        data_reconcile_output: DataReconcileOutput,
+        schema_reconcile_output: SchemaReconcileOutput,
+        table_conf: Table,
+        record_count: ReconcileRecordCount,
+    ) -> ReconcileTableOutput:
+        """The outcome of the table, as it is reported in the reconcile output of the run."""
+        status, exception_msg = self._get_run_status(
+            data_reconcile_output, schema_reconcile_output, table_conf, record_count
+        )
+        source_table_name, target_table_name = self._get_table_names(table_conf)
+        if exception_msg:
+            return ReconcileTableOutput(
+                target_table_name=target_table_name,
+                source_table_name=source_table_name,
+                status=StatusOutput(),
+                exception_message=exception_msg,
+            )
+
+        report_type = self.report_type.lower()
+        row = None
+        if report_type in {"all", "row", "data", "sample"}:
+            row = data_reconcile_output.missing_in_src_count == 0 and data_reconcile_output.missing_in_tgt_count == 0
+        column = None
+        if report_type in {"all", "data", "sample"}:
+            mismatch = data_reconcile_output.mismatch
+            column = status or (
+                data_reconcile_output.mismatch_count == 0
+                and data_reconcile_output.threshold_output.threshold_mismatch_count == 0
+                and not (mismatch and mismatch.mismatch_columns)
+            )
+        schema = schema_reconcile_output.is_valid if report_type in {"all", "schema"} else None
+        return ReconcileTableOutput(
+            target_table_name=target_table_name,
+            source_table_name=source_table_name,
+            status=StatusOutput(row=row, column=column, schema=schema),
+            exception_message=exception_msg,
+        )
+
+    def _insert_into_metrics_table(
+        self,
+        table_rows: _TableRows,
+        recon_table_id: int,
+        data_reconcile_output: DataReconcileOutput,
+        schema_reconcile_output: SchemaReconcileOutput,
+        table_conf: Table,
+        *,
+        record_count: ReconcileRecordCount,
+    ) -> None:
+        status, exception_msg = self._get_run_status(
+            data_reconcile_output, schema_reconcile_output, table_conf, record_count
+        )
 
         insertion_time = str(datetime.now())
         mismatch_columns = []
@@ -360,13 +430,13 @@ class ReconCapture:
             f"""
                 select {recon_table_id} as recon_table_id,
                 named_struct(
-                    'row_comparison', case when '{self.report_type.lower()}' in ('all', 'row', 'data') 
+                    'row_comparison', case when '{self.report_type.lower()}' in ('all', 'row', 'data', 'sample') 
                         and '{exception_msg}' = '' then
                      named_struct(
                         'missing_in_source', {data_reconcile_output.missing_in_src_count},
                         'missing_in_target', {data_reconcile_output.missing_in_tgt_count}
                     ) else null end,
-                    'column_comparison', case when '{self.report_type.lower()}' in ('all', 'data') 
+                    'column_comparison', case when '{self.report_type.lower()}' in ('all', 'data', 'sample') 
                         and '{exception_msg}' = '' then
                     named_struct(
                         'absolute_mismatch', {data_reconcile_output.mismatch_count},
@@ -377,15 +447,38 @@ class ReconCapture:
                         and '{exception_msg}' = '' then
                         {schema_reconcile_output.is_valid} else null end
                 ) as recon_metrics,
-                named_struct(
-                    'status', {status}, 
-                    'run_by_user', '{self.ws.current_user.me().user_name}', 
-                    'exception_message', "{exception_msg}"
-                ) as run_metrics,
+                {self._run_metrics(status, exception_msg)} as run_metrics,
                 cast('{insertion_time}' as timestamp) as inserted_ts
             """
         )
-        _write_df_to_delta(df, f"{self._db_prefix}.{_RECON_METRICS_TABLE_NAME}")
+        self._append(table_rows, df, _RECON_METRICS_TABLE_NAME)
+
+    def _insert_into_sample_metrics_table(
+        self, table_rows: _TableRows, recon_table_id: int, sample_output: SampleReconcileOutput
+    ) -> None:
+        def rate_struct(estimate: RateEstimate) -> str:
+            return (
+                f"named_struct('estimate', cast({estimate.rate} as double), "
+                f"'lower_bound', cast({estimate.lower_bound} as double), "
+                f"'upper_bound', cast({estimate.upper_bound} as double))"
+            )
+
+        df = self.spark.sql(
+            f"""
+                select {recon_table_id} as recon_table_id,
+                cast({sample_output.sample_percentage} as double) as sample_percentage,
+                cast({sample_output.confidence_level} as double) as confidence_level,
+                cast({sample_output.source_sample_count} as bigint) as source_sample_count,
+                cast({sample_output.target_sample_count} as bigint) as target_sample_count,
+                named_struct(
+                    'mismatch', {rate_struct(sample_output.mismatch_rate)},
+                    'missing_in_source', {rate_struct(sample_output.missing_in_src_rate)},
+                    'missing_in_target', {rate_struct(sample_output.missing_in_tgt_rate)}
+                ) as estimated_rates,
+                cast('{datetime.now()}' as timestamp) as inserted_ts
+            """
+        )
+        self._append(table_rows, df, _RECON_SAMPLE_METRICS_TABLE_NAME)
 
     @classmethod
     def _create_map_column(
@@ -394,6 +487,7 @@ class ReconCapture:
         df: DataFrame,
         recon_type: str,
         status: bool,
+        sample_rows: int,
     ) -> DataFrame:
         columns = df.columns
         # Create a list of column names and their corresponding column values
@@ -401,7 +495,7 @@ class ReconCapture:
         for column in columns:
             map_args.extend([lit(column).alias(column + "_key"), col(column).cast("string").alias(column + "_value")])
         # Create a new DataFrame with a map column
-        df = df.limit(_SAMPLE_ROWS).select(create_map(*map_args).alias("data"))
+        df = df.limit(sample_rows).select(create_map(*map_args).alias("data"))
         df = (
             df.withColumn("recon_table_id", lit(recon_table_id))
             .withColumn("recon_type", lit(recon_type))
@@ -416,42 +510,53 @@ class ReconCapture:
 
     def _create_map_column_and_insert(
         self,
+        table_rows: _TableRows,
         recon_table_id: int,
         df: DataFrame,
         recon_type: str,
         status: bool,
+        *,
+        sample_rows: int,
     ) -> None:
-        df = self._create_map_column(recon_table_id, df, recon_type, status)
-        _write_df_to_delta(df, f"{self._db_prefix}.{_RECON_DETAILS_TABLE_NAME}")
+        df = self._create_map_column(recon_table_id, df, recon_type, status, sample_rows)
+        self._append(table_rows, df, _RECON_DETAILS_TABLE_NAME)
 
     def _insert_into_details_table(
         self,
+        table_rows: _TableRows,
         recon_table_id: int,
         reconcile_output: DataReconcileOutput,
         schema_output: SchemaReconcileOutput,
+        sample_rows: int,
     ):
         if reconcile_output.mismatch_count > 0 and reconcile_output.mismatch.mismatch_df:
             self._create_map_column_and_insert(
+                table_rows,
                 recon_table_id,
                 reconcile_output.mismatch.mismatch_df,
                 "mismatch",
                 False,
+                sample_rows=sample_rows,
             )
 
         if reconcile_output.missing_in_src_count > 0 and reconcile_output.missing_in_src:
             self._create_map_column_and_insert(
+                table_rows,
                 recon_table_id,
                 reconcile_output.missing_in_src,
                 "missing_in_source",
                 False,
+                sample_rows=sample_rows,
             )
 
         if reconcile_output.missing_in_tgt_count > 0 and reconcile_output.missing_in_tgt:
             self._create_map_column_and_insert(
+                table_rows,
                 recon_table_id,
                 reconcile_output.missing_in_tgt,
                 "missing_in_target",
                 False,
+                sample_rows=sample_rows,
             )
 
         if (
@@ -459,15 +564,22 @@ class ReconCapture:
             and reconcile_output.threshold_output.threshold_df
         ):
             self._create_map_column_and_insert(
+                table_rows,
                 recon_table_id,
                 reconcile_output.threshold_output.threshold_df,
                 "threshold_mismatch",
                 False,
+                sample_rows=sample_rows,
             )
 
         if schema_output.compare_df is not None:
             self._create_map_column_and_insert(
-                recon_table_id, schema_output.compare_df, "schema", schema_output.is_valid
+                table_rows,
+                recon_table_id,
+                schema_output.compare_df,
+                "schema",
+                schema_output.is_valid,
+                sample_rows=sample_rows,
             )
 
     def _get_df(
@@ -475,6 +587,7 @@ class ReconCapture:
         recon_table_id: int,
         agg_data: DataReconcileOutput,
         recon_type: str,
+        sample_rows: int,
     ):
 
         column_count = agg_data.mismatch_count
@@ -493,6 +606,7 @@ class ReconCapture:
                 agg_df,
                 recon_type,
                 False,
+                sample_rows,
             )
         return None
 
@@ -500,8 +614,45 @@ class ReconCapture:
     def _union_dataframes(cls, df_list: list[DataFrame]) -> DataFrame:
         return reduce(lambda agg_df, df: agg_df.unionByName(df), df_list)
 
+    @classmethod
+    def _get_aggregate_run_status(cls, agg_data: DataReconcileOutput) -> tuple[bool, str]:
+        status = False
+        if agg_data.exception in {None, ''}:
+            status = not (
+                agg_data.mismatch_count > 0 or agg_data.missing_in_src_count > 0 or agg_data.missing_in_tgt_count > 0
+            )
+
+        exception_msg = ""
+        if agg_data.exception is not None:
+            exception_msg = agg_data.exception.replace("'", '').replace('"', '')
+        return status, exception_msg
+
+    def _get_aggregate_table_output(
+        self, table_conf: Table, reconcile_agg_output_list: list[AggregateQueryOutput]
+    ) -> ReconcileTableOutput:
+        """The outcome of the table, every rule reconciled, as it is reported in the reconcile output of the run."""
+        run_statuses = [
+            self._get_aggregate_run_status(agg_output.reconcile_output) for agg_output in reconcile_agg_output_list
+        ]
+        exception_msgs = sorted({exception_msg for _, exception_msg in run_statuses if exception_msg})
+        source_table_name, target_table_name = self._get_table_names(table_conf)
+        if exception_msgs:
+            return ReconcileTableOutput(
+                target_table_name=target_table_name,
+                source_table_name=source_table_name,
+                status=StatusOutput(),
+                exception_message="\n".join(exception_msgs),
+            )
+        return ReconcileTableOutput(
+            target_table_name=target_table_name,
+            source_table_name=source_table_name,
+            status=StatusOutput(aggregate=all(status for status, _ in run_statuses)),
+            exception_message="",
+        )
+
     def _insert_aggregates_into_metrics_table(
         self,
+        table_rows: _TableRows,
         recon_table_id: int,
         reconcile_agg_output_list: list[AggregateQueryOutput],
     ) -> None:
@@ -509,18 +660,7 @@ class ReconCapture:
         agg_metrics_df_list = []
         for agg_output in reconcile_agg_output_list:
             agg_data = agg_output.reconcile_output
-
-            status = False
-            if agg_data.exception in {None, ''}:
-                status = not (
-                    agg_data.mismatch_count > 0
-                    or agg_data.missing_in_src_count > 0
-                    or agg_data.missing_in_tgt_count > 0
-                )
-
-            exception_msg = ""
-            if agg_data.exception is not None:
-                exception_msg = agg_data.exception.replace("'", '').replace('"', '')
+            status, exception_msg = self._get_aggregate_run_status(agg_data)
 
             insertion_time = str(datetime.now())
 
@@ -534,35 +674,35 @@ class ReconCapture:
                             'missing_in_target', {agg_data.missing_in_tgt_count},
                             'mismatch', {agg_data.mismatch_count}
                     ) as recon_metrics,
-                    named_struct(
-                        'status', {status}, 
-                        'run_by_user', '{self.ws.current_user.me().user_name}', 
-                        'exception_message', "{exception_msg}"
-                    ) as run_metrics,
+                    {self._run_metrics(status, exception_msg)} as run_metrics,
                     cast('{insertion_time}' as timestamp) as inserted_ts
                 """
             )
             agg_metrics_df_list.append(agg_metrics_df)
 
         agg_metrics_table_df = self._union_dataframes(agg_metrics_df_list)
-        _write_df_to_delta(agg_metrics_table_df, f"{self._db_prefix}.{_RECON_AGGREGATE_METRICS_TABLE_NAME}")
+        self._append(table_rows, agg_metrics_table_df, _RECON_AGGREGATE_METRICS_TABLE_NAME)
 
     def _insert_aggregates_into_details_table(
-        self, recon_table_id: int, reconcile_agg_output_list: list[AggregateQueryOutput]
+        self,
+        table_rows: _TableRows,
+        recon_table_id: int,
+        reconcile_agg_output_list: list[AggregateQueryOutput],
+        sample_rows: int,
     ):
         agg_details_df_list = []
         for agg_output in reconcile_agg_output_list:
             agg_details_rule_df_list = []
 
-            mismatch_df = self._get_df(recon_table_id, agg_output.reconcile_output, "mismatch")
+            mismatch_df = self._get_df(recon_table_id, agg_output.reconcile_output, "mismatch", sample_rows)
             if mismatch_df and not mismatch_df.isEmpty():
                 agg_details_rule_df_list.append(mismatch_df)
 
-            missing_src_df = self._get_df(recon_table_id, agg_output.reconcile_output, "missing_in_source")
+            missing_src_df = self._get_df(recon_table_id, agg_output.reconcile_output, "missing_in_source", sample_rows)
             if missing_src_df and not missing_src_df.isEmpty():
                 agg_details_rule_df_list.append(missing_src_df)
 
-            missing_tgt_df = self._get_df(recon_table_id, agg_output.reconcile_output, "missing_in_target")
+            missing_tgt_df = self._get_df(recon_table_id, agg_output.reconcile_output, "missing_in_target", sample_rows)
             if missing_tgt_df and not missing_tgt_df.isEmpty():
                 agg_details_rule_df_list.append(missing_tgt_df)
 
@@ -578,7 +718,7 @@ class ReconCapture:
 
         agg_details_table_df = self._union_dataframes(agg_details_df_list)
         if agg_details_table_df:
-            _write_df_to_delta(agg_details_table_df, f"{self._db_prefix}.{_RECON_AGGREGATE_DETAILS_TABLE_NAME}")
+            self._append(table_rows, agg_details_table_df, _RECON_AGGREGATE_DETAILS_TABLE_NAME)
 
     def start(
         self,
@@ -587,13 +727,27 @@ class ReconCapture:
         table_conf: Table,
         recon_process_duration: ReconcileProcessDuration,
         record_count: ReconcileRecordCount,
-    ) -> None:
+    ) -> ReconcileTableOutput:
+        """Buffers the metadata rows of the table, and returns its status."""
         recon_table_id = self._generate_recon_main_id(table_conf)
-        self._insert_into_main_table(recon_table_id, table_conf, recon_process_duration)
+        table_rows: _TableRows = {}
+        self._insert_into_main_table(table_rows, recon_table_id, table_conf, recon_process_duration)
         self._insert_into_metrics_table(
-            recon_table_id, data_reconcile_output, schema_reconcile_output, table_conf, record_count
+            table_rows,
+            recon_table_id,
+            data_reconcile_output,
+            schema_reconcile_output,
+            table_conf,
+            record_count=record_count,
+        )
+        self._insert_into_details_table(
+            table_rows, recon_table_id, data_reconcile_output, schema_reconcile_output, table_conf.sample_rows
         )
-        self._insert_into_details_table(recon_table_id, data_reconcile_output, schema_reconcile_output)
+        if data_reconcile_output.sample_output is not None:
+            self._insert_into_sample_metrics_table(table_rows, recon_table_id, data_reconcile_output.sample_output)
+        table_output = self._get_table_output(data_reconcile_output, schema_reconcile_output, table_conf, record_count)
+        self._buffer_table_rows(table_rows, table_output)
+        return table_output
 
     def store_aggregates_metrics(
         self,
@@ -602,15 +756,29 @@ class ReconCapture:
         reconcile_agg_output_list: list[AggregateQueryOutput],
     ) -> None:
         recon_table_id = self._generate_recon_main_id(table_conf)
-        self._insert_into_main_table(recon_table_id, table_conf, recon_process_duration, 'aggregates-reconcile')
-        self._insert_into_rules_table(recon_table_id, reconcile_agg_output_list)
-        self._insert_aggregates_into_metrics_table(recon_table_id, reconcile_agg_output_list)
+        table_rows: _TableRows = {}
+        self._insert_into_main_table(
+            table_rows, recon_table_id, table_conf, recon_process_duration, 'aggregates-reconcile'
+        )
+        self._insert_into_rules_table(table_rows, recon_table_id, reconcile_agg_output_list)
+        self._insert_aggregates_into_metrics_table(table_rows, recon_table_id, reconcile_agg_output_list)
         self._insert_aggregates_into_details_table(
+            table_rows,
             recon_table_id,
             reconcile_agg_output_list,
+            table_conf.sample_rows,
         )
+        self._buffer_table_rows(table_rows, self._get_aggregate_table_output(table_conf, reconcile_agg_output_list))
 
-    def _insert_into_rules_table(self, recon_table_id: int, reconcile_agg_output_list: list[AggregateQueryOutput]):
+    def get_reconcile_output(self) -> ReconcileOutput:
+        """The outcome of every captured table, assembled from the captures of this run."""
+        final_reconcile_output = ReconcileOutput(recon_id=self.recon_id, results=list(self._table_outputs))
+        logger.info(f"Final reconcile output: {final_reconcile_output}")
+        return final_reconcile_output
+
+    def _insert_into_rules_table(
+        self, table_rows: _TableRows, recon_table_id: int, reconcile_agg_output_list: list[AggregateQueryOutput]
+    ):
 
         rule_df_list = []
         for agg_output in reconcile_agg_output_list:
@@ -625,4 +793,4 @@ class ReconCapture:
 
         rules_table_df = self._union_dataframes(rule_df_list)
 
-        _write_df_to_delta(rules_table_df, f"{self._db_prefix}.{_RECON_AGGREGATE_RULES_TABLE_NAME}")
+        self._append(table_rows, rules_table_df, _RECON_AGGREGATE_RULES_TABLE_NAME)
@@ -10,6 +10,9 @@ from sqlglot import expressions as exp
 
 logger = logging.getLogger(__name__)
 
+# the algorithms of the row hash, each gives the same hashes on every dialect
+HASH_ALGORITHMS = ("sha256", "sha1", "md5")
+
 _SUPPORTED_AGG_TYPES: set[str] = {
     "min",
     "max",
@@ -35,14 +38,20 @@ class InvalidModelForTableThreshold(ValueError):
 
 @dataclass
 class JdbcReaderOptions:
-    number_partitions: int
-    partition_column: str
-    lower_bound: str
-    upper_bound: str
-    fetch_size: int = 100
+    """
+    The options of the JDBC reads of a source table. The options left out are derived from the table before it is
+    read: a numeric join column partitions the reads, its bounds are probed, the number of partitions follows the row
+    count and the fetch size the width of the rows.
+    """
+
+    number_partitions: int | None = None
+    partition_column: str | None = None
+    lower_bound: str | None = None
+    upper_bound: str | None = None
+    fetch_size: int | None = None
 
     def __post_init__(self):
-        self.partition_column = self.partition_column.lower()
+        self.partition_column = self.partition_column.lower() if self.partition_column else self.partition_column
 
 
 @dataclass
@@ -125,6 +134,19 @@ class Filters:
     target: str | None = None
 
 
+@dataclass
+class Watermark:
+    column_name: str
+    # rows up to this far before the last watermark are compared again, to catch rows that arrived late. In the unit
+    # of the column for numbers and in seconds for dates and timestamps
+    lookback: int = 0
+
+    def __post_init__(self):
+        self.column_name = self.column_name.lower()
+        if self.lookback < 0:
+            raise ValueError(f"Watermark lookback cannot be negative, got {self.lookback}")
+
+
 def to_lower_case(input_list: list[str]) -> list[str]:
     return [element.lower() for element in input_list]
 
@@ -143,6 +165,20 @@ class Table:
     column_thresholds: list[ColumnThresholds] | None = None
     filters: Filters | None = None
     table_thresholds: list[TableThresholds] | None = None
+    # compare per bucket hash summaries first and read the row hashes of the differing buckets only
+    hash_buckets: int | None = None
+    # only compare the rows added since the last successful run
+    watermark: Watermark | None = None
+    # share of the rows compared by the sample report type, picked by the hash of the join columns
+    sample_percentage: float = 1.0
+    # the mismatched, missing and threshold breaching rows fetched and kept in the details, up to this number
+    sample_rows: int = 50
+    # the algorithm of the row hash, the cheaper md5 or sha1 are enough to compare rows
+    hash_algorithm: str = "sha256"
+    # ship and join the row hash as a 60 bit integer rather than its hex digits
+    compact_hash: bool = False
+    # compute the aggregates of every group by in one GROUPING SETS query per side instead of a query per group by
+    aggregates_grouping_sets: bool = False
 
     def __post_init__(self):
         self.source_name = self.source_name.lower()
@@ -150,6 +186,13 @@ class Table:
         self.select_columns = to_lower_case(self.select_columns) if self.select_columns else None
         self.drop_columns = to_lower_case(self.drop_columns) if self.drop_columns else None
         self.join_columns = to_lower_case(self.join_columns) if self.join_columns else None
+        if not 0 < self.sample_percentage <= 100:
+            raise ValueError(f"Sample percentage must be within (0, 100], got {self.sample_percentage}")
+        if self.sample_rows < 1:
+            raise ValueError(f"Sample rows must be a positive number, got {self.sample_rows}")
+        self.hash_algorithm = self.hash_algorithm.lower()
+        if self.hash_algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"Hash algorithm must be one of {', '.join(HASH_ALGORITHMS)}, got {self.hash_algorithm}")
 
     @property
     def to_src_col_map(self):
@@ -227,10 +270,15 @@ class Table:
         return {}
 
     def get_partition_column(self, layer: str) -> set[str]:
-        if self.jdbc_reader_options and layer == "source":
+        if self.jdbc_reader_options and self.jdbc_reader_options.partition_column and layer == "source":
             return {self.jdbc_reader_options.partition_column}
         return set()
 
+    def get_watermark_column(self, layer: str) -> str | None:
+        if self.watermark is None:
+            return None
+        return self.get_layer_src_to_tgt_col_mapping(self.watermark.column_name, layer)
+
     def get_filter(self, layer: str) -> str | None:
         if self.filters is None:
             return None
@@ -249,6 +297,8 @@ class Schema:
 class MismatchOutput:
     mismatch_df: DataFrame | None = None
     mismatch_columns: list[str] | None = None
+    # the number of mismatched rows of every compared column
+    mismatch_column_counts: dict[str, int] | None = None
 
 
 @dataclass
@@ -257,6 +307,25 @@ class ThresholdOutput:
     threshold_mismatch_count: int = 0
 
 
+@dataclass
+class RateEstimate:
+    rate: float
+    lower_bound: float
+    upper_bound: float
+
+
+@dataclass
+class SampleReconcileOutput:
+    sample_percentage: float
+    confidence_level: float
+    mismatch_rate: RateEstimate
+    missing_in_src_rate: RateEstimate
+    missing_in_tgt_rate: RateEstimate
+    # the rows of the sample, the record counts of the tables are counted in full
+    source_sample_count: int = 0
+    target_sample_count: int = 0
+
+
 @dataclass
 class DataReconcileOutput:
     mismatch_count: int = 0
@@ -267,12 +336,22 @@ class DataReconcileOutput:
     missing_in_tgt: DataFrame | None = None
     threshold_output: ThresholdOutput = field(default_factory=ThresholdOutput)
     exception: str | None = None
+    # rows with the same hash on both sides, they are counted but not persisted
+    matched_count: int = 0
+    # rows read by the hash queries, counted while the join is materialised
+    source_record_count: int | None = None
+    target_record_count: int | None = None
+    # the estimated rates of the whole table, for the sample report type
+    sample_output: SampleReconcileOutput | None = None
+    # the source and target threshold columns of the rows found on both sides, when read by the hash queries
+    threshold_data: tuple[DataFrame, DataFrame] | None = None
 
 
 @dataclass
 class DialectHashConfig:
     dialect: Dialect
     algo: list[Callable]
+    algorithm: str = "sha256"
 
 
 @dataclass
@@ -297,6 +376,13 @@ class ReconcileProcessDuration:
     end_ts: str | None
 
 
+@dataclass(frozen=True)
+class ReconRunContext:
+    """The context of a reconcile run, resolved once and shared by every metrics row of the run."""
+
+    run_by_user: str | None
+
+
 @dataclass
 class StatusOutput:
     row: bool | None = None
@@ -394,6 +480,9 @@ class AggregateQueryRules:
     group_by_columns_as_str: str
     query: str
     rules: list[AggregateRule]
+    # a query shared by several groups with GROUPING SETS: the grouping id of the rows of the group and its columns
+    grouping_id: int | None = None
+    columns: list[str] | None = None
 
 
 @dataclass
@@ -0,0 +1,86 @@
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from pyspark.errors import PySparkException
+
+from databricks.labs.remorph.reconcile.exception import (
+    DataSourceRuntimeException,
+    ReconciliationException,
+    WriteToTableException,
+)
+from databricks.labs.remorph.reconcile.recon_config import Table
+from databricks.sdk.errors import DatabricksError
+
+logger = logging.getLogger(__name__)
+
+# JDBC sources are limited by the connections the source warehouse accepts, Databricks only by the cluster.
+_DEFAULT_TABLE_CONCURRENCY = {
+    "snowflake": 4,
+    "oracle": 4,
+    "databricks": 8,
+}
+
+
+# the failures of a table that leave the other tables to reconcile, any other error stops the run
+_TABLE_FAILURES = (
+    ReconciliationException,
+    DataSourceRuntimeException,
+    WriteToTableException,
+    ValueError,
+    PySparkException,
+    DatabricksError,
+)
+
+
+def get_table_concurrency(data_source: str, table_concurrency: int | None = None) -> int:
+    if table_concurrency is not None:
+        if table_concurrency < 1:
+            raise ValueError(f"Table concurrency must be at least 1, got {table_concurrency}")
+        return table_concurrency
+    return _DEFAULT_TABLE_CONCURRENCY.get(data_source, 1)
+
+
+def get_query_concurrency(data_source: str, table_concurrency: int | None = None, max_queries: int = 1) -> int:
+    """
+    The queries a table runs at once, up to `max_queries`. The tables reconciled at the same time share the
+    concurrency of the source, so a table runs more of its queries at once only when fewer tables run with it.
+    """
+    source_concurrency = _DEFAULT_TABLE_CONCURRENCY.get(data_source, 1)
+    return min(max(source_concurrency // get_table_concurrency(data_source, table_concurrency), 1), max_queries)
+
+
+class TableReconScheduler:
+    """
+    Runs the reconciliation of several tables at once on the shared SparkSession.
+
+    Every table runs in its own thread, so its Spark jobs are submitted concurrently with the other tables' jobs and
+    the cluster is kept busy while a table waits on a slow source. A table that fails does not stop the others; once
+    every table has finished, the failure of the first failed table in the order of the configuration is raised.
+    With a single worker, the tables are reconciled one after the other on the calling thread.
+    """
+
+    def __init__(self, max_workers: int):
+        self._max_workers = max_workers
+
+    def run(self, tables: list[Table], reconcile_table: Callable[[Table], None]) -> None:
+        failures: dict[int, Exception] = {}
+
+        def reconcile(index: int, table_conf: Table) -> None:
+            try:
+                reconcile_table(table_conf)
+            except _TABLE_FAILURES as e:
+                logger.error(f"Reconciliation failed for {table_conf.source_name} -> {table_conf.target_name}: {e}")
+                failures[index] = e
+
+        if self._max_workers == 1:
+            for index, table_conf in enumerate(tables):
+                reconcile(index, table_conf)
+        else:
+            with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="recon-table") as executor:
+                futures = [executor.submit(reconcile, index, table_conf) for index, table_conf in enumerate(tables)]
+                for future in futures:
+                    future.result()
+
+        if failures:
+            raise failures[min(failures)]
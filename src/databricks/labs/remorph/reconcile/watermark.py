@@ -0,0 +1,228 @@
+import dataclasses
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from pyspark.errors import PySparkException
+from pyspark.sql import SparkSession
+from pyspark.sql.types import StringType, StructField, StructType, TimestampType
+from sqlglot import Dialect
+from sqlglot import expressions as exp
+
+from databricks.labs.remorph.config import DatabaseConfig, ReconcileMetadataConfig, get_dialect
+from databricks.labs.remorph.reconcile.exception import InvalidInputException
+from databricks.labs.remorph.reconcile.recon_capture import _write_df_to_delta
+from databricks.labs.remorph.reconcile.recon_config import Filters, Schema, Table
+
+logger = logging.getLogger(__name__)
+
+_RECON_WATERMARKS_TABLE_NAME = "watermarks"
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _table_struct(catalog_nullable: bool) -> StructType:
+    return StructType(
+        [
+            StructField("catalog", StringType(), catalog_nullable),
+            StructField("schema", StringType(), False),
+            StructField("table_name", StringType(), False),
+        ]
+    )
+
+
+_WATERMARKS_SCHEMA = StructType(
+    [
+        StructField("recon_id", StringType(), False),
+        StructField("source_table", _table_struct(catalog_nullable=True), True),
+        StructField("target_table", _table_struct(catalog_nullable=False), False),
+        StructField("watermark_column", StringType(), False),
+        StructField("watermark_value", StringType(), False),
+        StructField("inserted_ts", TimestampType(), False),
+    ]
+)
+
+
+@dataclasses.dataclass
+class WatermarkWindow:
+    """The watermark column values compared by an incremental run: after `lower_bound`, up to `upper_bound`."""
+
+    is_temporal: bool
+    lower_bound: str | None
+    upper_bound: str | None
+
+
+def _get_watermark_column(table_conf: Table, layer: str) -> str:
+    column_name = table_conf.get_watermark_column(layer)
+    assert column_name, "Watermark must be defined for an incremental reconciliation"
+    return column_name
+
+
+def is_temporal_watermark(table_conf: Table, tgt_schema: list[Schema]) -> bool:
+    column_name = _get_watermark_column(table_conf, "target")
+    data_type = next((sch.data_type for sch in tgt_schema if sch.column_name == column_name), None)
+    if data_type is None:
+        raise InvalidInputException(f"Watermark column {column_name} does not exist in {table_conf.target_name}")
+    data_type_exp = exp.DataType.build(data_type, dialect=get_dialect("databricks"))
+    if data_type_exp.is_type(*exp.DataType.TEMPORAL_TYPES):
+        return True
+    if data_type_exp.is_type(*exp.DataType.NUMERIC_TYPES):
+        return False
+    raise InvalidInputException(
+        f"Watermark column {column_name} of {table_conf.target_name} must be a number, date or timestamp, "
+        f"got {data_type}"
+    )
+
+
+def build_watermark_query(table_conf: Table) -> str:
+    """The target is the reference for the upper bound, so the rows still on their way to it are left for the next
+    run instead of being reported as missing."""
+    column_name = _get_watermark_column(table_conf, "target")
+    return (
+        exp.select(exp.Max(this=exp.column(column_name)).as_("watermark"))
+        .from_(":tbl")
+        .where(table_conf.get_filter("target"))
+        .sql(dialect=get_dialect("databricks"))
+    )
+
+
+def to_watermark_value(value) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime(_TIMESTAMP_FORMAT)
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time()).strftime(_TIMESTAMP_FORMAT)
+    return str(value)
+
+
+def get_watermark_window(
+    table_conf: Table,
+    is_temporal: bool,
+    last_watermark: str | None,
+    upper_bound: str | None,
+) -> WatermarkWindow:
+    assert table_conf.watermark, "Watermark must be defined for an incremental reconciliation"
+    lookback = table_conf.watermark.lookback
+    lower_bound = last_watermark
+    if last_watermark is not None and lookback:
+        if is_temporal:
+            lower_bound = (datetime.strptime(last_watermark, _TIMESTAMP_FORMAT) - timedelta(seconds=lookback)).strftime(
+                _TIMESTAMP_FORMAT
+            )
+        else:
+            lower_bound = str(Decimal(last_watermark) - lookback)
+    return WatermarkWindow(is_temporal=is_temporal, lower_bound=lower_bound, upper_bound=upper_bound)
+
+
+def _watermark_literal(value: str, is_temporal: bool) -> exp.Expression:
+    if is_temporal:
+        return exp.StrToTime(this=exp.Literal.string(value), format=exp.Literal.string(_TIMESTAMP_FORMAT))
+    return exp.Literal.number(value)
+
+
+def _window_filter(column_name: str, window: WatermarkWindow, existing_filter: str | None, engine: Dialect) -> str:
+    conditions: list[exp.Expression] = []
+    if existing_filter:
+        conditions.append(exp.paren(exp.maybe_parse(existing_filter, dialect=engine)))
+    if window.lower_bound is not None:
+        conditions.append(
+            exp.GT(this=exp.column(column_name), expression=_watermark_literal(window.lower_bound, window.is_temporal))
+        )
+    if window.upper_bound is not None:
+        conditions.append(
+            exp.LTE(this=exp.column(column_name), expression=_watermark_literal(window.upper_bound, window.is_temporal))
+        )
+    return exp.and_(*conditions).sql(dialect=engine)
+
+
+def apply_watermark_window(table_conf: Table, window: WatermarkWindow, source_engine: Dialect) -> Table:
+    """
+    Returns a copy of the table configuration, whose filters restrict both sides to the watermark window. Every query
+    of the table, hashes, samples, thresholds and counts, is built from the filters and only reads the window.
+    """
+    if window.lower_bound is None and window.upper_bound is None:
+        return table_conf
+    source_filter = _window_filter(
+        _get_watermark_column(table_conf, "source"), window, table_conf.get_filter("source"), source_engine
+    )
+    target_filter = _window_filter(
+        _get_watermark_column(table_conf, "target"), window, table_conf.get_filter("target"), get_dialect("databricks")
+    )
+    return dataclasses.replace(table_conf, filters=Filters(source=source_filter, target=target_filter))
+
+
+class WatermarkStore:
+    """
+    Keeps the watermark of every incremental table in the reconcile metadata schema. A row is appended for every
+    successful run, so the history of the compared windows is kept across the recon_ids and the latest row is the
+    state the next run starts from.
+
+    The watermarks of a run are buffered by `add_watermark` and appended with a single write by `flush`, once the
+    metrics of their tables are recorded.
+    """
+
+    def __init__(
+        self,
+        spark: SparkSession,
+        database_config: DatabaseConfig,
+        recon_id: str,
+        metadata_config: ReconcileMetadataConfig | None = None,
+        local_test_run: bool = False,
+    ):
+        self._spark = spark
+        self._database_config = database_config
+        self._recon_id = recon_id
+        metadata_config = metadata_config or ReconcileMetadataConfig()
+        db_prefix = "default" if local_test_run else f"{metadata_config.catalog}.{metadata_config.schema}"
+        self._table_name = f"{db_prefix}.{_RECON_WATERMARKS_TABLE_NAME}"
+        self._lock = threading.Lock()
+        self._watermarks: list[tuple] = []
+
+    def get_last_watermark(self, table_conf: Table) -> str | None:
+        assert table_conf.watermark, "Watermark must be defined for an incremental reconciliation"
+        # the sources without catalogs, such as Oracle, keep a null one
+        source_catalog = f"'{self._database_config.source_catalog}'" if self._database_config.source_catalog else "null"
+        try:
+            rows = self._spark.sql(
+                f"""
+                select watermark_value
+                from {self._table_name}
+                where target_table.catalog = '{self._database_config.target_catalog}'
+                and target_table.schema = '{self._database_config.target_schema}'
+                and target_table.table_name = '{table_conf.target_name}'
+                and source_table.catalog <=> {source_catalog}
+                and source_table.schema = '{self._database_config.source_schema}'
+                and source_table.table_name = '{table_conf.source_name}'
+                and watermark_column = '{table_conf.watermark.column_name}'
+                order by inserted_ts desc
+                limit 1
+                """
+            ).collect()
+        except PySparkException as e:
+            logger.warning(f"Could not read the watermark of {table_conf.target_name}, comparing every row: {e}")
+            return None
+        return rows[0].watermark_value if rows else None
+
+    def add_watermark(self, table_conf: Table, watermark_value: str) -> None:
+        assert table_conf.watermark, "Watermark must be defined for an incremental reconciliation"
+        watermark = (
+            self._recon_id,
+            (self._database_config.source_catalog, self._database_config.source_schema, table_conf.source_name),
+            (self._database_config.target_catalog, self._database_config.target_schema, table_conf.target_name),
+            table_conf.watermark.column_name,
+            watermark_value,
+            datetime.now(),
+        )
+        with self._lock:
+            self._watermarks.append(watermark)
+
+    def flush(self) -> None:
+        """Appends the buffered watermarks, the buffer is kept if the write fails."""
+        with self._lock:
+            watermarks = list(self._watermarks)
+        if not watermarks:
+            return
+        _write_df_to_delta(self._spark.createDataFrame(watermarks, schema=_WATERMARKS_SCHEMA), self._table_name)
+        with self._lock:
+            del self._watermarks[: len(watermarks)]
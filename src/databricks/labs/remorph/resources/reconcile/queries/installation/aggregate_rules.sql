@@ -3,4 +3,4 @@ CREATE TABLE IF NOT EXISTS aggregate_rules (
     rule_type STRING NOT NULL,
     rule_info MAP<STRING, STRING> NOT NULL,
     inserted_ts TIMESTAMP NOT NULL
-);
\ No newline at end of file
+) CLUSTER BY (rule_id);
\ No newline at end of file
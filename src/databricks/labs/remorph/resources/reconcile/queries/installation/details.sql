@@ -4,4 +4,4 @@ CREATE TABLE IF NOT EXISTS details (
     status BOOLEAN NOT NULL,
     data ARRAY<MAP<STRING, STRING>> NOT NULL,
     inserted_ts TIMESTAMP NOT NULL
-);
\ No newline at end of file
+) CLUSTER BY (recon_table_id, inserted_ts);
\ No newline at end of file
@@ -16,4 +16,4 @@ CREATE TABLE IF NOT EXISTS main (
     operation_name  STRING NOT NULL,
     start_ts TIMESTAMP,
     end_ts TIMESTAMP
-);
\ No newline at end of file
+) CLUSTER BY (recon_id);
\ No newline at end of file
@@ -18,4 +18,4 @@ CREATE TABLE IF NOT EXISTS metrics (
                         exception_message: STRING
                        > NOT NULL,
     inserted_ts TIMESTAMP NOT NULL
-);
\ No newline at end of file
+) CLUSTER BY (recon_table_id, inserted_ts);
\ No newline at end of file
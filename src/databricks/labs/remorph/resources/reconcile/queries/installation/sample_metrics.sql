@@ -0,0 +1,25 @@
+CREATE TABLE IF NOT EXISTS sample_metrics (
+    recon_table_id BIGINT NOT NULL,
+    sample_percentage DOUBLE NOT NULL,
+    confidence_level DOUBLE NOT NULL,
+    source_sample_count BIGINT NOT NULL,
+    target_sample_count BIGINT NOT NULL,
+    estimated_rates STRUCT<
+                        mismatch: STRUCT<
+                                          estimate: DOUBLE,
+                                          lower_bound: DOUBLE,
+                                          upper_bound: DOUBLE
+                                        >,
+                        missing_in_source: STRUCT<
+                                                   estimate: DOUBLE,
+                                                   lower_bound: DOUBLE,
+                                                   upper_bound: DOUBLE
+                                                 >,
+                        missing_in_target: STRUCT<
+                                                   estimate: DOUBLE,
+                                                   lower_bound: DOUBLE,
+                                                   upper_bound: DOUBLE
+                                                 >
+                    > NOT NULL,
+    inserted_ts TIMESTAMP NOT NULL
+) CLUSTER BY (recon_table_id, inserted_ts);
@@ -0,0 +1,16 @@
+CREATE TABLE IF NOT EXISTS watermarks (
+    recon_id STRING NOT NULL,
+    source_table STRUCT<
+                         catalog: STRING,
+                         schema: STRING NOT NULL,
+                         table_name: STRING NOT NULL
+                        > ,
+    target_table STRUCT<
+                         catalog: STRING NOT NULL,
+                         schema: STRING NOT NULL,
+                         table_name: STRING NOT NULL
+                        > NOT NULL,
+    watermark_column STRING NOT NULL,
+    watermark_value STRING NOT NULL,
+    inserted_ts TIMESTAMP NOT NULL
+) CLUSTER BY (target_table.catalog, target_table.schema, target_table.table_name);
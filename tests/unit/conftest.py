@@ -1,7 +1,7 @@
 import re
 from pathlib import Path
 from collections.abc import Sequence
-from unittest.mock import create_autospec
+from unittest.mock import MagicMock, create_autospec
 
 import pytest
 from pyspark.sql import SparkSession
@@ -21,7 +21,15 @@ from sqlglot.errors import SqlglotError, ParseError
 from sqlglot import parse_one as sqlglot_parse_one
 from sqlglot import transpile
 
-from databricks.labs.remorph.config import SQLGLOT_DIALECTS, MorphConfig
+from databricks.labs.remorph.config import (
+    SQLGLOT_DIALECTS,
+    DatabaseConfig,
+    MorphConfig,
+    ReconcileMetadataConfig,
+    get_dialect as get_recon_dialect,
+)
+from databricks.labs.remorph.reconcile.connectors.databricks import DatabricksDataSource
+from databricks.labs.remorph.reconcile.execute import Reconciliation
 from databricks.labs.remorph.reconcile.recon_config import (
     ColumnMapping,
     Filters,
@@ -32,6 +40,7 @@ from databricks.labs.remorph.reconcile.recon_config import (
     Transformation,
     TableThresholds,
 )
+from databricks.labs.remorph.reconcile.schema_compare import SchemaCompare
 from databricks.labs.remorph.snow.databricks import Databricks
 from databricks.labs.remorph.snow.snowflake import Snow
 from databricks.sdk import WorkspaceClient
@@ -221,6 +230,31 @@ def table_conf_mock():
     return _mock_table_conf
 
 
+@pytest.fixture
+def databricks_reconciler(mock_spark):
+    """Reconciles the tables of spark_catalog.default against each other, with the given report type."""
+
+    def _reconciler(report_type: str) -> Reconciliation:
+        engine = get_recon_dialect("databricks")
+        return Reconciliation(
+            DatabricksDataSource(engine, mock_spark, MagicMock(), "scope"),
+            DatabricksDataSource(engine, mock_spark, MagicMock(), "scope"),
+            DatabaseConfig(
+                source_catalog="spark_catalog",
+                source_schema="default",
+                target_catalog="spark_catalog",
+                target_schema="default",
+            ),
+            report_type,
+            SchemaCompare(mock_spark),
+            engine,
+            mock_spark,
+            ReconcileMetadataConfig(),
+        )
+
+    return _reconciler
+
+
 @pytest.fixture
 def table_conf_with_opts(column_mapping):
     return Table(
@@ -1,6 +1,9 @@
 # pylint: disable=all
+import dataclasses
 import json
 import os
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from unittest import mock
 from unittest.mock import patch
@@ -8,9 +11,13 @@ from unittest.mock import patch
 import pytest
 import pytz
 
+from databricks.labs.remorph.coverage import commons
 from databricks.labs.remorph.coverage.commons import (
+    CoverageJob,
     ReportEntry,
     collect_transpilation_stats,
+    collect_transpilation_stats_matrix,
+    compare_transpilation_times,
     get_current_commit_hash,
     get_current_time_utc,
     get_env_var,
@@ -21,6 +28,13 @@ from databricks.labs.remorph.snow.databricks import Databricks
 from databricks.labs.remorph.snow.snowflake import Snow
 
 
+def _without_metrics(entry: ReportEntry) -> ReportEntry:
+    assert entry.parsing_time_ms >= 0
+    assert entry.transpilation_time_ms >= 0
+    assert entry.peak_memory_bytes >= 0
+    return dataclasses.replace(entry, parsing_time_ms=0.0, transpilation_time_ms=0.0, peak_memory_bytes=0)
+
+
 def test_get_supported_sql_files(tmp_path):
     sub_dir = tmp_path / "test_dir"
     sub_dir.mkdir()
@@ -172,9 +186,10 @@ def test_stats_collection_with_parse_error(io_dir_pair):
             target_dialect="Databricks",
             file="input/test.sql",
             parsing_error="Some parse error",
+            input_size=18,
         )
         retrieved_report_entry = ReportEntry(**json.loads(report_files[0].read_text()))
-        assert retrieved_report_entry == expected_report_entry
+        assert _without_metrics(retrieved_report_entry) == expected_report_entry
 
 
 def test_stats_collection_with_transpile_error(io_dir_pair):
@@ -215,9 +230,10 @@ def test_stats_collection_with_transpile_error(io_dir_pair):
             parsed=1,
             statements=1,
             transpilation_error="Some transpilation error",
+            input_size=18,
         )
         retrieved_report_entry = ReportEntry(**json.loads(report_files[0].read_text()))
-        assert retrieved_report_entry == expected_report_entry
+        assert _without_metrics(retrieved_report_entry) == expected_report_entry
 
 
 def test_stats_collection_no_error(io_dir_pair):
@@ -255,6 +271,127 @@ def test_stats_collection_no_error(io_dir_pair):
             statements=1,
             transpiled=1,
             transpiled_statements=1,
+            input_size=18,
+            output_size=18,
         )
         retrieved_report_entry = ReportEntry(**json.loads(report_files[0].read_text()))
-        assert retrieved_report_entry == expected_report_entry
+        assert _without_metrics(retrieved_report_entry) == expected_report_entry
+
+
+def test_report_entry_traces_the_timed_pass():
+    with patch.object(commons, "parse_sql", wraps=commons.parse_sql) as parse_sql:
+        entry = commons._prepare_report_entry("Remorph", "", "", Snow, Databricks, "query.sql", "SELECT a FROM b")
+
+    # the SQL is parsed once, the peak memory is traced while it is timed
+    parse_sql.assert_called_once()
+    assert entry.transpiled == 1
+    assert entry.peak_memory_bytes > 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_report_entry_keeps_the_trace_of_the_caller():
+    tracemalloc.start()
+    try:
+        allocated = [bytearray(1024) for _ in range(10)]
+        traced_before, _ = tracemalloc.get_traced_memory()
+
+        entry = commons._prepare_report_entry("Remorph", "", "", Snow, Databricks, "query.sql", "SELECT a FROM b")
+
+        assert tracemalloc.is_tracing()
+        traced_after, _ = tracemalloc.get_traced_memory()
+        # the allocations traced before the entry are still traced
+        assert traced_after >= traced_before
+        assert tracemalloc.get_object_traceback(allocated[0]) is not None
+        assert entry.peak_memory_bytes > 0
+    finally:
+        tracemalloc.stop()
+
+
+def test_stats_collection_matrix(tmp_path):
+    snowflake_dir = tmp_path / "input" / "snowflake"
+    snowflake_dir.mkdir(parents=True)
+    for i in range(5):
+        (snowflake_dir / f"test{i}.sql").write_text(f"SELECT {i} FROM test")
+    (snowflake_dir / "invalid.sql").write_text("SELECT FROM WHERE (")
+    tsql_dir = tmp_path / "input" / "tsql"
+    tsql_dir.mkdir()
+    (tsql_dir / "test.sql").write_text("SELECT TOP 10 * FROM test")
+    output_dir = tmp_path / "output"
+
+    jobs = [
+        CoverageJob("Remorph", "6b0e403", "", Snow, Databricks, "snowflake"),
+        CoverageJob("Other", "", "", Snow, Databricks, "snowflake"),
+        CoverageJob("Remorph", "6b0e403", "", Snow, Databricks, "tsql"),
+    ]
+    collect_transpilation_stats_matrix(jobs, tmp_path / "input", output_dir, max_workers=2, batch_size=2)
+
+    report_files = sorted(output_dir.glob("*.json"))
+    assert len(report_files) == 3
+    assert [path.name for path in output_dir.iterdir() if path.name.startswith(".parts_")] == []
+
+    entries = [ReportEntry(**json.loads(line)) for path in report_files for line in path.read_text().splitlines()]
+    assert len(entries) == 13
+    assert {entry.project for entry in entries} == {"Remorph", "Other"}
+    snowflake_entries = [entry for entry in entries if entry.file.startswith("snowflake/")]
+    assert len(snowflake_entries) == 12
+    assert sum(entry.parsed for entry in snowflake_entries) == 10
+    assert [entry.file for entry in entries if entry.file.startswith("tsql/")] == ["tsql/test.sql"]
+
+
+def test_stats_collection_matrix_reads_the_batches_as_the_workers_free_up(tmp_path):
+    snowflake_dir = tmp_path / "input" / "snowflake"
+    snowflake_dir.mkdir(parents=True)
+    for i in range(10):
+        (snowflake_dir / f"test{i}.sql").write_text(f"SELECT {i} FROM test")
+    in_flight = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def __init__(self, max_workers=None):
+            super().__init__(max_workers=max_workers)
+            self._futures = []
+
+        def submit(self, fn, /, *args, **kwargs):
+            in_flight.append(sum(not future.done() for future in self._futures))
+            future = super().submit(fn, *args, **kwargs)
+            self._futures.append(future)
+            return future
+
+    jobs = [CoverageJob("Remorph", "6b0e403", "", Snow, Databricks, "snowflake")]
+    with patch.object(commons, "ProcessPoolExecutor", RecordingExecutor):
+        collect_transpilation_stats_matrix(jobs, tmp_path / "input", tmp_path / "output", max_workers=1, batch_size=1)
+
+    # a batch per file, at most two batches per worker are pending when another one is submitted
+    assert len(in_flight) == 10
+    assert max(in_flight) <= 2
+    [report_file] = (tmp_path / "output").glob("*.json")
+    assert len(report_file.read_text().splitlines()) == 10
+
+
+def test_compare_transpilation_times(tmp_path):
+    def write_run(output_dir, timings):
+        output_dir.mkdir()
+        with open(output_dir / "remorph_snow_databricks_1.json", "w", encoding="utf8") as report_file:
+            for file, (parsing_time_ms, transpilation_time_ms) in timings.items():
+                report_entry = ReportEntry(
+                    project="Remorph",
+                    commit_hash="6b0e403",
+                    version="",
+                    timestamp="2022-01-01T00:00:00",
+                    source_dialect="Snow",
+                    target_dialect="Databricks",
+                    file=file,
+                    parsed=1,
+                    transpiled=1,
+                    parsing_time_ms=parsing_time_ms,
+                    transpilation_time_ms=transpilation_time_ms,
+                )
+                write_json_line(report_file, report_entry)
+
+    write_run(tmp_path / "baseline", {"a.sql": (10.0, 10.0), "b.sql": (10.0, 10.0), "c.sql": (0.1, 0.1)})
+    write_run(
+        tmp_path / "current",
+        {"a.sql": (30.0, 20.0), "b.sql": (11.0, 11.0), "c.sql": (1.0, 1.0), "d.sql": (100.0, 100.0)},
+    )
+
+    regressions = compare_transpilation_times(tmp_path / "baseline", tmp_path / "current", threshold=0.5)
+    assert [(regression.file, regression.ratio) for regression in regressions] == [("a.sql", 2.5)]
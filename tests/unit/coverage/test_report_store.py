@@ -0,0 +1,56 @@
+# pylint: disable=all
+from databricks.labs.remorph.coverage.commons import ReportEntry, write_json_line
+from databricks.labs.remorph.coverage.report_store import CoverageReportStore, CoverageTrend
+
+
+def _write_report(path, version, timestamp, outcomes):
+    with open(path, "w", encoding="utf8") as report_file:
+        for i, (parsed, transpiled) in enumerate(outcomes):
+            report_entry = ReportEntry(
+                project="Remorph",
+                commit_hash="6b0e403",
+                version=version,
+                timestamp=timestamp,
+                source_dialect="Snow",
+                target_dialect="Databricks",
+                file=f"test{i}.sql",
+                parsed=parsed,
+                transpiled=transpiled,
+                parsing_time_ms=2.0,
+                transpilation_time_ms=1.0,
+            )
+            write_json_line(report_file, report_entry)
+
+
+def test_ingest_and_trend(tmp_path):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    _write_report(output_dir / "run1.json", "0.1.0", "2024-01-01T01:00:00", [(1, 1), (1, 0), (0, 0), (1, 1)])
+
+    with CoverageReportStore(tmp_path / "history.db", batch_size=3) as store:
+        assert store.ingest(output_dir) == 4
+        assert store.ingest(output_dir) == 0
+
+        _write_report(output_dir / "run2.json", "0.2.0", "2024-01-02T01:00:00", [(1, 1), (1, 1)])
+        assert store.ingest(output_dir) == 2
+
+        trend = list(store.trend(project="Remorph"))
+        assert trend == [
+            CoverageTrend("Remorph", "Snow", "0.1.0", "2024-01-01", 4, 3, 2, 3.0),
+            CoverageTrend("Remorph", "Snow", "0.2.0", "2024-01-02", 2, 2, 2, 3.0),
+        ]
+        assert trend[0].parse_ratio == 0.75
+        assert list(store.trend(version="0.3.0")) == []
+
+
+def test_ingest_replaces_changed_report(tmp_path):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    _write_report(output_dir / "run1.json", "0.1.0", "2024-01-01T01:00:00", [(1, 1)])
+
+    with CoverageReportStore(tmp_path / "history.db") as store:
+        store.ingest(output_dir)
+        _write_report(output_dir / "run1.json", "0.1.0", "2024-01-01T01:00:00", [(1, 1), (0, 0)])
+        store.ingest(output_dir)
+
+        assert [trend.total for trend in store.trend()] == [2]
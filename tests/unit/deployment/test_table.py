@@ -1,7 +1,9 @@
+from importlib.resources import files
 from pathlib import Path
 
 from databricks.labs.lsql.backends import MockBackend
 
+import databricks.labs.remorph.resources
 from databricks.labs.remorph.deployment.table import TableDeployment
 
 
@@ -12,3 +14,15 @@ def test_deploy_table_from_ddl_file():
     table_deployer.deploy_table_from_ddl_file("catalog", "schema", "table", ddl_file)
     assert len(sql_backend.queries) == 1
     assert sql_backend.queries[0] == ddl_file.read_text()
+
+
+def test_deploy_clustered_table_from_ddl_file():
+    sql_backend = MockBackend()
+    table_deployer = TableDeployment(sql_backend)
+    ddl_file = files(databricks.labs.remorph.resources).joinpath("reconcile/queries/installation/metrics.sql")
+    table_deployer.deploy_table_from_ddl_file("catalog", "schema", "metrics", ddl_file)
+    # a table deployed by an earlier version is clustered as well
+    assert sql_backend.queries == [
+        ddl_file.read_text(),
+        "ALTER TABLE metrics CLUSTER BY (recon_table_id, inserted_ts)",
+    ]
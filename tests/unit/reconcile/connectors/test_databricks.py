@@ -2,10 +2,12 @@ import re
 from unittest.mock import MagicMock, create_autospec
 
 import pytest
+from pyspark.sql import Row
 
 from databricks.labs.remorph.config import get_dialect
 from databricks.labs.remorph.reconcile.connectors.databricks import DatabricksDataSource
 from databricks.labs.remorph.reconcile.exception import DataSourceRuntimeException
+from databricks.labs.remorph.reconcile.recon_config import Schema
 from databricks.sdk import WorkspaceClient
 
 
@@ -101,3 +103,30 @@ def test_get_schema_exception_handling():
         "where lower(table_catalog)='org' and lower(table_schema)='data' and lower("
         "table_name) ='employee' order by col_name : Test Exception"
     )
+
+
+def test_get_schemas():
+    engine, spark, ws, scope = initial_setup()
+    dd = DatabricksDataSource(engine, spark, ws, scope)
+    spark.sql().distinct().collect.return_value = [
+        Row(table_name="supplier", col_name="s_suppkey", data_type="bigint"),
+        Row(table_name="nation", col_name="n_name", data_type="string"),
+    ]
+
+    schemas = dd.get_schemas("catalog", "schema", ["supplier", "nation"])
+
+    spark.sql.assert_called_with(
+        re.sub(
+            r'\s+',
+            ' ',
+            """select lower(table_name) as table_name, lower(column_name) as col_name, full_data_type as data_type
+                    from catalog.information_schema.columns where lower(table_catalog)='catalog'
+                    and lower(table_schema)='schema' and lower(table_name) in ('supplier', 'nation') order by
+                    table_name, col_name""",
+        )
+    )
+    assert schemas == {"supplier": [Schema("s_suppkey", "bigint")], "nation": [Schema("n_name", "string")]}
+
+    # hive_metastore has no information_schema, so every table is described
+    dd.get_schemas("hive_metastore", "schema", ["supplier"])
+    spark.sql.assert_called_with("describe table hive_metastore.schema.supplier")
@@ -3,11 +3,12 @@ import re
 from unittest.mock import MagicMock, create_autospec
 
 import pytest
+from pyspark.sql import Row
 
 from databricks.labs.remorph.config import get_dialect
 from databricks.labs.remorph.reconcile.connectors.oracle import OracleDataSource
 from databricks.labs.remorph.reconcile.exception import DataSourceRuntimeException
-from databricks.labs.remorph.reconcile.recon_config import JdbcReaderOptions, Table
+from databricks.labs.remorph.reconcile.recon_config import JdbcReaderOptions, Schema, Table
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.workspace import GetSecretResponse
 
@@ -175,3 +176,39 @@ def test_get_schema_exception_handling():
                                 WHERE lower(TABLE_NAME) = 'employee' and lower(owner) = 'data' """,
     ):
         ds.get_schema(None, "data", "employee")
+
+
+def test_get_schemas():
+    engine, spark, ws, scope = initial_setup()
+    ds = OracleDataSource(engine, spark, ws, scope)
+    spark.read.format().option().option().option().load().collect.return_value = [
+        Row(table_name="EMPLOYEE", column_name="ID", data_type="NUMBER(10)"),
+        Row(table_name="DEPARTMENT", column_name="NAME", data_type="VARCHAR2(30)"),
+    ]
+
+    schemas = ds.get_schemas(None, "data", ["employee", "department"])
+
+    spark.read.format().option().option().option.assert_called_with(
+        "dbtable",
+        re.sub(
+            r'\s+',
+            ' ',
+            r"""(select table_name, column_name, case when (data_precision is not null
+                                              and data_scale <> 0)
+                                              then data_type || '(' || data_precision || ',' || data_scale || ')'
+                                              when (data_precision is not null and data_scale = 0)
+                                              then data_type || '(' || data_precision || ')'
+                                              when data_precision is null and (lower(data_type) in ('date') or
+                                              lower(data_type) like 'timestamp%') then  data_type
+                                              when CHAR_LENGTH == 0 then data_type
+                                              else data_type || '(' || CHAR_LENGTH || ')'
+                                              end data_type
+                                              FROM ALL_TAB_COLUMNS
+                            WHERE lower(TABLE_NAME) in ('employee', 'department') and lower(owner) = 'data'
+                            ORDER BY table_name, column_id) tmp""",
+        ),
+    )
+    assert schemas == {
+        "employee": [Schema("id", "number(10)")],
+        "department": [Schema("name", "varchar2(30)")],
+    }
@@ -1,4 +1,6 @@
 import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import create_autospec
 
 import pytest
@@ -10,9 +12,7 @@ from databricks.sdk.service.workspace import GetSecretResponse
 
 
 class Test(SecretsMixin):
-    def __init__(self, ws: WorkspaceClient, secret_scope: str):
-        self._ws = ws
-        self._secret_scope = secret_scope
+    pass
 
 
 def mock_secret(scope, key):
@@ -47,3 +47,47 @@ def test_get_secrets_not_found_exception():
 
     with pytest.raises(NotFound, match="Secret does not exist with scope: scope and key: unknown : Test Exception"):
         mock._get_secret("unknown")
+
+
+def test_get_secrets_cached_until_ttl():
+    ws = create_autospec(WorkspaceClient)
+    ws.secrets.get_secret.side_effect = mock_secret
+    mock = Test(ws, "scope")
+
+    assert mock._get_secret("user_name") == "my_user"
+    assert mock._get_secret("user_name") == "my_user"
+    assert mock._get_secret("password") == "my_password"
+    assert ws.secrets.get_secret.call_count == 2
+
+    # an expired secret is fetched again
+    mock._secret_ttl_seconds = 0
+    assert mock._get_secret("user_name") == "my_user"
+    assert ws.secrets.get_secret.call_count == 3
+
+    # the cache belongs to the data source, another one fetches its own secrets
+    assert Test(ws, "scope")._get_secret("user_name") == "my_user"
+    assert ws.secrets.get_secret.call_count == 4
+
+
+def test_get_secrets_only_waits_on_the_same_key():
+    ws = create_autospec(WorkspaceClient)
+    password_fetched = threading.Event()
+
+    def slow_secret(scope, key):
+        if key == "user_name":
+            # only returns once the password was fetched meanwhile
+            assert password_fetched.wait(timeout=10)
+        else:
+            password_fetched.set()
+        return mock_secret(scope, key)
+
+    ws.secrets.get_secret.side_effect = slow_secret
+    mock = Test(ws, "scope")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        user_names = [executor.submit(mock._get_secret, "user_name") for _ in range(2)]
+        password = executor.submit(mock._get_secret, "password")
+        assert password.result() == "my_password"
+        assert [user_name.result() for user_name in user_names] == ["my_user", "my_user"]
+    # the waiting lookup of the same key reuses the fetched secret
+    assert ws.secrets.get_secret.call_count == 2
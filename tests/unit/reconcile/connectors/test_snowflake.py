@@ -3,11 +3,12 @@ import re
 from unittest.mock import MagicMock, create_autospec
 
 import pytest
+from pyspark.sql import Row
 
 from databricks.labs.remorph.config import get_dialect
 from databricks.labs.remorph.reconcile.connectors.snowflake import SnowflakeDataSource
 from databricks.labs.remorph.reconcile.exception import DataSourceRuntimeException
-from databricks.labs.remorph.reconcile.recon_config import JdbcReaderOptions, Table
+from databricks.labs.remorph.reconcile.recon_config import JdbcReaderOptions, Schema, Table
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.workspace import GetSecretResponse
 
@@ -246,3 +247,45 @@ def test_get_schema_exception_handling():
         "Exception",
     ):
         ds.get_schema("catalog", "schema", "supplier")
+
+
+def test_get_schemas():
+    engine, spark, ws, scope = initial_setup()
+    ds = SnowflakeDataSource(engine, spark, ws, scope)
+    spark.read.format().option().options().load().collect.return_value = [
+        Row(TABLE_NAME="SUPPLIER", COLUMN_NAME="S_SUPPKEY", DATA_TYPE="NUMBER(38,0)"),
+        Row(TABLE_NAME="SUPPLIER", COLUMN_NAME="S_NAME", DATA_TYPE="VARCHAR(25)"),
+        Row(TABLE_NAME="NATION", COLUMN_NAME="N_NATIONKEY", DATA_TYPE="NUMBER(38,0)"),
+    ]
+
+    schemas = ds.get_schemas("catalog", "schema", ["supplier", "nation", "region"])
+
+    spark.read.format().option.assert_called_with(
+        "dbtable",
+        re.sub(
+            r'\s+',
+            ' ',
+            """(select table_name, column_name, case when numeric_precision is not null and numeric_scale is not null
+        then concat(data_type, '(', numeric_precision, ',' , numeric_scale, ')') when lower(data_type) = 'text' then
+        concat('varchar', '(', CHARACTER_MAXIMUM_LENGTH, ')')  else data_type end as data_type from
+        catalog.INFORMATION_SCHEMA.COLUMNS where lower(table_name) in ('supplier', 'nation', 'region')
+        and table_schema = 'SCHEMA' order by table_name, ordinal_position) as tmp""",
+        ),
+    )
+    assert schemas == {
+        "supplier": [Schema("s_suppkey", "number(38,0)"), Schema("s_name", "varchar(25)")],
+        "nation": [Schema("n_nationkey", "number(38,0)")],
+        "region": [],
+    }
+
+
+def test_connection_secrets_fetched_once():
+    engine, spark, ws, scope = initial_setup()
+    ds = SnowflakeDataSource(engine, spark, ws, scope)
+
+    for _ in range(3):
+        assert ds.get_jdbc_url.startswith("jdbc:snowflake://my_account")
+        ds.reader("select 1")
+
+    # sfAccount, sfUrl, sfUser, sfPassword, sfDatabase, sfSchema, sfWarehouse and sfRole
+    assert ws.secrets.get_secret.call_count == 8
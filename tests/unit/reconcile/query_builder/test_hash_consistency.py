@@ -0,0 +1,83 @@
+import dataclasses
+import hashlib
+
+import pytest
+import sqlglot
+from pyspark.sql import Row
+
+from databricks.labs.remorph.config import get_dialect
+from databricks.labs.remorph.reconcile.query_builder.hash_query import HashQueryBuilder
+from databricks.labs.remorph.reconcile.recon_config import HASH_ALGORITHMS, Schema, Table
+
+SCHEMA = [Schema("s_suppkey", "bigint"), Schema("s_name", "string"), Schema("s_comment", "string")]
+ROWS = [
+    Row(s_suppkey=1, s_name="Supplier#000000001", s_comment=" padded  "),
+    Row(s_suppkey=2, s_name="Lieferant Müller", s_comment=None),
+    Row(s_suppkey=3, s_name="供应商", s_comment="naïve café"),
+]
+ORACLE_HASH_NAMES = {"sha256": "SHA256", "sha1": "SHA1", "md5": "MD5"}
+
+
+def _expected_hash(row: Row, algorithm: str) -> str:
+    # the hash query concatenates the trimmed columns in the order of their names, NULL as a marker
+    values = [row.s_comment, row.s_name, row.s_suppkey]
+    text = "".join("_null_recon_" if value is None else str(value).strip() for value in values)
+    return hashlib.new(algorithm, text.encode("utf-8")).hexdigest()
+
+
+def _table_conf(algorithm: str) -> Table:
+    return Table(source_name="supplier", target_name="supplier", join_columns=["s_suppkey"], hash_algorithm=algorithm)
+
+
+@pytest.fixture(scope="module")
+def hash_table(mock_spark):
+    mock_spark.createDataFrame(ROWS).write.mode("overwrite").saveAsTable("default.hash_consistency")
+    return "default.hash_consistency"
+
+
+@pytest.mark.parametrize("algorithm", HASH_ALGORITHMS)
+def test_row_hashes_equal_across_dialects(mock_spark, hash_table, algorithm):
+    table_conf = _table_conf(algorithm)
+    expected = {row.s_suppkey: _expected_hash(row, algorithm) for row in ROWS}
+
+    databricks_query = HashQueryBuilder(table_conf, SCHEMA, "target", get_dialect("databricks")).build_query("data")
+    snowflake_query = HashQueryBuilder(table_conf, SCHEMA, "source", get_dialect("snowflake")).build_query("data")
+    # the Snowflake hash functions behave as their Spark counterparts, so the query is run once transpiled
+    (snowflake_on_spark,) = sqlglot.transpile(
+        snowflake_query, read=get_dialect("snowflake"), write=get_dialect("databricks")
+    )
+
+    for query in (databricks_query, snowflake_on_spark):
+        rows = mock_spark.sql(query.replace(":tbl", hash_table)).collect()
+        assert {row.s_suppkey: row.hash_value_recon for row in rows} == expected
+
+    oracle_query = HashQueryBuilder(table_conf, SCHEMA, "source", get_dialect("oracle")).build_query("data")
+    # STANDARD_HASH returns upper case hex digits, they are lower cased like the other dialects
+    assert oracle_query.startswith(
+        "SELECT LOWER(RAWTOHEX(STANDARD_HASH(CONCAT(COALESCE(TRIM(s_comment), '_null_recon_'), "
+        "COALESCE(TRIM(s_name), '_null_recon_'), COALESCE(TRIM(s_suppkey), '_null_recon_')), "
+        f"'{ORACLE_HASH_NAMES[algorithm]}'))) AS hash_value_recon"
+    )
+
+
+@pytest.mark.parametrize("algorithm", HASH_ALGORITHMS)
+def test_compact_row_hashes_equal_across_dialects(mock_spark, hash_table, algorithm):
+    table_conf = dataclasses.replace(_table_conf(algorithm), compact_hash=True)
+    # the integer of the first 15 hex digits of the digest
+    expected = {row.s_suppkey: int(_expected_hash(row, algorithm)[:15], 16) for row in ROWS}
+
+    databricks_query = HashQueryBuilder(table_conf, SCHEMA, "target", get_dialect("databricks")).build_query("data")
+    rows = mock_spark.sql(databricks_query.replace(":tbl", hash_table)).collect()
+
+    assert {row.s_suppkey: row.hash_value_recon for row in rows} == expected
+    assert max(expected.values()) < 2**63
+    for dialect in ("snowflake", "oracle"):
+        query = HashQueryBuilder(table_conf, SCHEMA, "source", get_dialect(dialect)).build_query("data")
+        assert query.startswith("SELECT TO_NUMBER(SUBSTR")
+        assert ", 1, 15), 'XXXXXXXXXXXXXXX') AS hash_value_recon" in query
+
+
+def test_hash_algorithm_is_validated():
+    assert _table_conf("MD5").hash_algorithm == "md5"
+    with pytest.raises(ValueError, match="Hash algorithm must be one of sha256, sha1, md5, got crc32"):
+        _table_conf("crc32")
@@ -1,6 +1,9 @@
+import pytest
+
 from databricks.labs.remorph.config import get_dialect
+from databricks.labs.remorph.reconcile.exception import InvalidInputException
 from databricks.labs.remorph.reconcile.query_builder.hash_query import HashQueryBuilder
-from databricks.labs.remorph.reconcile.recon_config import Filters, ColumnMapping, Transformation
+from databricks.labs.remorph.reconcile.recon_config import Filters, ColumnMapping, Schema, Transformation
 
 
 def test_hash_query_builder_for_snowflake_src(table_conf_with_opts, table_schema):
@@ -223,3 +226,113 @@ def test_config_case_sensitivity(table_conf_mock, table_schema, column_mapping):
 
     assert src_actual == src_expected
     assert tgt_actual == tgt_expected
+
+
+def test_hash_bucket_queries_for_oracle_src(table_conf_mock):
+    table_conf = table_conf_mock(join_columns=["s_suppkey"])
+    table_conf.hash_buckets = 16
+    schema = [Schema("s_suppkey", "number"), Schema("s_name", "varchar")]
+    builder = HashQueryBuilder(table_conf, schema, "source", get_dialect("oracle"))
+
+    row_hash = (
+        "LOWER(RAWTOHEX(STANDARD_HASH(CONCAT(COALESCE(TRIM(s_name), '_null_recon_'), COALESCE(TRIM(s_suppkey), "
+        "'_null_recon_')), 'SHA256')))"
+    )
+    bucket = (
+        "MOD(TO_NUMBER(SUBSTR(LOWER(RAWTOHEX(STANDARD_HASH(CONCAT(COALESCE(TRIM(s_suppkey), '_null_recon_')), "
+        "'SHA256'))), 1, 8), 'XXXXXXXX'), 16)"
+    )
+    assert builder.build_bucket_query(report_type="data") == (
+        "SELECT bucket_id, COUNT(1) AS row_count, SUM(TO_NUMBER(SUBSTR(hash_value_recon, 1, 8), 'XXXXXXXX')) AS "
+        "hash_sum_1, SUM(TO_NUMBER(SUBSTR(hash_value_recon, 9, 8), 'XXXXXXXX')) AS hash_sum_2 FROM (SELECT "
+        f"{row_hash} AS hash_value_recon, {bucket} AS bucket_id FROM :tbl) row_hashes GROUP BY bucket_id"
+    )
+    assert builder.build_query(report_type="data", buckets=[3, 11]) == (
+        f"SELECT {row_hash} AS hash_value_recon, s_suppkey AS s_suppkey FROM :tbl WHERE {bucket} IN (3, 11)"
+    )
+
+
+def test_hash_bucket_query_sums_as_decimal_for_databricks(table_conf_mock):
+    table_conf = table_conf_mock(join_columns=["s_suppkey"])
+    table_conf.hash_buckets = 16
+    schema = [Schema("s_suppkey", "number"), Schema("s_name", "varchar")]
+
+    actual = HashQueryBuilder(table_conf, schema, "target", get_dialect("databricks")).build_bucket_query("data")
+
+    assert (
+        "SUM(CAST(CAST(CONV(SUBSTRING(hash_value_recon, 1, 8), 16, 10) AS BIGINT) AS DECIMAL(38, 0))) AS hash_sum_1"
+        in actual
+    )
+    assert (
+        "SUM(CAST(CAST(CONV(SUBSTRING(hash_value_recon, 9, 8), 16, 10) AS BIGINT) AS DECIMAL(38, 0))) AS hash_sum_2"
+        in actual
+    )
+
+
+@pytest.mark.parametrize("hash_buckets", [None, 0])
+def test_hash_bucket_query_without_buckets(table_conf_mock, hash_buckets):
+    table_conf = table_conf_mock(join_columns=["s_suppkey"])
+    table_conf.hash_buckets = hash_buckets
+    schema = [Schema("s_suppkey", "number"), Schema("s_name", "varchar")]
+    builder = HashQueryBuilder(table_conf, schema, "source", get_dialect("oracle"))
+
+    with pytest.raises(InvalidInputException, match="Hash buckets must be a positive number"):
+        builder.build_bucket_query(report_type="data")
+
+
+def test_hash_query_for_sample_report_type(table_conf_mock):
+    table_conf = table_conf_mock(join_columns=["s_suppkey"])
+    schema = [Schema("s_suppkey", "number"), Schema("s_name", "varchar")]
+
+    src_query = HashQueryBuilder(table_conf, schema, "source", get_dialect("snowflake")).build_query(
+        report_type="sample", sample_percentage=2.5
+    )
+    tgt_query = HashQueryBuilder(table_conf, schema, "target", get_dialect("databricks")).build_query(
+        report_type="sample", sample_percentage=2.5
+    )
+
+    # both sides keep the rows whose join column hash falls in the first 250 of 10000 buckets
+    assert src_query.endswith(
+        "FROM :tbl WHERE MOD(TO_NUMBER(SUBSTRING(LOWER(SHA2(CONCAT(COALESCE(TRIM(s_suppkey), '_null_recon_')), 256)), "
+        "1, 8), 'XXXXXXXX'), 10000) < 250"
+    )
+    assert tgt_query.endswith(
+        "FROM :tbl WHERE MOD(CAST(CONV(SUBSTRING(LOWER(SHA2(CONCAT(COALESCE(TRIM(s_suppkey), '_null_recon_')), 256)), "
+        "1, 8), 16, 10) AS BIGINT), 10000) < 250"
+    )
+
+
+def test_hash_queries_partitioned_by_the_native_hash_of_the_keys(table_conf_mock):
+    table_conf = table_conf_mock(join_columns=["s_name", "s_nationkey"], filters=Filters(source="s_acctbal > 0"))
+    schema = [Schema("s_name", "varchar"), Schema("s_nationkey", "varchar"), Schema("s_acctbal", "number")]
+
+    oracle_queries = HashQueryBuilder(table_conf, schema, "source", get_dialect("oracle")).build_queries(
+        report_type="data", num_partitions=4
+    )
+    snowflake_queries = HashQueryBuilder(table_conf, schema, "source", get_dialect("snowflake")).build_queries(
+        report_type="data", num_partitions=4
+    )
+
+    assert [query.split(" WHERE ")[1] for query in oracle_queries] == [
+        f"s_acctbal > 0 AND NVL(ORA_HASH(s_name || '|' || s_nationkey, 3), 0) = {partition}" for partition in range(4)
+    ]
+    assert [query.split(" WHERE ")[1] for query in snowflake_queries] == [
+        f"s_acctbal > 0 AND ABS(MOD(HASH(s_name, s_nationkey), 4)) = {partition}" for partition in range(4)
+    ]
+    # the partitions only split the rows of the hash query
+    assert {query.split(" WHERE ")[0] for query in snowflake_queries} == {
+        HashQueryBuilder(table_conf, schema, "source", get_dialect("snowflake"))
+        .build_query(report_type="data")
+        .split(" WHERE ")[0]
+    }
+
+
+def test_hash_queries_not_partitioned_without_a_native_hash(table_conf_mock):
+    table_conf = table_conf_mock(join_columns=["s_name"])
+    schema = [Schema("s_name", "varchar"), Schema("s_acctbal", "number")]
+    builder = HashQueryBuilder(table_conf, schema, "source", get_dialect("databricks"))
+
+    assert builder.build_queries(report_type="data", num_partitions=4) == [builder.build_query(report_type="data")]
+    assert HashQueryBuilder(table_conf, schema, "source", get_dialect("oracle")).build_queries(
+        report_type="data", num_partitions=1
+    ) == [HashQueryBuilder(table_conf, schema, "source", get_dialect("oracle")).build_query(report_type="data")]
@@ -48,36 +48,26 @@ def test_build_query_for_snowflake_src(mock_spark, table_conf_mock, table_schema
         transformations=[Transformation(column_name="s_address", source="trim(s_address)", target="trim(s_address_t)")],
     )
 
-    src_actual = SamplingQueryBuilder(conf, sch, "source", get_dialect("snowflake")).build_query(df)
+    src_actual = SamplingQueryBuilder(conf, sch, "source", get_dialect("snowflake")).build_queries(df)
     src_expected = (
-        'WITH recon AS (SELECT 11 AS s_nationkey, 1 AS s_suppkey UNION SELECT 22 AS '
-        "s_nationkey, 2 AS s_suppkey), src AS (SELECT COALESCE(TRIM(s_acctbal), '_null_recon_') "
-        "AS s_acctbal, TRIM(s_address) AS s_address, COALESCE(TRIM(s_comment), '_null_recon_') AS "
-        "s_comment, COALESCE(TRIM(s_name), '_null_recon_') AS s_name, COALESCE(TRIM(s_nationkey), "
-        "'_null_recon_') AS s_nationkey, COALESCE(TRIM(s_phone), '_null_recon_') AS s_phone, "
-        "COALESCE(TRIM(s_suppkey), '_null_recon_') AS s_suppkey FROM :tbl WHERE s_nationkey = 1) "
-        'SELECT src.s_acctbal, src.s_address, src.s_comment, src.s_name, src.s_nationkey, src.s_phone, '
-        "src.s_suppkey FROM src INNER JOIN recon AS recon ON "
-        "COALESCE(TRIM(src.s_nationkey), '_null_recon_') = COALESCE(TRIM(recon.s_nationkey), '_null_recon_') "
-        "AND COALESCE(TRIM(src.s_suppkey), '_null_recon_') = COALESCE(TRIM(recon.s_suppkey), '_null_recon_')"
+        "SELECT COALESCE(TRIM(s_acctbal), '_null_recon_') AS s_acctbal, TRIM(s_address) AS s_address, "
+        "COALESCE(TRIM(s_comment), '_null_recon_') AS s_comment, COALESCE(TRIM(s_name), '_null_recon_') AS "
+        "s_name, COALESCE(TRIM(s_nationkey), '_null_recon_') AS s_nationkey, COALESCE(TRIM(s_phone), "
+        "'_null_recon_') AS s_phone, COALESCE(TRIM(s_suppkey), '_null_recon_') AS s_suppkey FROM :tbl WHERE "
+        's_nationkey = 1 AND (s_nationkey, s_suppkey) IN ((11, 1), (22, 2))'
     )
 
-    tgt_actual = SamplingQueryBuilder(conf, sch_with_alias, "target", get_dialect("databricks")).build_query(df)
+    tgt_actual = SamplingQueryBuilder(conf, sch_with_alias, "target", get_dialect("databricks")).build_queries(df)
     tgt_expected = (
-        'WITH recon AS (SELECT 11 AS s_nationkey, 1 AS s_suppkey UNION SELECT 22 AS '
-        "s_nationkey, 2 AS s_suppkey), src AS (SELECT COALESCE(TRIM(s_acctbal_t), '_null_recon_') "
-        'AS s_acctbal, TRIM(s_address_t) AS s_address, COALESCE(TRIM(s_comment_t), '
-        "'_null_recon_') AS s_comment, COALESCE(TRIM(s_name), '_null_recon_') AS s_name, "
-        "COALESCE(TRIM(s_nationkey_t), '_null_recon_') AS s_nationkey, COALESCE(TRIM(s_phone_t), "
-        "'_null_recon_') AS s_phone, COALESCE(TRIM(s_suppkey_t), '_null_recon_') AS s_suppkey FROM :tbl) "
-        'SELECT src.s_acctbal, src.s_address, src.s_comment, src.s_name, src.s_nationkey, src.s_phone, '
-        "src.s_suppkey FROM src INNER JOIN recon AS recon ON COALESCE(TRIM(src.s_nationkey), '_null_recon_') = "
-        "COALESCE(TRIM(recon.s_nationkey), '_null_recon_') AND COALESCE(TRIM(src.s_suppkey), '_null_recon_') = "
-        "COALESCE(TRIM(recon.s_suppkey), '_null_recon_')"
+        "SELECT COALESCE(TRIM(s_acctbal_t), '_null_recon_') AS s_acctbal, TRIM(s_address_t) AS s_address, "
+        "COALESCE(TRIM(s_comment_t), '_null_recon_') AS s_comment, COALESCE(TRIM(s_name), '_null_recon_') AS "
+        "s_name, COALESCE(TRIM(s_nationkey_t), '_null_recon_') AS s_nationkey, COALESCE(TRIM(s_phone_t), "
+        "'_null_recon_') AS s_phone, COALESCE(TRIM(s_suppkey_t), '_null_recon_') AS s_suppkey FROM :tbl WHERE "
+        '(s_nationkey_t, s_suppkey_t) IN ((11, 1), (22, 2))'
     )
 
-    assert src_expected == src_actual
-    assert tgt_expected == tgt_actual
+    assert [src_expected] == src_actual
+    assert [tgt_expected] == tgt_actual
 
 
 def test_build_query_for_oracle_src(mock_spark, table_conf_mock, table_schema, column_mapping):
@@ -119,39 +109,28 @@ def test_build_query_for_oracle_src(mock_spark, table_conf_mock, table_schema, c
         Schema("s_comment", "nchar"),
     ]
 
-    src_actual = SamplingQueryBuilder(conf, sch, "source", get_dialect("oracle")).build_query(df)
+    src_actual = SamplingQueryBuilder(conf, sch, "source", get_dialect("oracle")).build_queries(df)
     src_expected = (
-        'WITH recon AS (SELECT 11 AS s_nationkey, 1 AS s_suppkey FROM dual UNION SELECT 22 AS '
-        's_nationkey, 2 AS s_suppkey FROM dual UNION SELECT 33 AS s_nationkey, 3 AS s_suppkey FROM dual), '
-        "src AS (SELECT COALESCE(TRIM(s_acctbal), '_null_recon_') AS s_acctbal, "
-        "COALESCE(TRIM(s_address), '_null_recon_') AS s_address, "
-        "NVL(TRIM(TO_CHAR(s_comment)),'_null_recon_') AS s_comment, "
+        "SELECT COALESCE(TRIM(s_acctbal), '_null_recon_') AS s_acctbal, COALESCE(TRIM(s_address), "
+        "'_null_recon_') AS s_address, NVL(TRIM(TO_CHAR(s_comment)),'_null_recon_') AS s_comment, "
         "COALESCE(TRIM(s_name), '_null_recon_') AS s_name, COALESCE(TRIM(s_nationkey), '_null_recon_') AS "
-        "s_nationkey, NVL(TRIM(TO_CHAR(s_phone)),'_null_recon_') AS s_phone, "
-        "COALESCE(TRIM(s_suppkey), '_null_recon_') AS s_suppkey FROM :tbl WHERE s_nationkey = 1) "
-        'SELECT src.s_acctbal, src.s_address, src.s_comment, src.s_name, src.s_nationkey, src.s_phone, '
-        "src.s_suppkey FROM src INNER JOIN recon recon ON COALESCE(TRIM(src.s_nationkey), '_null_recon_') = "
-        "COALESCE(TRIM(recon.s_nationkey), '_null_recon_') AND COALESCE(TRIM(src.s_suppkey), '_null_recon_') = "
-        "COALESCE(TRIM(recon.s_suppkey), '_null_recon_')"
+        "s_nationkey, NVL(TRIM(TO_CHAR(s_phone)),'_null_recon_') AS s_phone, COALESCE(TRIM(s_suppkey), "
+        "'_null_recon_') AS s_suppkey FROM :tbl WHERE s_nationkey = 1 AND (s_nationkey, s_suppkey) IN ((11, "
+        '1), (22, 2), (33, 3))'
     )
 
-    tgt_actual = SamplingQueryBuilder(conf, sch_with_alias, "target", get_dialect("databricks")).build_query(df)
+    tgt_actual = SamplingQueryBuilder(conf, sch_with_alias, "target", get_dialect("databricks")).build_queries(df)
     tgt_expected = (
-        'WITH recon AS (SELECT 11 AS s_nationkey, 1 AS s_suppkey UNION SELECT 22 AS '
-        's_nationkey, 2 AS s_suppkey UNION SELECT 33 AS s_nationkey, 3 AS s_suppkey), '
-        "src AS (SELECT COALESCE(TRIM(s_acctbal_t), '_null_recon_') AS s_acctbal, "
-        "COALESCE(TRIM(s_address_t), '_null_recon_') AS s_address, COALESCE(TRIM(s_comment_t), "
-        "'_null_recon_') AS s_comment, COALESCE(TRIM(s_name), '_null_recon_') AS s_name, "
-        "COALESCE(TRIM(s_nationkey_t), '_null_recon_') AS s_nationkey, COALESCE(TRIM(s_phone_t), "
-        "'_null_recon_') AS s_phone, COALESCE(TRIM(s_suppkey_t), '_null_recon_') AS s_suppkey FROM :tbl) "
-        'SELECT src.s_acctbal, src.s_address, src.s_comment, src.s_name, src.s_nationkey, src.s_phone, '
-        "src.s_suppkey FROM src INNER JOIN recon AS recon ON COALESCE(TRIM(src.s_nationkey), '_null_recon_') = "
-        "COALESCE(TRIM(recon.s_nationkey), '_null_recon_') AND COALESCE(TRIM(src.s_suppkey), '_null_recon_') = "
-        "COALESCE(TRIM(recon.s_suppkey), '_null_recon_')"
+        "SELECT COALESCE(TRIM(s_acctbal_t), '_null_recon_') AS s_acctbal, COALESCE(TRIM(s_address_t), "
+        "'_null_recon_') AS s_address, COALESCE(TRIM(s_comment_t), '_null_recon_') AS s_comment, "
+        "COALESCE(TRIM(s_name), '_null_recon_') AS s_name, COALESCE(TRIM(s_nationkey_t), '_null_recon_') AS "
+        "s_nationkey, COALESCE(TRIM(s_phone_t), '_null_recon_') AS s_phone, COALESCE(TRIM(s_suppkey_t), "
+        "'_null_recon_') AS s_suppkey FROM :tbl WHERE (s_nationkey_t, s_suppkey_t) IN ((11, 1), (22, 2), (33, "
+        '3))'
     )
 
-    assert src_expected == src_actual
-    assert tgt_expected == tgt_actual
+    assert [src_expected] == src_actual
+    assert [tgt_expected] == tgt_actual
 
 
 def test_build_query_for_databricks_src(mock_spark, table_conf_mock):
@@ -181,20 +160,15 @@ def test_build_query_for_databricks_src(mock_spark, table_conf_mock):
 
     conf = table_conf_mock(join_columns=["s_suppkey", "s_nationkey"])
 
-    src_actual = SamplingQueryBuilder(conf, schema, "source", get_dialect("databricks")).build_query(df)
+    src_actual = SamplingQueryBuilder(conf, schema, "source", get_dialect("databricks")).build_queries(df)
     src_expected = (
-        'WITH recon AS (SELECT 11 AS s_nationkey, 1 AS s_suppkey), src AS (SELECT '
-        "COALESCE(TRIM(s_acctbal), '_null_recon_') AS s_acctbal, COALESCE(TRIM(s_address), '_null_recon_') AS "
-        "s_address, COALESCE(TRIM(s_comment), '_null_recon_') AS s_comment, "
+        "SELECT COALESCE(TRIM(s_acctbal), '_null_recon_') AS s_acctbal, COALESCE(TRIM(s_address), "
+        "'_null_recon_') AS s_address, COALESCE(TRIM(s_comment), '_null_recon_') AS s_comment, "
         "COALESCE(TRIM(s_name), '_null_recon_') AS s_name, COALESCE(TRIM(s_nationkey), '_null_recon_') AS "
-        "s_nationkey, COALESCE(TRIM(s_phone), '_null_recon_') AS s_phone, "
-        "COALESCE(TRIM(s_suppkey), '_null_recon_') AS s_suppkey FROM :tbl) SELECT src.s_acctbal, "
-        'src.s_address, src.s_comment, src.s_name, src.s_nationkey, src.s_phone, src.s_suppkey FROM src INNER '
-        "JOIN recon AS recon ON COALESCE(TRIM(src.s_nationkey), '_null_recon_') = COALESCE(TRIM(recon.s_nationkey), "
-        "'_null_recon_') AND COALESCE(TRIM(src.s_suppkey), '_null_recon_') = COALESCE(TRIM(recon.s_suppkey), "
-        "'_null_recon_')"
+        "s_nationkey, COALESCE(TRIM(s_phone), '_null_recon_') AS s_phone, COALESCE(TRIM(s_suppkey), "
+        "'_null_recon_') AS s_suppkey FROM :tbl WHERE (s_nationkey, s_suppkey) IN ((11, 1))"
     )
-    assert src_expected == src_actual
+    assert [src_expected] == src_actual
 
 
 def test_build_query_for_snowflake_without_transformations(mock_spark, table_conf_mock, table_schema):
@@ -237,36 +211,26 @@ def test_build_query_for_snowflake_without_transformations(mock_spark, table_con
         ],
     )
 
-    src_actual = SamplingQueryBuilder(conf, sch, "source", get_dialect("snowflake")).build_query(df)
+    src_actual = SamplingQueryBuilder(conf, sch, "source", get_dialect("snowflake")).build_queries(df)
     src_expected = (
-        'WITH recon AS (SELECT 11 AS s_nationkey, 1 AS s_suppkey UNION SELECT 22 AS '
-        "s_nationkey, 2 AS s_suppkey), src AS (SELECT COALESCE(TRIM(s_acctbal), '_null_recon_') "
-        "AS s_acctbal, s_address AS s_address, COALESCE(TRIM(s_comment), '_null_recon_') AS "
-        "s_comment, TRIM(s_name) AS s_name, COALESCE(TRIM(s_nationkey), "
-        "'_null_recon_') AS s_nationkey, COALESCE(TRIM(s_phone), '_null_recon_') AS s_phone, "
-        "TRIM(s_suppkey) AS s_suppkey FROM :tbl WHERE s_nationkey = 1) "
-        'SELECT src.s_acctbal, src.s_address, src.s_comment, src.s_name, src.s_nationkey, src.s_phone, '
-        "src.s_suppkey FROM src INNER JOIN recon AS recon ON COALESCE(TRIM(src.s_nationkey), '_null_recon_') = "
-        "COALESCE(TRIM(recon.s_nationkey), '_null_recon_') AND COALESCE(TRIM(src.s_suppkey), '_null_recon_') = "
-        "COALESCE(TRIM(recon.s_suppkey), '_null_recon_')"
+        "SELECT COALESCE(TRIM(s_acctbal), '_null_recon_') AS s_acctbal, s_address AS s_address, "
+        "COALESCE(TRIM(s_comment), '_null_recon_') AS s_comment, TRIM(s_name) AS s_name, "
+        "COALESCE(TRIM(s_nationkey), '_null_recon_') AS s_nationkey, COALESCE(TRIM(s_phone), '_null_recon_') "
+        'AS s_phone, TRIM(s_suppkey) AS s_suppkey FROM :tbl WHERE s_nationkey = 1 AND (s_nationkey, '
+        'TRIM(s_suppkey)) IN ((11, 1), (22, 2))'
     )
 
-    tgt_actual = SamplingQueryBuilder(conf, sch_with_alias, "target", get_dialect("databricks")).build_query(df)
+    tgt_actual = SamplingQueryBuilder(conf, sch_with_alias, "target", get_dialect("databricks")).build_queries(df)
     tgt_expected = (
-        'WITH recon AS (SELECT 11 AS s_nationkey, 1 AS s_suppkey UNION SELECT 22 AS '
-        "s_nationkey, 2 AS s_suppkey), src AS (SELECT COALESCE(TRIM(s_acctbal_t), '_null_recon_') "
-        'AS s_acctbal, TRIM(s_address_t) AS s_address, COALESCE(TRIM(s_comment_t), '
-        "'_null_recon_') AS s_comment, s_name AS s_name, "
+        "SELECT COALESCE(TRIM(s_acctbal_t), '_null_recon_') AS s_acctbal, TRIM(s_address_t) AS s_address, "
+        "COALESCE(TRIM(s_comment_t), '_null_recon_') AS s_comment, s_name AS s_name, "
         "COALESCE(TRIM(s_nationkey_t), '_null_recon_') AS s_nationkey, COALESCE(TRIM(s_phone_t), "
-        "'_null_recon_') AS s_phone, s_suppkey_t AS s_suppkey FROM :tbl) "
-        'SELECT src.s_acctbal, src.s_address, src.s_comment, src.s_name, src.s_nationkey, src.s_phone, '
-        "src.s_suppkey FROM src INNER JOIN recon AS recon ON COALESCE(TRIM(src.s_nationkey), '_null_recon_') = "
-        "COALESCE(TRIM(recon.s_nationkey), '_null_recon_') AND COALESCE(TRIM(src.s_suppkey), '_null_recon_') = "
-        "COALESCE(TRIM(recon.s_suppkey), '_null_recon_')"
+        "'_null_recon_') AS s_phone, s_suppkey_t AS s_suppkey FROM :tbl WHERE (s_nationkey_t, s_suppkey_t) IN "
+        '((11, 1), (22, 2))'
     )
 
-    assert src_expected == src_actual
-    assert tgt_expected == tgt_actual
+    assert [src_expected] == src_actual
+    assert [tgt_expected] == tgt_actual
 
 
 def test_build_query_for_snowflake_src_for_non_integer_primary_keys(mock_spark, table_conf_mock):
@@ -298,29 +262,91 @@ def test_build_query_for_snowflake_src_for_non_integer_primary_keys(mock_spark,
         transformations=[Transformation(column_name="s_address", source="trim(s_address)", target="trim(s_address_t)")],
     )
 
-    src_actual = SamplingQueryBuilder(conf, sch, "source", get_dialect("snowflake")).build_query(df)
+    src_actual = SamplingQueryBuilder(conf, sch, "source", get_dialect("snowflake")).build_queries(df)
     src_expected = (
-        "WITH recon AS (SELECT 11 AS s_nationkey, 'a' AS s_suppkey UNION SELECT 22 AS "
-        "s_nationkey, 'b' AS s_suppkey), src AS (SELECT COALESCE(TRIM(s_name), '_null_recon_') AS s_name, "
-        "COALESCE(TRIM("
-        "s_nationkey), '_null_recon_') AS s_nationkey, COALESCE(TRIM(s_suppkey), '_null_recon_') AS s_suppkey FROM "
-        ":tbl) "
-        "SELECT src.s_name, src.s_nationkey, src.s_suppkey FROM src INNER JOIN recon AS recon ON COALESCE(TRIM("
-        "src.s_nationkey), '_null_recon_') = COALESCE(TRIM(recon.s_nationkey), '_null_recon_') AND COALESCE(TRIM("
-        "src.s_suppkey), '_null_recon_') = COALESCE(TRIM(recon.s_suppkey), '_null_recon_')"
+        "SELECT COALESCE(TRIM(s_name), '_null_recon_') AS s_name, COALESCE(TRIM(s_nationkey), '_null_recon_') "
+        "AS s_nationkey, COALESCE(TRIM(s_suppkey), '_null_recon_') AS s_suppkey FROM :tbl WHERE (s_nationkey, "
+        "s_suppkey) IN ((11, 'a'), (22, 'b'))"
     )
 
-    tgt_actual = SamplingQueryBuilder(conf, sch_with_alias, "target", get_dialect("databricks")).build_query(df)
+    tgt_actual = SamplingQueryBuilder(conf, sch_with_alias, "target", get_dialect("databricks")).build_queries(df)
     tgt_expected = (
-        "WITH recon AS (SELECT 11 AS s_nationkey, 'a' AS s_suppkey UNION SELECT 22 AS "
-        "s_nationkey, 'b' AS s_suppkey), src AS (SELECT COALESCE(TRIM(s_name), '_null_recon_') AS s_name, "
-        "COALESCE(TRIM(s_nationkey_t), '_null_recon_') AS s_nationkey, COALESCE(TRIM(s_suppkey_t), '_null_recon_') AS "
-        "s_suppkey FROM :tbl) "
-        "SELECT src.s_name, src.s_nationkey, "
-        "src.s_suppkey FROM src INNER JOIN recon AS recon ON COALESCE(TRIM(src.s_nationkey), '_null_recon_') = "
-        "COALESCE(TRIM(recon.s_nationkey), '_null_recon_') AND COALESCE(TRIM(src.s_suppkey), '_null_recon_') = "
-        "COALESCE(TRIM(recon.s_suppkey), '_null_recon_')"
+        "SELECT COALESCE(TRIM(s_name), '_null_recon_') AS s_name, COALESCE(TRIM(s_nationkey_t), "
+        "'_null_recon_') AS s_nationkey, COALESCE(TRIM(s_suppkey_t), '_null_recon_') AS s_suppkey FROM :tbl "
+        "WHERE (s_nationkey_t, s_suppkey_t) IN ((11, 'a'), (22, 'b'))"
     )
 
-    assert src_expected == src_actual
-    assert tgt_expected == tgt_actual
+    assert [src_expected] == src_actual
+    assert [tgt_expected] == tgt_actual
+
+
+def test_build_query_with_null_keys(mock_spark, table_conf_mock):
+    sch = [Schema("s_suppkey", "number"), Schema("s_name", "varchar"), Schema("s_nationkey", "number")]
+    df_schema = StructType(
+        [
+            StructField('s_suppkey', IntegerType()),
+            StructField('s_name', StringType()),
+            StructField('s_nationkey', IntegerType()),
+        ]
+    )
+    df = mock_spark.createDataFrame([(1, 'name-1', 11), (2, 'name-2', None)], schema=df_schema)
+    conf = table_conf_mock(join_columns=["s_suppkey", "s_nationkey"], filters=Filters(source="s_name <> 'x'"))
+
+    actual = SamplingQueryBuilder(conf, sch, "source", get_dialect("snowflake")).build_queries(df)
+
+    # a NULL key never matches an IN list, it is matched on its own
+    expected = (
+        "SELECT COALESCE(TRIM(s_name), '_null_recon_') AS s_name, COALESCE(TRIM(s_nationkey), '_null_recon_') AS "
+        "s_nationkey, COALESCE(TRIM(s_suppkey), '_null_recon_') AS s_suppkey FROM :tbl WHERE s_name <> 'x' AND "
+        "((s_nationkey, s_suppkey) IN ((11, 1)) OR (s_nationkey IS NULL AND s_suppkey = 2))"
+    )
+    assert actual == [expected]
+
+
+def test_build_query_splits_large_samples_for_jdbc_sources(mock_spark, table_conf_mock):
+    sch = [Schema("s_suppkey", "number"), Schema("s_name", "varchar")]
+    df = mock_spark.range(1, 1502).selectExpr("CAST(id AS INT) AS s_suppkey", "'name' AS s_name")
+    conf = table_conf_mock(join_columns=["s_suppkey"])
+
+    actual = SamplingQueryBuilder(conf, sch, "source", get_dialect("oracle")).build_queries(df)
+
+    assert len(actual) == 2
+    assert actual[0].endswith(f"WHERE s_suppkey IN ({', '.join(str(key) for key in range(1, 1001))})")
+    assert actual[1].endswith(f"WHERE s_suppkey IN ({', '.join(str(key) for key in range(1001, 1502))})")
+
+
+def test_build_query_stages_large_samples_for_databricks(mock_spark, table_conf_mock):
+    sch = [Schema("s_suppkey_t", "int"), Schema("s_name", "string")]
+    mock_spark.range(0, 3000).selectExpr("CAST(id AS INT) AS s_suppkey_t", "'name' AS s_name").union(
+        mock_spark.sql("SELECT CAST(NULL AS INT) AS s_suppkey_t, 'null-key' AS s_name")
+    ).createOrReplaceTempView("supplier_sample_tbl")
+    df = mock_spark.range(1000, 2200).selectExpr("CAST(id AS INT) AS s_suppkey", "'name' AS s_name")
+    df = df.union(mock_spark.sql("SELECT CAST(NULL AS INT) AS s_suppkey, 'null-key' AS s_name"))
+    conf = table_conf_mock(
+        join_columns=["s_suppkey"], column_mapping=[ColumnMapping(source_name="s_suppkey", target_name="s_suppkey_t")]
+    )
+
+    sampler = SamplingQueryBuilder(conf, sch, "target", get_dialect("databricks"))
+    actual = sampler.build_queries(df)
+
+    assert len(sampler.staging_views) == 1
+    staging_view = sampler.staging_views[0]
+    assert staging_view.startswith("target_supplier_sample_keys_")
+    expected = (
+        "SELECT COALESCE(TRIM(s_name), '_null_recon_') AS s_name, COALESCE(TRIM(s_suppkey_t), '_null_recon_') AS "
+        f"s_suppkey FROM :tbl AS src WHERE EXISTS(SELECT 1 FROM {staging_view} AS recon "
+        "WHERE recon.s_suppkey <=> src.s_suppkey_t)"
+    )
+    assert actual == [expected]
+    sample = mock_spark.sql(actual[0].replace(":tbl", "supplier_sample_tbl"))
+    assert sample.count() == 1201
+    assert sample.filter("s_suppkey = '_null_recon_'").count() == 1
+
+    # another sample of the same table stages its keys in its own view, until they are dropped
+    other_sampler = SamplingQueryBuilder(conf, sch, "target", get_dialect("databricks"))
+    other_sampler.build_queries(df)
+    assert other_sampler.staging_views != sampler.staging_views
+    sampler.drop_staging_views(mock_spark)
+    other_sampler.drop_staging_views(mock_spark)
+    assert not sampler.staging_views
+    assert not mock_spark.catalog.tableExists(staging_view)
@@ -1,5 +1,6 @@
 import datetime
 from pathlib import Path
+from unittest.mock import MagicMock
 
 from pyspark.sql import Row, SparkSession
 
@@ -12,7 +13,6 @@ from databricks.labs.remorph.reconcile.recon_config import (
     Table,
     AggregateQueryOutput,
 )
-from databricks.labs.remorph.reconcile.recon_capture import generate_final_reconcile_aggregate_output
 from .test_aggregates_reconcile import expected_reconcile_output_dict, expected_rule_output
 
 
@@ -70,6 +70,7 @@ def test_aggregates_reconcile_store_aggregate_metrics(mock_workspace_client, moc
     agg_reconcile_output, table_conf, reconcile_process_duration = agg_data_prep(mock_spark)
 
     recon_id = "999fygdrs-dbb7-489f-bad1-6a7e8f4821b1"
+    mock_workspace_client.current_user.me = MagicMock(wraps=mock_workspace_client.current_user.me)
 
     recon_capture = ReconCapture(
         database_config,
@@ -83,6 +84,10 @@ def test_aggregates_reconcile_store_aggregate_metrics(mock_workspace_client, moc
     )
     recon_capture.store_aggregates_metrics(table_conf, reconcile_process_duration, agg_reconcile_output)
 
+    # the user is looked up once for the run, not for every rule
+    mock_workspace_client.current_user.me.assert_called_once()
+    assert recon_capture.run_context.run_by_user == "remorph"
+
     # Check if the tables are created
 
     # assert main table data
@@ -127,12 +132,7 @@ def test_aggregates_reconcile_store_aggregate_metrics(mock_workspace_client, moc
 
     assert recon_type_values == {"mismatch", "missing_in_source", "missing_in_target"}
 
-    reconcile_output = generate_final_reconcile_aggregate_output(
-        recon_id=recon_id,
-        spark=mock_spark,
-        metadata_config=ReconcileMetadataConfig(schema="default"),
-        local_test_run=True,
-    )
+    reconcile_output = recon_capture.get_reconcile_output()
     assert len(reconcile_output.results) == 1
     assert not reconcile_output.results[0].exception_message
     assert reconcile_output.results[0].status.aggregate is False
@@ -3,7 +3,7 @@ import sys
 from dataclasses import dataclass
 from pathlib import Path
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from pyspark.testing import assertDataFrameEqual
@@ -12,12 +12,16 @@ from pyspark.sql import Row
 from databricks.labs.remorph.config import DatabaseConfig, ReconcileMetadataConfig, get_dialect
 from databricks.labs.remorph.reconcile.connectors.data_source import MockDataSource
 from databricks.labs.remorph.reconcile.execute import Reconciliation, main
+from databricks.labs.remorph.reconcile.query_builder.aggregate_query import AggregateQueryBuilder
 from databricks.labs.remorph.reconcile.recon_config import (
     Aggregate,
     AggregateQueryOutput,
     DataReconcileOutput,
     MismatchOutput,
     AggregateRule,
+    JdbcReaderOptions,
+    Schema,
+    Table,
 )
 from databricks.labs.remorph.reconcile.schema_compare import SchemaCompare
 
@@ -152,6 +156,49 @@ def test_reconcile_aggregate_data_missing_records(
         assertDataFrameEqual(actual[0].reconcile_output.mismatch.mismatch_df, expected.mismatch.mismatch_df)
 
 
+def test_reconcile_aggregates_of_a_jdbc_source_reads_without_partitions(
+    mock_spark,
+    table_conf_with_opts,
+    table_schema,
+    query_store,
+    tmp_path: Path,
+):
+    src_schema, tgt_schema = table_schema
+    table_conf_with_opts.drop_columns = ["s_acctbal"]
+    table_conf_with_opts.column_thresholds = None
+    table_conf_with_opts.aggregates = [Aggregate(type="MIN", agg_columns=["s_acctbal"])]
+    # the numeric join columns would partition the reads of the hash queries, the aggregate queries do not select them
+    table_conf_with_opts.jdbc_reader_options = JdbcReaderOptions(fetch_size=500)
+    source = MagicMock()
+    source.read_data.return_value = mock_spark.createDataFrame([Row(source_min_s_acctbal=10)])
+    target = MockDataSource(
+        {
+            (CATALOG, SCHEMA, query_store.agg_queries.target_agg_query): mock_spark.createDataFrame(
+                [Row(target_min_s_acctbal=10)]
+            )
+        },
+        {(CATALOG, SCHEMA, TGT_TABLE): tgt_schema},
+    )
+
+    with patch("databricks.labs.remorph.reconcile.execute.generate_volume_path", return_value=str(tmp_path)):
+        actual = Reconciliation(
+            source,
+            target,
+            DatabaseConfig(source_catalog=CATALOG, source_schema=SCHEMA, target_catalog=CATALOG, target_schema=SCHEMA),
+            "",
+            SchemaCompare(mock_spark),
+            get_dialect("oracle"),
+            mock_spark,
+            ReconcileMetadataConfig(),
+        ).reconcile_aggregates(table_conf_with_opts, src_schema, tgt_schema)
+
+    assert [output.reconcile_output.mismatch_count for output in actual] == [0]
+    # the aggregate query is the only read, the table is not probed and the rows are read in a single partition
+    source.read_data.assert_called_once()
+    assert source.read_data.call_args.kwargs["query"] == query_store.agg_queries.source_agg_query
+    assert source.read_data.call_args.kwargs["options"] == JdbcReaderOptions(fetch_size=500)
+
+
 def expected_rule_output():
     count_rule_output = AggregateRule(
         agg_type="count",
@@ -344,6 +391,98 @@ def test_reconcile_aggregate_data_mismatch_and_missing_records(
             )
 
 
+def test_aggregates_grouping_sets_query():
+    table_conf = Table(
+        source_name="supplier",
+        target_name="supplier",
+        aggregates=[
+            Aggregate(type="MAX", agg_columns=["s_acctbal"], group_by_columns=["s_nationkey"]),
+            Aggregate(type="SUM", agg_columns=["s_acctbal"], group_by_columns=["s_region"]),
+            Aggregate(type="COUNT", agg_columns=["s_name"]),
+            Aggregate(type="MIN", agg_columns=["s_acctbal"], group_by_columns=["s_nationkey", "s_region"]),
+        ],
+    )
+    schema = [
+        Schema("s_acctbal", "decimal(15,2)"),
+        Schema("s_name", "string"),
+        Schema("s_nationkey", "bigint"),
+        Schema("s_region", "string"),
+    ]
+
+    actual = AggregateQueryBuilder(table_conf, schema, "source", get_dialect("snowflake")).build_grouping_sets_queries()
+
+    assert {query_rules.query for query_rules in actual} == {
+        (
+            "SELECT count(s_name) AS source_count_s_name, max(s_acctbal) AS source_max_s_acctbal, "
+            "min(s_acctbal) AS source_min_s_acctbal, sum(s_acctbal) AS source_sum_s_acctbal, "
+            "s_nationkey AS source_group_by_s_nationkey, s_region AS source_group_by_s_region, "
+            "GROUPING_ID(s_nationkey, s_region) AS grouping_id FROM :tbl "
+            "GROUP BY GROUPING SETS ((), (s_nationkey), (s_nationkey, s_region), (s_region))"
+        )
+    }
+    assert [(query_rules.grouping_id, query_rules.columns) for query_rules in actual] == [
+        (3, ["source_count_s_name"]),
+        (1, ["source_max_s_acctbal", "source_group_by_s_nationkey"]),
+        (0, ["source_min_s_acctbal", "source_group_by_s_nationkey", "source_group_by_s_region"]),
+        (2, ["source_sum_s_acctbal", "source_group_by_s_region"]),
+    ]
+    assert [[rule.agg_type for rule in query_rules.rules] for query_rules in actual] == [
+        ["count"],
+        ["max"],
+        ["min"],
+        ["sum"],
+    ]
+
+
+def test_reconcile_aggregates_with_grouping_sets(mock_spark, databricks_reconciler, tmp_path: Path):
+    source_rows = [Row(s_suppkey=key, s_acctbal=key * 10, s_nationkey=key % 3, s_region=key % 2) for key in range(30)]
+    # a supplier of the nation 1 and the region 0 never reached the target
+    target_rows = [row for row in source_rows if row.s_suppkey != 4]
+    mock_spark.createDataFrame(source_rows).write.mode("overwrite").saveAsTable("default.grouping_sets_source")
+    mock_spark.createDataFrame(target_rows).write.mode("overwrite").saveAsTable("default.grouping_sets_target")
+    schema = [
+        Schema("s_suppkey", "bigint"),
+        Schema("s_acctbal", "bigint"),
+        Schema("s_nationkey", "bigint"),
+        Schema("s_region", "bigint"),
+    ]
+    table_conf = Table(
+        source_name="grouping_sets_source",
+        target_name="grouping_sets_target",
+        aggregates=[
+            Aggregate(type="SUM", agg_columns=["s_acctbal"], group_by_columns=["s_nationkey"]),
+            Aggregate(type="COUNT", agg_columns=["s_suppkey"], group_by_columns=["s_region"]),
+            Aggregate(type="MAX", agg_columns=["s_acctbal"]),
+        ],
+    )
+    reconciler = databricks_reconciler("")
+
+    def reconcile(aggregates_grouping_sets: bool) -> list[tuple]:
+        table_conf.aggregates_grouping_sets = aggregates_grouping_sets
+        with patch("databricks.labs.remorph.reconcile.execute.generate_volume_path", return_value=str(tmp_path)):
+            actual_list = reconciler.reconcile_aggregates(table_conf, schema, schema)
+        counts = []
+        for actual in actual_list:
+            assert actual.rule is not None
+            counts.append(
+                (
+                    actual.rule.column_from_rule,
+                    actual.reconcile_output.mismatch_count,
+                    actual.reconcile_output.missing_in_src_count,
+                    actual.reconcile_output.missing_in_tgt_count,
+                )
+            )
+        return counts
+
+    expected = [
+        ("max_s_acctbal_NA", 0, 0, 0),
+        ("sum_s_acctbal_s_nationkey", 1, 0, 0),
+        ("count_s_suppkey_s_region", 1, 0, 0),
+    ]
+    assert reconcile(aggregates_grouping_sets=True) == expected
+    assert reconcile(aggregates_grouping_sets=False) == expected
+
+
 def test_run_with_invalid_operation_name(monkeypatch):
     test_args = ["databricks_labs_remorph", "invalid-operation"]
     monkeypatch.setattr(sys, 'argv', test_args)
@@ -1,3 +1,4 @@
+from decimal import Decimal
 from pathlib import Path
 import pytest
 from pyspark import Row
@@ -6,12 +7,15 @@ from pyspark.testing import assertDataFrameEqual
 from databricks.labs.remorph.reconcile.compare import (
     alias_column_str,
     capture_mismatch_data_and_columns,
+    estimate_sample_rates,
     reconcile_data,
 )
 from databricks.labs.remorph.reconcile.exception import ColumnMismatchException
+from databricks.labs.remorph.reconcile.recon_capture import ReconIntermediatePersist
 from databricks.labs.remorph.reconcile.recon_config import (
     DataReconcileOutput,
     MismatchOutput,
+    RateEstimate,
 )
 
 
@@ -45,8 +49,8 @@ def test_compare_data_for_report_all(
         target=target,
         key_columns=["s_suppkey", "s_nationkey"],
         report_type="all",
-        spark=mock_spark,
-        path=str(tmp_path),
+        intermediate_persist=ReconIntermediatePersist(mock_spark, str(tmp_path)),
+        sample_rows=50,
     )
     expected = DataReconcileOutput(
         mismatch_count=1,
@@ -60,6 +64,11 @@ def test_compare_data_for_report_all(
     assertDataFrameEqual(actual.mismatch.mismatch_df, expected.mismatch.mismatch_df)
     assertDataFrameEqual(actual.missing_in_src, expected.missing_in_src)
     assertDataFrameEqual(actual.missing_in_tgt, expected.missing_in_tgt)
+    assert (actual.source_record_count, actual.target_record_count) == (4, 4)
+    assert (actual.mismatch_count, actual.missing_in_src_count, actual.missing_in_tgt_count) == (1, 2, 2)
+    # the matched row is counted, only the unmatched rows are persisted
+    assert actual.matched_count == 1
+    assert mock_spark.read.parquet(str(tmp_path)).count() == 5
 
 
 def test_compare_data_for_report_hash(mock_spark, tmp_path: Path):
@@ -92,8 +101,8 @@ def test_compare_data_for_report_hash(mock_spark, tmp_path: Path):
         target=target,
         key_columns=["s_suppkey", "s_nationkey"],
         report_type="hash",
-        spark=mock_spark,
-        path=str(tmp_path),
+        intermediate_persist=ReconIntermediatePersist(mock_spark, str(tmp_path)),
+        sample_rows=50,
     )
     expected = DataReconcileOutput(
         missing_in_src=missing_in_src,
@@ -108,6 +117,42 @@ def test_compare_data_for_report_hash(mock_spark, tmp_path: Path):
     assert not actual.mismatch.mismatch_columns
     assertDataFrameEqual(actual.missing_in_src, expected.missing_in_src)
     assertDataFrameEqual(actual.missing_in_tgt, expected.missing_in_tgt)
+    assert (actual.source_record_count, actual.target_record_count) == (4, 4)
+    assert (actual.mismatch_count, actual.missing_in_src_count, actual.missing_in_tgt_count) == (0, 3, 3)
+    assert actual.matched_count == 1
+
+
+def test_compare_data_with_compact_hash(mock_spark, tmp_path: Path):
+    # a JDBC source returns the integer hash as a decimal, the target as a bigint
+    source = mock_spark.createDataFrame(
+        [
+            Row(s_suppkey=1, hash_value_recon=Decimal(1152921504606846975)),
+            Row(s_suppkey=2, hash_value_recon=Decimal(42)),
+            Row(s_suppkey=3, hash_value_recon=Decimal(7)),
+        ]
+    )
+    target = mock_spark.createDataFrame(
+        [
+            Row(s_suppkey=1, hash_value_recon=1152921504606846975),
+            Row(s_suppkey=2, hash_value_recon=43),
+            Row(s_suppkey=3, hash_value_recon=7),
+        ]
+    )
+
+    actual = reconcile_data(
+        source=source,
+        target=target,
+        key_columns=["s_suppkey"],
+        report_type="data",
+        intermediate_persist=ReconIntermediatePersist(mock_spark, str(tmp_path)),
+        sample_rows=50,
+        compact_hash=True,
+    )
+
+    assert (actual.mismatch_count, actual.missing_in_src_count, actual.missing_in_tgt_count) == (1, 0, 0)
+    assert actual.matched_count == 2
+    assert actual.mismatch.mismatch_df is not None
+    assert [row.s_suppkey for row in actual.mismatch.mismatch_df.collect()] == [2]
 
 
 def test_capture_mismatch_data_and_cols(mock_spark):
@@ -169,6 +214,7 @@ def test_capture_mismatch_data_and_cols(mock_spark):
 
     assertDataFrameEqual(actual.mismatch_df, expected_df)
     assert sorted(actual.mismatch_columns) == ['s_acctbal', 's_name']
+    assert actual.mismatch_column_counts == {'s_acctbal': 1, 's_address': 0, 's_name': 2, 's_phone': 0}
 
 
 def test_capture_mismatch_data_and_cols_fail(mock_spark):
@@ -206,3 +252,25 @@ def test_alias_column_str():
     expected = ['source.col1', 'source.col2', 'source.col3']
 
     assert actual == expected
+
+
+def test_estimate_sample_rates():
+    sample = DataReconcileOutput(
+        mismatch_count=5,
+        missing_in_src_count=0,
+        missing_in_tgt_count=100,
+        source_record_count=100,
+        target_record_count=0,
+    )
+
+    actual = estimate_sample_rates(sample, 2.5)
+
+    assert (actual.sample_percentage, actual.confidence_level) == (2.5, 0.95)
+    assert actual.mismatch_rate.rate == 0.05
+    assert actual.mismatch_rate.lower_bound == pytest.approx(0.0215, abs=1e-4)
+    assert actual.mismatch_rate.upper_bound == pytest.approx(0.1118, abs=1e-4)
+    # nothing was sampled in the target, any rate is possible
+    assert actual.missing_in_src_rate == RateEstimate(rate=0.0, lower_bound=0.0, upper_bound=1.0)
+    assert actual.missing_in_tgt_rate.rate == 1.0
+    assert actual.missing_in_tgt_rate.lower_bound == pytest.approx(0.9630, abs=1e-4)
+    assert actual.missing_in_tgt_rate.upper_bound == 1.0
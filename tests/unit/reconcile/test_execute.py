@@ -1,3 +1,5 @@
+import hashlib
+import threading
 from pathlib import Path
 from dataclasses import dataclass
 from datetime import datetime
@@ -25,6 +27,8 @@ from databricks.labs.remorph.reconcile.exception import (
 )
 from databricks.labs.remorph.reconcile.execute import (
     Reconciliation,
+    _prefetch_schemas,
+    _run_concurrently,
     initialise_data_source,
     recon,
     generate_volume_path,
@@ -32,10 +36,13 @@ from databricks.labs.remorph.reconcile.execute import (
 from databricks.labs.remorph.reconcile.recon_config import (
     DataReconcileOutput,
     MismatchOutput,
+    ReconcileRecordCount,
     ThresholdOutput,
     ReconcileOutput,
     ReconcileTableOutput,
+    Schema,
     StatusOutput,
+    Table,
 )
 from databricks.labs.remorph.reconcile.schema_compare import SchemaCompare
 
@@ -49,6 +56,9 @@ TGT_TABLE = "target_supplier"
 class HashQueries:
     source_hash_query: str
     target_hash_query: str
+    # the hash queries of the tables with thresholds, also reading the threshold columns
+    source_hash_threshold_query: str
+    target_hash_threshold_query: str
 
 
 @dataclass
@@ -105,10 +115,10 @@ def setup_metadata_table(mock_spark, report_tables_schema):
 def query_store(mock_spark):
     source_hash_query = "SELECT LOWER(SHA2(CONCAT(TRIM(s_address), TRIM(s_name), COALESCE(TRIM(s_nationkey), '_null_recon_'), TRIM(s_phone), COALESCE(TRIM(s_suppkey), '_null_recon_')), 256)) AS hash_value_recon, s_nationkey AS s_nationkey, s_suppkey AS s_suppkey FROM :tbl WHERE s_name = 't' AND s_address = 'a'"
     target_hash_query = "SELECT LOWER(SHA2(CONCAT(TRIM(s_address_t), TRIM(s_name), COALESCE(TRIM(s_nationkey_t), '_null_recon_'), TRIM(s_phone_t), COALESCE(TRIM(s_suppkey_t), '_null_recon_')), 256)) AS hash_value_recon, s_nationkey_t AS s_nationkey, s_suppkey_t AS s_suppkey FROM :tbl WHERE s_name = 't' AND s_address_t = 'a'"
-    source_mismatch_query = "WITH recon AS (SELECT 22 AS s_nationkey, 2 AS s_suppkey), src AS (SELECT TRIM(s_address) AS s_address, TRIM(s_name) AS s_name, COALESCE(TRIM(s_nationkey), '_null_recon_') AS s_nationkey, TRIM(s_phone) AS s_phone, COALESCE(TRIM(s_suppkey), '_null_recon_') AS s_suppkey FROM :tbl WHERE s_name = 't' AND s_address = 'a') SELECT src.s_address, src.s_name, src.s_nationkey, src.s_phone, src.s_suppkey FROM src INNER JOIN recon AS recon ON COALESCE(TRIM(src.s_nationkey), '_null_recon_') = COALESCE(TRIM(recon.s_nationkey), '_null_recon_') AND COALESCE(TRIM(src.s_suppkey), '_null_recon_') = COALESCE(TRIM(recon.s_suppkey), '_null_recon_')"
-    target_mismatch_query = "WITH recon AS (SELECT 22 AS s_nationkey, 2 AS s_suppkey), src AS (SELECT TRIM(s_address_t) AS s_address, TRIM(s_name) AS s_name, COALESCE(TRIM(s_nationkey_t), '_null_recon_') AS s_nationkey, TRIM(s_phone_t) AS s_phone, COALESCE(TRIM(s_suppkey_t), '_null_recon_') AS s_suppkey FROM :tbl WHERE s_name = 't' AND s_address_t = 'a') SELECT src.s_address, src.s_name, src.s_nationkey, src.s_phone, src.s_suppkey FROM src INNER JOIN recon AS recon ON COALESCE(TRIM(src.s_nationkey), '_null_recon_') = COALESCE(TRIM(recon.s_nationkey), '_null_recon_') AND COALESCE(TRIM(src.s_suppkey), '_null_recon_') = COALESCE(TRIM(recon.s_suppkey), '_null_recon_')"
-    source_missing_query = "WITH recon AS (SELECT 44 AS s_nationkey, 4 AS s_suppkey), src AS (SELECT TRIM(s_address_t) AS s_address, TRIM(s_name) AS s_name, COALESCE(TRIM(s_nationkey_t), '_null_recon_') AS s_nationkey, TRIM(s_phone_t) AS s_phone, COALESCE(TRIM(s_suppkey_t), '_null_recon_') AS s_suppkey FROM :tbl WHERE s_name = 't' AND s_address_t = 'a') SELECT src.s_address, src.s_name, src.s_nationkey, src.s_phone, src.s_suppkey FROM src INNER JOIN recon AS recon ON COALESCE(TRIM(src.s_nationkey), '_null_recon_') = COALESCE(TRIM(recon.s_nationkey), '_null_recon_') AND COALESCE(TRIM(src.s_suppkey), '_null_recon_') = COALESCE(TRIM(recon.s_suppkey), '_null_recon_')"
-    target_missing_query = "WITH recon AS (SELECT 33 AS s_nationkey, 3 AS s_suppkey), src AS (SELECT TRIM(s_address) AS s_address, TRIM(s_name) AS s_name, COALESCE(TRIM(s_nationkey), '_null_recon_') AS s_nationkey, TRIM(s_phone) AS s_phone, COALESCE(TRIM(s_suppkey), '_null_recon_') AS s_suppkey FROM :tbl WHERE s_name = 't' AND s_address = 'a') SELECT src.s_address, src.s_name, src.s_nationkey, src.s_phone, src.s_suppkey FROM src INNER JOIN recon AS recon ON COALESCE(TRIM(src.s_nationkey), '_null_recon_') = COALESCE(TRIM(recon.s_nationkey), '_null_recon_') AND COALESCE(TRIM(src.s_suppkey), '_null_recon_') = COALESCE(TRIM(recon.s_suppkey), '_null_recon_')"
+    source_mismatch_query = "SELECT TRIM(s_address) AS s_address, TRIM(s_name) AS s_name, COALESCE(TRIM(s_nationkey), '_null_recon_') AS s_nationkey, TRIM(s_phone) AS s_phone, COALESCE(TRIM(s_suppkey), '_null_recon_') AS s_suppkey FROM :tbl WHERE (s_name = 't' AND s_address = 'a') AND (s_nationkey, s_suppkey) IN ((22, 2))"
+    target_mismatch_query = "SELECT TRIM(s_address_t) AS s_address, TRIM(s_name) AS s_name, COALESCE(TRIM(s_nationkey_t), '_null_recon_') AS s_nationkey, TRIM(s_phone_t) AS s_phone, COALESCE(TRIM(s_suppkey_t), '_null_recon_') AS s_suppkey FROM :tbl WHERE (s_name = 't' AND s_address_t = 'a') AND (s_nationkey_t, s_suppkey_t) IN ((22, 2))"
+    source_missing_query = "SELECT TRIM(s_address_t) AS s_address, TRIM(s_name) AS s_name, COALESCE(TRIM(s_nationkey_t), '_null_recon_') AS s_nationkey, TRIM(s_phone_t) AS s_phone, COALESCE(TRIM(s_suppkey_t), '_null_recon_') AS s_suppkey FROM :tbl WHERE (s_name = 't' AND s_address_t = 'a') AND (s_nationkey_t, s_suppkey_t) IN ((44, 4))"
+    target_missing_query = "SELECT TRIM(s_address) AS s_address, TRIM(s_name) AS s_name, COALESCE(TRIM(s_nationkey), '_null_recon_') AS s_nationkey, TRIM(s_phone) AS s_phone, COALESCE(TRIM(s_suppkey), '_null_recon_') AS s_suppkey FROM :tbl WHERE (s_name = 't' AND s_address = 'a') AND (s_nationkey, s_suppkey) IN ((33, 3))"
     source_threshold_query = "SELECT s_nationkey AS s_nationkey, s_suppkey AS s_suppkey, s_acctbal AS s_acctbal FROM :tbl WHERE s_name = 't' AND s_address = 'a'"
     target_threshold_query = "SELECT s_nationkey_t AS s_nationkey, s_suppkey_t AS s_suppkey, s_acctbal_t AS s_acctbal FROM :tbl WHERE s_name = 't' AND s_address_t = 'a'"
     threshold_comparison_query = "SELECT COALESCE(source.s_acctbal, 0) AS s_acctbal_source, COALESCE(databricks.s_acctbal, 0) AS s_acctbal_databricks, CASE WHEN (COALESCE(source.s_acctbal, 0) - COALESCE(databricks.s_acctbal, 0)) = 0 THEN 'Match' WHEN (COALESCE(source.s_acctbal, 0) - COALESCE(databricks.s_acctbal, 0)) BETWEEN 0 AND 100 THEN 'Warning' ELSE 'Failed' END AS s_acctbal_match, source.s_nationkey AS s_nationkey_source, source.s_suppkey AS s_suppkey_source FROM source_supplier_df_threshold_vw AS source INNER JOIN target_target_supplier_df_threshold_vw AS databricks ON source.s_nationkey <=> databricks.s_nationkey AND source.s_suppkey <=> databricks.s_suppkey WHERE (1 = 1 OR 1 = 1) OR (COALESCE(source.s_acctbal, 0) - COALESCE(databricks.s_acctbal, 0)) <> 0"
@@ -118,6 +128,12 @@ def query_store(mock_spark):
     hash_queries = HashQueries(
         source_hash_query=source_hash_query,
         target_hash_query=target_hash_query,
+        source_hash_threshold_query=source_hash_query.replace(
+            "s_suppkey AS s_suppkey FROM", "s_suppkey AS s_suppkey, s_acctbal AS s_acctbal FROM"
+        ),
+        target_hash_threshold_query=target_hash_query.replace(
+            "s_suppkey_t AS s_suppkey FROM", "s_suppkey_t AS s_suppkey, s_acctbal_t AS s_acctbal FROM"
+        ),
     )
     mismatch_queries = MismatchQueries(
         source_mismatch_query=source_mismatch_query,
@@ -164,12 +180,12 @@ def test_reconcile_data_with_mismatches_and_missing(
         (
             CATALOG,
             SCHEMA,
-            query_store.hash_queries.source_hash_query,
+            query_store.hash_queries.source_hash_threshold_query,
         ): mock_spark.createDataFrame(
             [
-                Row(hash_value_recon="a1b", s_nationkey=11, s_suppkey=1),
-                Row(hash_value_recon="c2d", s_nationkey=22, s_suppkey=2),
-                Row(hash_value_recon="e3g", s_nationkey=33, s_suppkey=3),
+                Row(hash_value_recon="a1b", s_nationkey=11, s_suppkey=1, s_acctbal=100),
+                Row(hash_value_recon="c2d", s_nationkey=22, s_suppkey=2, s_acctbal=200),
+                Row(hash_value_recon="e3g", s_nationkey=33, s_suppkey=3, s_acctbal=300),
             ]
         ),
         (CATALOG, SCHEMA, query_store.mismatch_queries.source_mismatch_query): mock_spark.createDataFrame(
@@ -178,9 +194,6 @@ def test_reconcile_data_with_mismatches_and_missing(
         (CATALOG, SCHEMA, query_store.missing_queries.target_missing_query): mock_spark.createDataFrame(
             [Row(s_address="address-3", s_name="name-3", s_nationkey=33, s_phone="333", s_suppkey=3)]
         ),
-        (CATALOG, SCHEMA, query_store.threshold_queries.source_threshold_query): mock_spark.createDataFrame(
-            [Row(s_nationkey=11, s_suppkey=1, s_acctbal=100)]
-        ),
     }
     source_schema_repository = {(CATALOG, SCHEMA, SRC_TABLE): src_schema}
 
@@ -188,12 +201,12 @@ def test_reconcile_data_with_mismatches_and_missing(
         (
             CATALOG,
             SCHEMA,
-            query_store.hash_queries.target_hash_query,
+            query_store.hash_queries.target_hash_threshold_query,
         ): mock_spark.createDataFrame(
             [
-                Row(hash_value_recon="a1b", s_nationkey=11, s_suppkey=1),
-                Row(hash_value_recon="c2de", s_nationkey=22, s_suppkey=2),
-                Row(hash_value_recon="k4l", s_nationkey=44, s_suppkey=4),
+                Row(hash_value_recon="a1b", s_nationkey=11, s_suppkey=1, s_acctbal=210),
+                Row(hash_value_recon="c2de", s_nationkey=22, s_suppkey=2, s_acctbal=200),
+                Row(hash_value_recon="k4l", s_nationkey=44, s_suppkey=4, s_acctbal=400),
             ]
         ),
         (CATALOG, SCHEMA, query_store.mismatch_queries.target_mismatch_query): mock_spark.createDataFrame(
@@ -202,9 +215,6 @@ def test_reconcile_data_with_mismatches_and_missing(
         (CATALOG, SCHEMA, query_store.missing_queries.source_missing_query): mock_spark.createDataFrame(
             [Row(s_address="address-4", s_name="name-4", s_nationkey=44, s_phone="444", s_suppkey=4)]
         ),
-        (CATALOG, SCHEMA, query_store.threshold_queries.target_threshold_query): mock_spark.createDataFrame(
-            [Row(s_nationkey=11, s_suppkey=1, s_acctbal=210)]
-        ),
         (CATALOG, SCHEMA, query_store.threshold_queries.threshold_comparison_query): mock_spark.createDataFrame(
             [
                 Row(
@@ -368,6 +378,19 @@ def test_reconcile_data_with_mismatches_and_missing(
         ),
     )
     assert actual_data_reconcile.threshold_output.threshold_mismatch_count == 1
+    # the threshold columns were read by the hash queries, the rows found on both sides are compared
+    assertDataFrameEqual(
+        mock_spark.table("source_supplier_df_threshold_vw"),
+        mock_spark.createDataFrame(
+            [Row(s_nationkey=11, s_suppkey=1, s_acctbal=100), Row(s_nationkey=22, s_suppkey=2, s_acctbal=200)]
+        ),
+    )
+    assertDataFrameEqual(
+        mock_spark.table("target_target_supplier_df_threshold_vw"),
+        mock_spark.createDataFrame(
+            [Row(s_nationkey=11, s_suppkey=1, s_acctbal=210), Row(s_nationkey=22, s_suppkey=2, s_acctbal=200)]
+        ),
+    )
 
 
 def test_reconcile_data_without_mismatches_and_missing(
@@ -382,16 +405,13 @@ def test_reconcile_data_without_mismatches_and_missing(
         (
             CATALOG,
             SCHEMA,
-            query_store.hash_queries.source_hash_query,
+            query_store.hash_queries.source_hash_threshold_query,
         ): mock_spark.createDataFrame(
             [
-                Row(hash_value_recon="a1b", s_nationkey=11, s_suppkey=1),
-                Row(hash_value_recon="c2d", s_nationkey=22, s_suppkey=2),
+                Row(hash_value_recon="a1b", s_nationkey=11, s_suppkey=1, s_acctbal=100),
+                Row(hash_value_recon="c2d", s_nationkey=22, s_suppkey=2, s_acctbal=200),
             ]
         ),
-        (CATALOG, SCHEMA, query_store.threshold_queries.source_threshold_query): mock_spark.createDataFrame(
-            [Row(s_nationkey=11, s_suppkey=1, s_acctbal=100)]
-        ),
     }
     source_schema_repository = {(CATALOG, SCHEMA, SRC_TABLE): src_schema}
 
@@ -399,16 +419,13 @@ def test_reconcile_data_without_mismatches_and_missing(
         (
             CATALOG,
             SCHEMA,
-            query_store.hash_queries.target_hash_query,
+            query_store.hash_queries.target_hash_threshold_query,
         ): mock_spark.createDataFrame(
             [
-                Row(hash_value_recon="a1b", s_nationkey=11, s_suppkey=1),
-                Row(hash_value_recon="c2d", s_nationkey=22, s_suppkey=2),
+                Row(hash_value_recon="a1b", s_nationkey=11, s_suppkey=1, s_acctbal=110),
+                Row(hash_value_recon="c2d", s_nationkey=22, s_suppkey=2, s_acctbal=200),
             ]
         ),
-        (CATALOG, SCHEMA, query_store.threshold_queries.target_threshold_query): mock_spark.createDataFrame(
-            [Row(s_nationkey=11, s_suppkey=1, s_acctbal=110)]
-        ),
         (CATALOG, SCHEMA, query_store.threshold_queries.threshold_comparison_query): mock_spark.createDataFrame(
             [
                 Row(
@@ -710,6 +727,7 @@ def mock_for_report_type_data(
     target = MockDataSource(target_dataframe_repository, target_schema_repository)
 
     reconcile_config_data = ReconcileConfig(
+        table_concurrency=1,
         data_source="databricks",
         report_type="data",
         secret_scope="remorph_databricks",
@@ -906,6 +924,7 @@ def mock_for_report_type_schema(table_conf_with_opts, table_schema, query_store,
     target = MockDataSource(target_dataframe_repository, target_schema_repository)
 
     reconcile_config_schema = ReconcileConfig(
+        table_concurrency=1,
         data_source="databricks",
         report_type="schema",
         secret_scope="remorph_databricks",
@@ -1103,6 +1122,7 @@ def mock_for_report_type_all(
     source = MockDataSource(source_dataframe_repository, source_schema_repository)
     target = MockDataSource(target_dataframe_repository, target_schema_repository)
     reconcile_config_all = ReconcileConfig(
+        table_concurrency=1,
         data_source="snowflake",
         report_type="all",
         secret_scope="remorph_snowflake",
@@ -1373,6 +1393,7 @@ def mock_for_report_type_row(table_conf_with_opts, table_schema, mock_spark, que
     source = MockDataSource(source_dataframe_repository, source_schema_repository)
     target = MockDataSource(target_dataframe_repository, target_schema_repository)
     reconcile_config_row = ReconcileConfig(
+        table_concurrency=1,
         data_source="snowflake",
         report_type="row",
         secret_scope="remorph_snowflake",
@@ -1516,6 +1537,7 @@ def mock_for_recon_exception(table_conf_with_opts, setup_metadata_table):
     source = MockDataSource({}, {})
     target = MockDataSource({}, {})
     reconcile_config_exception = ReconcileConfig(
+        table_concurrency=1,
         data_source="snowflake",
         report_type="all",
         secret_scope="remorph_snowflake",
@@ -1923,12 +1945,12 @@ def test_reconcile_data_with_threshold_and_row_report_type(
     assert actual.threshold_output.threshold_mismatch_count == 0
 
 
-@patch('databricks.labs.remorph.reconcile.execute.generate_final_reconcile_output')
-def test_recon_output_without_exception(mock_gen_final_recon_output):
+@patch('databricks.labs.remorph.reconcile.execute.ReconCapture')
+def test_recon_output_without_exception(mock_recon_capture):
     mock_workspace_client = MagicMock()
     mock_spark = MagicMock()
     mock_table_recon = MagicMock()
-    mock_gen_final_recon_output.return_value = ReconcileOutput(
+    mock_recon_capture.return_value.get_reconcile_output.return_value = ReconcileOutput(
         recon_id="00112233-4455-6677-8899-aabbccddeeff",
         results=[
             ReconcileTableOutput(
@@ -1944,6 +1966,7 @@ def test_recon_output_without_exception(mock_gen_final_recon_output):
         ],
     )
     reconcile_config = ReconcileConfig(
+        table_concurrency=1,
         data_source="snowflake",
         report_type="all",
         secret_scope="remorph_snowflake",
@@ -1974,3 +1997,150 @@ def test_generate_volume_path(table_conf_with_opts):
         volume_path
         == f"/Volumes/remorph/reconcile/reconcile_volume/{table_conf_with_opts.source_name}_{table_conf_with_opts.target_name}/"
     )
+
+
+def test_run_concurrently_overlaps_source_and_target():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def read(side):
+        barrier.wait()
+        return side
+
+    assert _run_concurrently(lambda: read("source"), lambda: read("target")) == ("source", "target")
+
+
+def test_run_concurrently_raises_source_error():
+    def fail():
+        raise DataSourceRuntimeException("source failed")
+
+    with pytest.raises(DataSourceRuntimeException, match="source failed"):
+        _run_concurrently(fail, lambda: "target")
+
+
+def test_prefetch_schemas_falls_back_to_one_table_at_a_time():
+    supplier_schema = [Schema("s_suppkey", "number")]
+    source = MockDataSource({}, {("org", "data", "supplier"): supplier_schema})
+    nation_schema = [Schema("n_nationkey", "number")]
+    target = MockDataSource(
+        {}, {("org", "data", "supplier"): supplier_schema, ("org", "data", "nation"): nation_schema}
+    )
+    database_config = DatabaseConfig(
+        source_catalog="org", source_schema="data", target_catalog="org", target_schema="data"
+    )
+    tables = [Table(source_name="supplier", target_name="supplier"), Table(source_name="nation", target_name="nation")]
+
+    src_schemas, tgt_schemas = _prefetch_schemas(source, target, tables, database_config)
+
+    # the source has no schema for nation, so its bulk fetch fails and every table is fetched on its own later
+    assert not src_schemas
+    assert tgt_schemas == {"supplier": supplier_schema, "nation": nation_schema}
+
+
+def test_record_count_taken_from_hash_pass(mock_spark):
+    database_config = DatabaseConfig(
+        source_catalog=CATALOG, source_schema=SCHEMA, target_catalog=CATALOG, target_schema=SCHEMA
+    )
+    # neither data source knows the count queries, they must not be run
+    reconciler = Reconciliation(
+        MockDataSource({}, {}),
+        MockDataSource({}, {}),
+        database_config,
+        "all",
+        SchemaCompare(mock_spark),
+        get_dialect("databricks"),
+        mock_spark,
+        ReconcileMetadataConfig(),
+    )
+    table_conf = Table(source_name=SRC_TABLE, target_name=TGT_TABLE)
+
+    record_count = reconciler.get_record_count(
+        table_conf, "all", DataReconcileOutput(source_record_count=5, target_record_count=4)
+    )
+
+    assert record_count == ReconcileRecordCount(source=5, target=4)
+    assert reconciler.get_record_count(table_conf, "schema") == ReconcileRecordCount()
+
+
+def test_reconcile_data_with_hash_buckets(mock_spark, databricks_reconciler, tmp_path: Path):
+    source_rows = [Row(s_suppkey=key, s_name=f"name-{key}") for key in range(1, 101)]
+    target_rows = [Row(s_suppkey=key, s_name="changed" if key == 7 else f"name-{key}") for key in range(2, 102)]
+    mock_spark.createDataFrame(source_rows).write.mode("overwrite").saveAsTable("default.bucket_source")
+    mock_spark.createDataFrame(target_rows).write.mode("overwrite").saveAsTable("default.bucket_target")
+    schema = [Schema("s_suppkey", "bigint"), Schema("s_name", "string")]
+    table_conf = Table(
+        source_name="bucket_source", target_name="bucket_target", join_columns=["s_suppkey"], hash_buckets=8
+    )
+    reconciler = databricks_reconciler("row")
+
+    with patch("databricks.labs.remorph.reconcile.execute.generate_volume_path", return_value=str(tmp_path)):
+        actual = reconciler.reconcile_data(table_conf, schema, schema)
+
+    # key 7 differs, 1 is missing in target and 101 is missing in source
+    assert (actual.missing_in_src_count, actual.missing_in_tgt_count) == (2, 2)
+    assert (actual.source_record_count, actual.target_record_count, actual.matched_count) == (100, 100, 98)
+
+    mock_spark.createDataFrame(source_rows).write.mode("overwrite").saveAsTable("default.bucket_target")
+    with patch("databricks.labs.remorph.reconcile.execute.reconcile_data") as row_level_reconcile:
+        actual = reconciler.reconcile_data(table_conf, schema, schema)
+
+    # every bucket matches, so the row hashes are never compared
+    row_level_reconcile.assert_not_called()
+    assert (actual.missing_in_src_count, actual.missing_in_tgt_count) == (0, 0)
+    assert (actual.source_record_count, actual.target_record_count, actual.matched_count) == (100, 100, 100)
+
+
+def test_reconcile_data_with_sample_report_type(mock_spark, databricks_reconciler, tmp_path: Path):
+    source_rows = [Row(s_suppkey=key, s_name=f"name-{key}") for key in range(2000)]
+    target_rows = [Row(s_suppkey=key, s_name="changed" if key % 7 == 0 else f"name-{key}") for key in range(2000)]
+    mock_spark.createDataFrame(source_rows).write.mode("overwrite").saveAsTable("default.sample_source")
+    mock_spark.createDataFrame(target_rows).write.mode("overwrite").saveAsTable("default.sample_target")
+    schema = [Schema("s_suppkey", "bigint"), Schema("s_name", "string")]
+    table_conf = Table(
+        source_name="sample_source", target_name="sample_target", join_columns=["s_suppkey"], sample_percentage=10
+    )
+    reconciler = databricks_reconciler("sample")
+
+    with patch("databricks.labs.remorph.reconcile.execute.generate_volume_path", return_value=str(tmp_path)):
+        actual = reconciler.reconcile_data(table_conf, schema, schema)
+
+    # the same keys are sampled on both sides: the first 1000 of 10000 buckets of the join column hash
+    sampled_keys = [
+        key for key in range(2000) if int(hashlib.sha256(str(key).encode()).hexdigest()[:8], 16) % 10000 < 1000
+    ]
+    assert actual.sample_output is not None
+    assert (actual.sample_output.source_sample_count, actual.sample_output.target_sample_count) == (
+        len(sampled_keys),
+        len(sampled_keys),
+    )
+    # the record counts are the counts of the tables, not of the sample
+    assert (actual.source_record_count, actual.target_record_count) == (None, None)
+    assert reconciler.get_record_count(table_conf, "sample", actual) == ReconcileRecordCount(source=2000, target=2000)
+    assert actual.mismatch_count == len([key for key in sampled_keys if key % 7 == 0])
+    assert (actual.missing_in_src_count, actual.missing_in_tgt_count) == (0, 0)
+    assert actual.sample_output.sample_percentage == 10
+    assert actual.sample_output.mismatch_rate.rate == actual.mismatch_count / len(sampled_keys)
+    assert actual.sample_output.mismatch_rate.lower_bound < 1 / 7 < actual.sample_output.mismatch_rate.upper_bound
+    assert actual.sample_output.missing_in_tgt_rate.upper_bound < 0.05
+
+
+def test_reconcile_data_stages_a_large_sample_of_missing_rows(mock_spark, databricks_reconciler, tmp_path: Path):
+    source_rows = [Row(s_suppkey=key, s_name=f"name-{key}") for key in range(1500)]
+    mock_spark.createDataFrame(source_rows).write.mode("overwrite").saveAsTable("default.staged_sample_source")
+    mock_spark.createDataFrame(source_rows[:200]).write.mode("overwrite").saveAsTable("default.staged_sample_target")
+    schema = [Schema("s_suppkey", "bigint"), Schema("s_name", "string")]
+    table_conf = Table(
+        source_name="staged_sample_source",
+        target_name="staged_sample_target",
+        join_columns=["s_suppkey"],
+        sample_rows=1200,
+    )
+    reconciler = databricks_reconciler("data")
+
+    with patch("databricks.labs.remorph.reconcile.execute.generate_volume_path", return_value=str(tmp_path)):
+        actual = reconciler.reconcile_data(table_conf, schema, schema)
+
+    assert actual.missing_in_tgt_count == 1300
+    # the 1200 sampled keys were staged in a view, dropped once their rows were read
+    assert actual.missing_in_tgt is not None
+    assert actual.missing_in_tgt.count() == 1200
+    assert not [view for view in mock_spark.catalog.listTables() if "sample_keys" in view.name]
@@ -0,0 +1,218 @@
+import dataclasses
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pyspark.sql import Row
+
+from databricks.labs.remorph.config import DatabaseConfig, ReconcileMetadataConfig, get_dialect
+from databricks.labs.remorph.reconcile.connectors.jdbc_reader import JDBCReaderMixin
+from databricks.labs.remorph.reconcile.execute import Reconciliation
+from databricks.labs.remorph.reconcile.jdbc_partitioning import (
+    get_hash_partitions,
+    get_unpartitioned_options,
+    resolve_fetch_size,
+    resolve_jdbc_reader_options,
+)
+from databricks.labs.remorph.reconcile.schema_compare import SchemaCompare
+from databricks.labs.remorph.reconcile.recon_config import (
+    Filters,
+    JdbcReaderOptions,
+    Schema,
+    Table,
+    Transformation,
+)
+
+SRC_SCHEMA = [
+    Schema("o_orderkey", "number(12,0)"),
+    Schema("o_custkey", "number"),
+    Schema("o_comment", "varchar2(79)"),
+    Schema("o_orderdate", "date"),
+]
+
+
+def test_partitions_derived_from_the_probed_bounds():
+    table_conf = Table(
+        source_name="orders",
+        target_name="orders",
+        join_columns=["o_comment", "o_orderkey"],
+        jdbc_reader_options=JdbcReaderOptions(),
+        filters=Filters(source="o_custkey > 0"),
+    )
+    probes = []
+
+    def probe(query: str) -> Row:
+        probes.append(query)
+        return Row(LOWER_BOUND=Decimal("1.5"), UPPER_BOUND=Decimal("6000000.5"), ROW_COUNT=5_500_000)
+
+    actual = resolve_jdbc_reader_options(table_conf, SRC_SCHEMA, get_dialect("oracle"), probe, 16)
+
+    assert probes == [
+        (
+            "SELECT MIN(o_orderkey) AS lower_bound, MAX(o_orderkey) AS upper_bound, COUNT(1) AS row_count "
+            "FROM :tbl WHERE o_custkey > 0"
+        )
+    ]
+    # a partition per million rows, the rows of the hash query are a hash and the two join columns
+    assert actual == JdbcReaderOptions(
+        number_partitions=6, partition_column="o_orderkey", lower_bound="1", upper_bound="6000001", fetch_size=10_000
+    )
+    assert JDBCReaderMixin._get_jdbc_reader_options(actual) == {
+        "numPartitions": 6,
+        "partitionColumn": "o_orderkey",
+        "lowerBound": "1",
+        "upperBound": "6000001",
+        "fetchsize": 10_000,
+    }
+
+
+def test_table_without_reader_options_is_not_probed():
+    table_conf = Table(source_name="orders", target_name="orders", join_columns=["o_orderkey"])
+
+    def probe(query: str) -> Row:
+        raise AssertionError(f"unexpected probe: {query}")
+
+    assert resolve_jdbc_reader_options(table_conf, SRC_SCHEMA, get_dialect("oracle"), probe, 16) is None
+    assert resolve_fetch_size(table_conf, SRC_SCHEMA, get_dialect("oracle")) is None
+
+
+@pytest.mark.parametrize(
+    "report_type, jdbc_reader_options, expected_options",
+    [
+        # a table without reader options is read as configured
+        ("row", None, None),
+        ("sample", None, None),
+        # a sample reads a fraction of the table, only the fetch size is completed
+        ("sample", JdbcReaderOptions(), JdbcReaderOptions(fetch_size=10_000)),
+    ],
+)
+def test_reconcile_data_sends_no_probe(mock_spark, tmp_path: Path, report_type, jdbc_reader_options, expected_options):
+    table_conf = Table(
+        source_name="orders",
+        target_name="orders",
+        join_columns=["o_orderkey"],
+        jdbc_reader_options=jdbc_reader_options,
+        sample_percentage=10,
+    )
+    schema = [Schema("o_orderkey", "number(12,0)")]
+    hashes = mock_spark.createDataFrame([Row(hash_value_recon="a1", o_orderkey=1)])
+    source, target = MagicMock(), MagicMock()
+    source.read_data.return_value = hashes
+    target.read_data.return_value = hashes
+
+    with patch("databricks.labs.remorph.reconcile.execute.generate_volume_path", return_value=str(tmp_path)):
+        Reconciliation(
+            source,
+            target,
+            DatabaseConfig(source_schema="sales", target_catalog="main", target_schema="sales"),
+            report_type,
+            SchemaCompare(mock_spark),
+            get_dialect("oracle"),
+            mock_spark,
+            ReconcileMetadataConfig(),
+        ).reconcile_data(table_conf, schema, schema)
+
+    # the hash query is the only read of the source
+    source.read_data.assert_called_once()
+    assert "hash_value_recon" in source.read_data.call_args.kwargs["query"]
+    assert source.read_data.call_args.kwargs["options"] == expected_options
+
+
+def test_aggregate_reads_keep_only_the_fetch_size():
+    options = JdbcReaderOptions(number_partitions=4, partition_column="o_orderkey", lower_bound="0", upper_bound="99")
+
+    assert get_unpartitioned_options(dataclasses.replace(options, fetch_size=500)) == JdbcReaderOptions(fetch_size=500)
+    assert get_unpartitioned_options(None) is None
+
+
+def test_partitions_capped_by_the_cluster_cores():
+    table_conf = Table(
+        source_name="orders",
+        target_name="orders",
+        join_columns=["o_orderkey"],
+        jdbc_reader_options=JdbcReaderOptions(partition_column="o_custkey", fetch_size=1000),
+    )
+
+    actual = resolve_jdbc_reader_options(
+        table_conf, SRC_SCHEMA, get_dialect("oracle"), lambda _: Row(1, 150_000, 150_000_000), 8
+    )
+
+    assert actual == JdbcReaderOptions(
+        number_partitions=8, partition_column="o_custkey", lower_bound="1", upper_bound="150000", fetch_size=1000
+    )
+
+
+def test_reads_split_by_the_key_hash_without_a_numeric_join_column():
+    table_conf = Table(
+        source_name="orders",
+        target_name="orders",
+        join_columns=["o_comment", "o_orderkey"],
+        transformations=[Transformation(column_name="o_orderkey", source="to_char(o_orderkey)")],
+        select_columns=["o_comment", "o_orderkey", "o_orderdate"],
+        jdbc_reader_options=JdbcReaderOptions(),
+    )
+    probes = []
+
+    def probe(query: str) -> Row:
+        probes.append(query)
+        return Row(ROW_COUNT=2_000_001)
+
+    actual = resolve_jdbc_reader_options(table_conf, SRC_SCHEMA, get_dialect("oracle"), probe, 16)
+
+    assert probes == ["SELECT COUNT(1) AS row_count FROM :tbl"]
+    assert (actual.number_partitions, actual.partition_column) == (3, None)
+    assert get_hash_partitions(actual) == 3
+    # the reads are split by the hash queries, Spark reads each of them over a single connection
+    assert JDBCReaderMixin._get_jdbc_reader_options(actual) == {"fetchsize": actual.fetch_size}
+    # the number of partitions is kept when given
+    explicit = dataclasses.replace(table_conf, jdbc_reader_options=JdbcReaderOptions(number_partitions=5))
+    assert get_hash_partitions(resolve_jdbc_reader_options(explicit, SRC_SCHEMA, get_dialect("oracle"), probe, 16)) == 5
+    assert len(probes) == 1
+
+
+def test_reads_not_partitioned_without_a_numeric_join_column_or_native_hash():
+    table_conf = Table(
+        source_name="orders",
+        target_name="orders",
+        join_columns=["o_comment"],
+        jdbc_reader_options=JdbcReaderOptions(),
+    )
+
+    def probe(query: str) -> Row:
+        raise AssertionError(f"unexpected probe: {query}")
+
+    actual = resolve_jdbc_reader_options(table_conf, SRC_SCHEMA, get_dialect("databricks"), probe, 16)
+
+    assert actual.number_partitions == 1
+    assert get_hash_partitions(actual) is None
+
+
+def test_explicit_bounds_are_not_probed():
+    options = JdbcReaderOptions(number_partitions=4, partition_column="o_orderkey", lower_bound="0", upper_bound="99")
+    table_conf = Table(
+        source_name="orders", target_name="orders", join_columns=["o_orderkey"], jdbc_reader_options=options
+    )
+
+    def probe(query: str) -> Row:
+        raise AssertionError(f"unexpected probe: {query}")
+
+    actual = resolve_jdbc_reader_options(table_conf, SRC_SCHEMA, get_dialect("snowflake"), probe, 16)
+
+    assert actual == JdbcReaderOptions(
+        number_partitions=4, partition_column="o_orderkey", lower_bound="0", upper_bound="99", fetch_size=10_000
+    )
+    # an empty table is read over a single connection
+    empty = resolve_jdbc_reader_options(
+        Table(
+            source_name="orders",
+            target_name="orders",
+            join_columns=["o_orderkey"],
+            jdbc_reader_options=JdbcReaderOptions(),
+        ),
+        SRC_SCHEMA,
+        get_dialect("snowflake"),
+        lambda _: Row(None, None, 0),
+        16,
+    )
+    assert (empty.number_partitions, empty.lower_bound, empty.upper_bound) == (1, None, None)
@@ -3,15 +3,20 @@ import datetime
 import json
 
 import pytest
+from pyspark import StorageLevel
 from pyspark.sql import Row, SparkSession
 from pyspark.sql.functions import countDistinct
 from pyspark.sql.types import BooleanType, StringType, StructField, StructType
+from databricks.sdk.service.files import DirectoryEntry
 
 from databricks.labs.remorph.config import DatabaseConfig, get_dialect, ReconcileMetadataConfig
-from databricks.labs.remorph.reconcile.exception import WriteToTableException, ReadAndWriteWithVolumeException
+from databricks.labs.remorph.reconcile.exception import (
+    InvalidInputException,
+    WriteToTableException,
+    ReadAndWriteWithVolumeException,
+)
 from databricks.labs.remorph.reconcile.recon_capture import (
     ReconCapture,
-    generate_final_reconcile_output,
     ReconIntermediatePersist,
 )
 from databricks.labs.remorph.reconcile.recon_config import (
@@ -27,6 +32,8 @@ from databricks.labs.remorph.reconcile.recon_config import (
     ReconcileRecordCount,
     TableThresholds,
     TableThresholdBoundsException,
+    RateEstimate,
+    SampleReconcileOutput,
 )
 
 
@@ -304,6 +311,62 @@ def test_test_recon_capture_start_databricks_row(mock_workspace_client, mock_spa
     assert remorph_recon_details_df.select("recon_type").distinct().count() == 2
 
 
+def test_recon_capture_start_databricks_sample(mock_workspace_client, mock_spark):
+    database_config = DatabaseConfig(
+        "source_test_schema", "target_test_catalog", "target_test_schema", "source_test_catalog"
+    )
+    spark = mock_spark
+    recon_capture = ReconCapture(
+        database_config,
+        "73b44582-dbb7-489f-bad1-6a7e8f4821b1",
+        "sample",
+        get_dialect("databricks"),
+        mock_workspace_client,
+        spark,
+        metadata_config=ReconcileMetadataConfig(schema="default"),
+        local_test_run=True,
+    )
+    reconcile_output, schema_output, table_conf, reconcile_process, row_count = data_prep(spark)
+    spark.sql("DROP TABLE IF EXISTS DEFAULT.sample_metrics")
+    reconcile_output.threshold_output = ThresholdOutput()
+    reconcile_output.sample_output = SampleReconcileOutput(
+        sample_percentage=2.5,
+        confidence_level=0.95,
+        mismatch_rate=RateEstimate(rate=0.4, lower_bound=0.1, upper_bound=0.8),
+        missing_in_src_rate=RateEstimate(rate=0.6, lower_bound=0.2, upper_bound=0.9),
+        missing_in_tgt_rate=RateEstimate(rate=0.0, lower_bound=0.0, upper_bound=0.5),
+        source_sample_count=5,
+        target_sample_count=6,
+    )
+    schema_output.compare_df = None
+
+    recon_capture.start(
+        data_reconcile_output=reconcile_output,
+        schema_reconcile_output=schema_output,
+        table_conf=table_conf,
+        recon_process_duration=reconcile_process,
+        record_count=row_count,
+    )
+
+    # the counts of the sample are kept in the metrics
+    row = spark.sql("select * from DEFAULT.metrics").collect()[0]
+    assert row.recon_metrics.row_comparison.missing_in_source == 3
+    assert row.recon_metrics.column_comparison.absolute_mismatch == 2
+    assert row.recon_metrics.schema_comparison is None
+    assert row.run_metrics.status is False
+
+    # and the estimated rates of the table in the sample metrics
+    sample_metrics_df = spark.sql("select * from DEFAULT.sample_metrics")
+    row = sample_metrics_df.collect()[0]
+    assert sample_metrics_df.count() == 1
+    assert row.recon_table_id == spark.sql("select recon_table_id from DEFAULT.main").collect()[0].recon_table_id
+    assert (row.sample_percentage, row.confidence_level) == (2.5, 0.95)
+    assert (row.source_sample_count, row.target_sample_count) == (5, 6)
+    assert row.estimated_rates.mismatch == Row(estimate=0.4, lower_bound=0.1, upper_bound=0.8)
+    assert row.estimated_rates.missing_in_source == Row(estimate=0.6, lower_bound=0.2, upper_bound=0.9)
+    assert row.estimated_rates.missing_in_target == Row(estimate=0.0, lower_bound=0.0, upper_bound=0.5)
+
+
 def test_recon_capture_start_oracle_schema(mock_workspace_client, mock_spark):
     database_config = DatabaseConfig(
         "source_test_schema", "target_test_catalog", "target_test_schema", "source_test_catalog"
@@ -431,7 +494,49 @@ def test_recon_capture_start_with_exception(mock_workspace_client, mock_spark):
         )
 
 
-def test_generate_final_reconcile_output_row(mock_workspace_client, mock_spark):
+def test_recon_capture_buffers_the_tables_until_flushed(mock_workspace_client, mock_spark):
+    database_config = DatabaseConfig(
+        "source_test_schema", "target_test_catalog", "target_test_schema", "source_test_catalog"
+    )
+    reconcile_output, schema_output, _, reconcile_process, row_count = data_prep(mock_spark)
+    recon_capture = ReconCapture(
+        database_config,
+        "73b44582-dbb7-489f-bad1-6a7e8f4821b1",
+        "all",
+        get_dialect("snowflake"),
+        mock_workspace_client,
+        mock_spark,
+        metadata_config=ReconcileMetadataConfig(schema="default"),
+        local_test_run=True,
+        flush_every_tables=2,
+    )
+    for target_name in ("target_supplier", "target_supplier_2", "target_supplier_3"):
+        recon_capture.start(
+            data_reconcile_output=reconcile_output,
+            schema_reconcile_output=schema_output,
+            table_conf=Table(source_name="supplier", target_name=target_name),
+            recon_process_duration=reconcile_process,
+            record_count=row_count,
+        )
+
+    # the first two tables are appended together, the third one waits for the next flush
+    assert mock_spark.sql("select * from DEFAULT.main").count() == 2
+    assert mock_spark.sql("select * from DEFAULT.metrics").count() == 2
+    assert mock_spark.sql("select * from DEFAULT.details").count() == 10
+
+    recon_capture.flush()
+
+    main_rows = mock_spark.sql("select * from DEFAULT.main").collect()
+    assert sorted(row.target_table.table_name for row in main_rows) == [
+        "target_supplier",
+        "target_supplier_2",
+        "target_supplier_3",
+    ]
+    assert mock_spark.sql("select * from DEFAULT.metrics").count() == 3
+    assert mock_spark.sql("select * from DEFAULT.details").count() == 15
+
+
+def test_get_reconcile_output_row(mock_workspace_client, mock_spark):
     database_config = DatabaseConfig(
         "source_test_schema",
         "target_test_catalog",
@@ -459,13 +564,7 @@ def test_generate_final_reconcile_output_row(mock_workspace_client, mock_spark):
         record_count=row_count,
     )
 
-    final_output = generate_final_reconcile_output(
-        "73b44582-dbb7-489f-bad1-6a7e8f4821b1",
-        mock_spark,
-        metadata_config=ReconcileMetadataConfig(schema="default"),
-        local_test_run=True,
-    )
-
+    final_output = recon_capture.get_reconcile_output()
     assert final_output == ReconcileOutput(
         recon_id='73b44582-dbb7-489f-bad1-6a7e8f4821b1',
         results=[
@@ -479,7 +578,7 @@ def test_generate_final_reconcile_output_row(mock_workspace_client, mock_spark):
     )
 
 
-def test_generate_final_reconcile_output_data(mock_workspace_client, mock_spark):
+def test_get_reconcile_output_data(mock_workspace_client, mock_spark):
     database_config = DatabaseConfig(
         "source_test_schema",
         "target_test_catalog",
@@ -507,13 +606,7 @@ def test_generate_final_reconcile_output_data(mock_workspace_client, mock_spark)
         record_count=row_count,
     )
 
-    final_output = generate_final_reconcile_output(
-        "73b44582-dbb7-489f-bad1-6a7e8f4821b1",
-        mock_spark,
-        metadata_config=ReconcileMetadataConfig(schema="default"),
-        local_test_run=True,
-    )
-
+    final_output = recon_capture.get_reconcile_output()
     assert final_output == ReconcileOutput(
         recon_id='73b44582-dbb7-489f-bad1-6a7e8f4821b1',
         results=[
@@ -527,7 +620,7 @@ def test_generate_final_reconcile_output_data(mock_workspace_client, mock_spark)
     )
 
 
-def test_generate_final_reconcile_output_schema(mock_workspace_client, mock_spark):
+def test_get_reconcile_output_schema(mock_workspace_client, mock_spark):
     database_config = DatabaseConfig(
         "source_test_schema",
         "target_test_catalog",
@@ -555,13 +648,7 @@ def test_generate_final_reconcile_output_schema(mock_workspace_client, mock_spar
         record_count=row_count,
     )
 
-    final_output = generate_final_reconcile_output(
-        "73b44582-dbb7-489f-bad1-6a7e8f4821b1",
-        mock_spark,
-        metadata_config=ReconcileMetadataConfig(schema="default"),
-        local_test_run=True,
-    )
-
+    final_output = recon_capture.get_reconcile_output()
     assert final_output == ReconcileOutput(
         recon_id='73b44582-dbb7-489f-bad1-6a7e8f4821b1',
         results=[
@@ -575,7 +662,7 @@ def test_generate_final_reconcile_output_schema(mock_workspace_client, mock_spar
     )
 
 
-def test_generate_final_reconcile_output_all(mock_workspace_client, mock_spark):
+def test_get_reconcile_output_all(mock_workspace_client, mock_spark):
     database_config = DatabaseConfig(
         "source_test_schema",
         "target_test_catalog",
@@ -604,13 +691,7 @@ def test_generate_final_reconcile_output_all(mock_workspace_client, mock_spark):
         record_count=row_count,
     )
 
-    final_output = generate_final_reconcile_output(
-        "73b44582-dbb7-489f-bad1-6a7e8f4821b1",
-        mock_spark,
-        metadata_config=ReconcileMetadataConfig(schema="default"),
-        local_test_run=True,
-    )
-
+    final_output = recon_capture.get_reconcile_output()
     assert final_output == ReconcileOutput(
         recon_id='73b44582-dbb7-489f-bad1-6a7e8f4821b1',
         results=[
@@ -624,7 +705,7 @@ def test_generate_final_reconcile_output_all(mock_workspace_client, mock_spark):
     )
 
 
-def test_generate_final_reconcile_output_exception(mock_workspace_client, mock_spark):
+def test_get_reconcile_output_exception(mock_workspace_client, mock_spark):
     database_config = DatabaseConfig(
         "source_test_schema",
         "target_test_catalog",
@@ -654,13 +735,7 @@ def test_generate_final_reconcile_output_exception(mock_workspace_client, mock_s
         record_count=row_count,
     )
 
-    final_output = generate_final_reconcile_output(
-        "73b44582-dbb7-489f-bad1-6a7e8f4821b1",
-        mock_spark,
-        metadata_config=ReconcileMetadataConfig(schema="default"),
-        local_test_run=True,
-    )
-
+    final_output = recon_capture.get_reconcile_output()
     assert final_output == ReconcileOutput(
         recon_id='73b44582-dbb7-489f-bad1-6a7e8f4821b1',
         results=[
@@ -693,6 +768,60 @@ def test_clean_unmatched_df_from_volume_with_exception(mock_spark):
         ReconIntermediatePersist(mock_spark, path).clean_unmatched_df_from_volume()
 
 
+def test_unmatched_df_persisted_in_memory(mock_spark, tmp_path: Path):
+    df = mock_spark.createDataFrame([Row(id=1, name='John'), Row(id=2, name='Jane')])
+    path = str(tmp_path / "memory")
+    persist = ReconIntermediatePersist(mock_spark, path, "memory")
+
+    persisted_df = persist.write_and_read_unmatched_df_with_volumes(df)
+
+    assert persisted_df.count() == 2
+    # nothing is written to the path
+    assert not Path(path).exists()
+    persist.clean_unmatched_df_from_volume()
+
+
+def test_clean_unmatched_df_unpersists_only_its_own_dataframes(mock_spark, tmp_path: Path):
+    df = mock_spark.createDataFrame([Row(id=1, name='John'), Row(id=2, name='Jane')])
+    path = str(tmp_path / "memory")
+    persist = ReconIntermediatePersist(mock_spark, path, "memory")
+    other_run_persist = ReconIntermediatePersist(mock_spark, path, "memory")
+
+    group_dfs = [
+        persist.write_and_read_unmatched_df_with_volumes(df.filter("id = 1"), "_id"),
+        persist.write_and_read_unmatched_df_with_volumes(df.filter("id = 2"), "_name"),
+    ]
+    other_run_df = other_run_persist.write_and_read_unmatched_df_with_volumes(df.filter("id > 0"))
+    persist.clean_unmatched_df_from_volume()
+
+    assert [group_df.storageLevel for group_df in group_dfs] == [StorageLevel.NONE, StorageLevel.NONE]
+    assert other_run_df.storageLevel == StorageLevel.MEMORY_AND_DISK
+    other_run_persist.clean_unmatched_df_from_volume()
+
+
+def test_clean_unmatched_df_deletes_volume_directory(mock_spark, mock_workspace_client):
+    path = "/Volumes/remorph/reconcile/reconcile_volume/supplier_supplier"
+    mock_workspace_client.files.list_directory_contents.side_effect = lambda directory: {
+        path: [
+            DirectoryEntry(path=f"{path}/part-0.parquet", is_directory=False),
+            DirectoryEntry(path=f"{path}/s_nationkey", is_directory=True),
+        ],
+        f"{path}/s_nationkey": [DirectoryEntry(path=f"{path}/s_nationkey/part-0.parquet", is_directory=False)],
+    }[directory]
+
+    ReconIntermediatePersist(mock_spark, f"{path}/", ws=mock_workspace_client).clean_unmatched_df_from_volume()
+
+    deleted_files = [call.args[0] for call in mock_workspace_client.files.delete.call_args_list]
+    deleted_directories = [call.args[0] for call in mock_workspace_client.files.delete_directory.call_args_list]
+    assert deleted_files == [f"{path}/part-0.parquet", f"{path}/s_nationkey/part-0.parquet"]
+    assert deleted_directories == [f"{path}/s_nationkey", path]
+
+
+def test_invalid_intermediate_storage(mock_spark):
+    with pytest.raises(InvalidInputException, match="Invalid intermediate storage tape"):
+        ReconIntermediatePersist(mock_spark, "/tmp", "tape")
+
+
 def test_apply_threshold_for_mismatch_with_true_absolute(mock_workspace_client, mock_spark):
     database_config = DatabaseConfig(
         "source_test_schema", "target_test_catalog", "target_test_schema", "source_test_catalog"
@@ -925,6 +1054,50 @@ def test_apply_threshold_for_mismatch_with_true_percentage_bound(mock_workspace_
     assert row.run_metrics.status is True
 
 
+def test_apply_percentage_threshold_to_the_sampled_rows(mock_workspace_client, mock_spark):
+    database_config = DatabaseConfig(
+        "source_test_schema", "target_test_catalog", "target_test_schema", "source_test_catalog"
+    )
+    reconcile_output, schema_output, table_conf, reconcile_process, _ = data_prep(mock_spark)
+    mock_spark.sql("DROP TABLE IF EXISTS DEFAULT.sample_metrics")
+    table_conf.table_thresholds = [
+        TableThresholds(lower_bound="0%", upper_bound="10%", model="mismatch"),
+    ]
+    reconcile_output.missing_in_src_count = 0
+    reconcile_output.missing_in_tgt_count = 0
+    reconcile_output.threshold_output = ThresholdOutput()
+    reconcile_output.sample_output = SampleReconcileOutput(
+        sample_percentage=1.0,
+        confidence_level=0.95,
+        mismatch_rate=RateEstimate(rate=0.2, lower_bound=0.05, upper_bound=0.5),
+        missing_in_src_rate=RateEstimate(rate=0.0, lower_bound=0.0, upper_bound=0.3),
+        missing_in_tgt_rate=RateEstimate(rate=0.0, lower_bound=0.0, upper_bound=0.3),
+        source_sample_count=10,
+        target_sample_count=10,
+    )
+    recon_capture = ReconCapture(
+        database_config,
+        "73b44582-dbb7-489f-bad1-6a7e8f4821b1",
+        "sample",
+        get_dialect("snowflake"),
+        mock_workspace_client,
+        mock_spark,
+        metadata_config=ReconcileMetadataConfig(schema="default"),
+        local_test_run=True,
+    )
+
+    # 2 of the 10 sampled rows differ, although they are 0.2% of the 1000 rows of the table
+    table_output = recon_capture.start(
+        data_reconcile_output=reconcile_output,
+        schema_reconcile_output=schema_output,
+        table_conf=table_conf,
+        recon_process_duration=reconcile_process,
+        record_count=ReconcileRecordCount(source=1000, target=1000),
+    )
+
+    assert table_output.status.column is False
+
+
 def test_apply_threshold_for_mismatch_with_invalid_bounds(mock_workspace_client, mock_spark):
     database_config = DatabaseConfig(
         "source_test_schema", "target_test_catalog", "target_test_schema", "source_test_catalog"
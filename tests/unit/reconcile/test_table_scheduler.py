@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from databricks.labs.remorph.reconcile.exception import DataSourceRuntimeException, WriteToTableException
+from databricks.labs.remorph.reconcile.recon_config import Table
+from databricks.labs.remorph.reconcile.table_scheduler import (
+    TableReconScheduler,
+    get_query_concurrency,
+    get_table_concurrency,
+)
+
+
+def test_get_table_concurrency():
+    assert get_table_concurrency("snowflake") == 4
+    assert get_table_concurrency("databricks") == 8
+    assert get_table_concurrency("unknown") == 1
+    assert get_table_concurrency("snowflake", 2) == 2
+    with pytest.raises(ValueError, match="at least 1"):
+        get_table_concurrency("oracle", 0)
+
+
+def test_get_query_concurrency_shares_the_source_concurrency():
+    # the default tables of a source already use its whole concurrency
+    assert get_query_concurrency("oracle", max_queries=4) == 1
+    assert get_query_concurrency("oracle", 1, max_queries=4) == 4
+    assert get_query_concurrency("snowflake", 2, max_queries=4) == 2
+    assert get_query_concurrency("databricks", 2, max_queries=2) == 2
+    assert get_query_concurrency("unknown", 1, max_queries=4) == 1
+    assert get_query_concurrency("snowflake", 1) == 1
+
+
+def test_scheduler_runs_tables_concurrently():
+    tables = [Table(source_name=f"src_{i}", target_name=f"tgt_{i}") for i in range(4)]
+    barrier = threading.Barrier(4, timeout=10)
+    reconciled = []
+
+    def reconcile_table(table_conf: Table):
+        # only passes once all four tables are running at the same time
+        barrier.wait()
+        reconciled.append(table_conf.source_name)
+
+    TableReconScheduler(max_workers=4).run(tables, reconcile_table)
+    assert sorted(reconciled) == ["src_0", "src_1", "src_2", "src_3"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_scheduler_isolates_table_failures(max_workers: int):
+    tables = [Table(source_name=f"src_{i}", target_name=f"tgt_{i}") for i in range(5)]
+    reconciled = []
+
+    def reconcile_table(table_conf: Table):
+        if table_conf.source_name == "src_1":
+            raise DataSourceRuntimeException("boom")
+        reconciled.append(table_conf.source_name)
+
+    with pytest.raises(DataSourceRuntimeException, match="boom"):
+        TableReconScheduler(max_workers=max_workers).run(tables, reconcile_table)
+    assert sorted(reconciled) == ["src_0", "src_2", "src_3", "src_4"]
+
+
+def test_scheduler_raises_the_first_failure_in_the_configuration_order():
+    tables = [Table(source_name=f"src_{i}", target_name=f"tgt_{i}") for i in range(3)]
+
+    def reconcile_table(table_conf: Table):
+        if table_conf.source_name == "src_0":
+            # the first table fails last
+            time.sleep(0.2)
+            raise DataSourceRuntimeException("src_0 failed")
+        if table_conf.source_name == "src_2":
+            raise WriteToTableException("src_2 failed")
+
+    with pytest.raises(DataSourceRuntimeException, match="src_0 failed"):
+        TableReconScheduler(max_workers=3).run(tables, reconcile_table)
+
+
+def test_scheduler_stops_on_unexpected_errors():
+    tables = [Table(source_name=f"src_{i}", target_name=f"tgt_{i}") for i in range(3)]
+
+    def reconcile_table(table_conf: Table):
+        raise RuntimeError(f"bug in {table_conf.source_name}")
+
+    with pytest.raises(RuntimeError, match="bug in src_0"):
+        TableReconScheduler(max_workers=1).run(tables, reconcile_table)
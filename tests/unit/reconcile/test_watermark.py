@@ -0,0 +1,269 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pyspark.sql import Row
+
+from databricks.labs.remorph.config import (
+    DatabaseConfig,
+    ReconcileConfig,
+    ReconcileMetadataConfig,
+    TableRecon,
+    get_dialect,
+)
+from databricks.labs.remorph.reconcile.exception import InvalidInputException, ReconciliationException
+from databricks.labs.remorph.reconcile.execute import _apply_watermark, recon
+from databricks.labs.remorph.reconcile.recon_config import (
+    ColumnMapping,
+    DataReconcileOutput,
+    Filters,
+    ReconcileOutput,
+    ReconcileTableOutput,
+    Schema,
+    StatusOutput,
+    Table,
+    Watermark,
+)
+from databricks.labs.remorph.reconcile.watermark import (
+    WatermarkStore,
+    WatermarkWindow,
+    apply_watermark_window,
+    get_watermark_window,
+    is_temporal_watermark,
+)
+
+DATABASE_CONFIG = DatabaseConfig(
+    source_catalog="spark_catalog", source_schema="default", target_catalog="spark_catalog", target_schema="default"
+)
+
+
+def test_watermark_window_for_timestamps_with_lookback():
+    table_conf = Table(
+        source_name="orders",
+        target_name="orders",
+        column_mapping=[ColumnMapping(source_name="updated_at", target_name="modified_ts")],
+        filters=Filters(source="o_status = 'F'"),
+        watermark=Watermark(column_name="UPDATED_AT", lookback=3600),
+    )
+    tgt_schema = [Schema("o_orderkey", "bigint"), Schema("modified_ts", "timestamp")]
+
+    window = get_watermark_window(
+        table_conf,
+        is_temporal_watermark(table_conf, tgt_schema),
+        "2024-01-02 00:30:00.000000",
+        "2024-01-03 10:00:00.500000",
+    )
+    actual = apply_watermark_window(table_conf, window, get_dialect("oracle"))
+
+    assert window.lower_bound == "2024-01-01 23:30:00.000000"
+    assert actual.filters == Filters(
+        source=(
+            "(o_status = 'F') AND updated_at > TO_TIMESTAMP('2024-01-01 23:30:00.000000', 'YYYY-MM-DD HH24:MI:SS.FF6') "
+            "AND updated_at <= TO_TIMESTAMP('2024-01-03 10:00:00.500000', 'YYYY-MM-DD HH24:MI:SS.FF6')"
+        ),
+        target=(
+            "modified_ts > TO_TIMESTAMP('2024-01-01 23:30:00.000000', 'yyyy-MM-dd HH:mm:ss.SSSSSS') "
+            "AND modified_ts <= TO_TIMESTAMP('2024-01-03 10:00:00.500000', 'yyyy-MM-dd HH:mm:ss.SSSSSS')"
+        ),
+    )
+    # the configuration of the table is left untouched
+    assert table_conf.filters == Filters(source="o_status = 'F'")
+
+
+@pytest.mark.parametrize(
+    "dialect, expected",
+    [
+        (
+            "oracle",
+            (
+                "(o_status = 'F') AND updated_at > TO_TIMESTAMP('2024-01-01 23:30:00.000000', 'YYYY-MM-DD HH24:MI:SS.FF6') "
+                "AND updated_at <= TO_TIMESTAMP('2024-01-03 10:00:00.500000', 'YYYY-MM-DD HH24:MI:SS.FF6')"
+            ),
+        ),
+        (
+            "snowflake",
+            (
+                "(o_status = 'F') AND updated_at > TO_TIMESTAMP('2024-01-01 23:30:00.000000', 'yyyy-mm-DD hh24:mi:ss.ff6') "
+                "AND updated_at <= TO_TIMESTAMP('2024-01-03 10:00:00.500000', 'yyyy-mm-DD hh24:mi:ss.ff6')"
+            ),
+        ),
+    ],
+)
+def test_timestamp_window_filter_of_the_source(dialect, expected):
+    table_conf = Table(
+        source_name="orders",
+        target_name="orders",
+        filters=Filters(source="o_status = 'F'"),
+        watermark=Watermark(column_name="updated_at"),
+    )
+    window = WatermarkWindow(
+        is_temporal=True, lower_bound="2024-01-01 23:30:00.000000", upper_bound="2024-01-03 10:00:00.500000"
+    )
+
+    assert apply_watermark_window(table_conf, window, get_dialect(dialect)).filters.source == expected
+
+
+def test_watermark_window_for_numbers():
+    table_conf = Table(source_name="orders", target_name="orders", watermark=Watermark(column_name="batch_id"))
+    tgt_schema = [Schema("batch_id", "decimal(38,0)")]
+
+    first_run = get_watermark_window(table_conf, is_temporal_watermark(table_conf, tgt_schema), None, "41")
+    next_run = get_watermark_window(table_conf, False, "41", "45")
+
+    assert apply_watermark_window(table_conf, first_run, get_dialect("snowflake")).filters == Filters(
+        source="batch_id <= 41", target="batch_id <= 41"
+    )
+    assert apply_watermark_window(table_conf, next_run, get_dialect("snowflake")).filters == Filters(
+        source="batch_id > 41 AND batch_id <= 45", target="batch_id > 41 AND batch_id <= 45"
+    )
+    # nothing to bound while the target is empty
+    empty = get_watermark_window(table_conf, False, None, None)
+    assert apply_watermark_window(table_conf, empty, get_dialect("snowflake")) is table_conf
+
+
+def test_watermark_must_be_a_number_or_timestamp():
+    table_conf = Table(source_name="orders", target_name="orders", watermark=Watermark(column_name="o_comment"))
+
+    with pytest.raises(InvalidInputException, match="must be a number, date or timestamp"):
+        is_temporal_watermark(table_conf, [Schema("o_comment", "string")])
+    with pytest.raises(InvalidInputException, match="does not exist"):
+        is_temporal_watermark(table_conf, [Schema("o_orderkey", "bigint")])
+    with pytest.raises(ValueError, match="cannot be negative"):
+        Watermark(column_name="batch_id", lookback=-1)
+
+
+def test_watermark_store_keeps_the_latest_watermark(mock_spark):
+    mock_spark.sql("DROP TABLE IF EXISTS default.watermarks")
+    table_conf = Table(source_name="orders", target_name="orders", watermark=Watermark(column_name="batch_id"))
+    other_table_conf = Table(source_name="items", target_name="items", watermark=Watermark(column_name="batch_id"))
+
+    # the watermarks table does not exist before the first run
+    assert (
+        WatermarkStore(mock_spark, DATABASE_CONFIG, "recon-1", local_test_run=True).get_last_watermark(table_conf)
+        is None
+    )
+
+    first_run = WatermarkStore(mock_spark, DATABASE_CONFIG, "recon-1", local_test_run=True)
+    first_run.add_watermark(table_conf, "41")
+    first_run.add_watermark(other_table_conf, "7")
+    # the watermarks are buffered until the flush
+    assert first_run.get_last_watermark(table_conf) is None
+    first_run.flush()
+    store = WatermarkStore(mock_spark, DATABASE_CONFIG, "recon-2", local_test_run=True)
+    store.add_watermark(table_conf, "45")
+    store.flush()
+    # nothing is left to write
+    store.flush()
+
+    assert store.get_last_watermark(table_conf) == "45"
+    assert store.get_last_watermark(other_table_conf) == "7"
+    assert [row.recon_id for row in mock_spark.table("default.watermarks").orderBy("inserted_ts").collect()] == [
+        "recon-1",
+        "recon-1",
+        "recon-2",
+    ]
+
+
+def test_watermark_store_looks_up_the_source_table(mock_spark):
+    mock_spark.sql("DROP TABLE IF EXISTS default.watermarks")
+    table_conf = Table(source_name="orders", target_name="orders", watermark=Watermark(column_name="batch_id"))
+    oracle_config = DatabaseConfig(source_schema="sales", target_catalog="spark_catalog", target_schema="default")
+    other_schema_config = DatabaseConfig(
+        source_schema="archive", target_catalog="spark_catalog", target_schema="default"
+    )
+
+    oracle_run = WatermarkStore(mock_spark, oracle_config, "recon-1", local_test_run=True)
+    oracle_run.add_watermark(table_conf, "41")
+    oracle_run.flush()
+
+    # the same target loaded from another source does not share its watermark
+    assert oracle_run.get_last_watermark(table_conf) == "41"
+    assert (
+        WatermarkStore(mock_spark, DATABASE_CONFIG, "recon-2", local_test_run=True).get_last_watermark(table_conf)
+        is None
+    )
+    assert (
+        WatermarkStore(mock_spark, other_schema_config, "recon-2", local_test_run=True).get_last_watermark(table_conf)
+        is None
+    )
+
+
+def test_incremental_reconcile_only_compares_the_window(mock_spark, databricks_reconciler, tmp_path: Path):
+    source_rows = [Row(o_orderkey=key, batch_id=key // 10) for key in range(100)]
+    # order 25 never reached the target and the rows of batch 9 have not reached it yet
+    target_rows = [row for row in source_rows if row.o_orderkey != 25 and row.batch_id < 9]
+    mock_spark.createDataFrame(source_rows).write.mode("overwrite").saveAsTable("default.watermark_source")
+    mock_spark.createDataFrame(target_rows).write.mode("overwrite").saveAsTable("default.watermark_target")
+    schema = [Schema("o_orderkey", "bigint"), Schema("batch_id", "bigint")]
+    table_conf = Table(
+        source_name="watermark_source",
+        target_name="watermark_target",
+        join_columns=["o_orderkey"],
+        watermark=Watermark(column_name="batch_id", lookback=1),
+    )
+    reconciler = databricks_reconciler("row")
+    watermark_store = MagicMock(spec=WatermarkStore)
+    watermark_store.get_last_watermark.return_value = "4"
+
+    window_table_conf, watermark_value = _apply_watermark(reconciler, watermark_store, table_conf, schema)
+    with patch("databricks.labs.remorph.reconcile.execute.generate_volume_path", return_value=str(tmp_path)):
+        actual = reconciler.reconcile_data(window_table_conf, schema, schema)
+
+    # batches 4 to 8 are compared, batch 4 again because of the lookback
+    assert watermark_value == "8"
+    assert (actual.source_record_count, actual.target_record_count) == (50, 50)
+    assert (actual.missing_in_src_count, actual.missing_in_tgt_count) == (0, 0)
+
+    watermark_store.get_last_watermark.return_value = "1"
+    window_table_conf, _ = _apply_watermark(reconciler, watermark_store, table_conf, schema)
+    with patch("databricks.labs.remorph.reconcile.execute.generate_volume_path", return_value=str(tmp_path)):
+        actual = reconciler.reconcile_data(window_table_conf, schema, schema)
+
+    assert (actual.source_record_count, actual.target_record_count) == (80, 79)
+    assert (actual.missing_in_src_count, actual.missing_in_tgt_count) == (0, 1)
+
+
+@pytest.mark.parametrize("row_matches", [True, False])
+def test_recon_saves_the_watermark_of_a_matching_window_after_its_metrics(row_matches):
+    table_conf = Table(source_name="orders", target_name="orders", watermark=Watermark(column_name="batch_id"))
+    table_output = ReconcileTableOutput(
+        target_table_name="orders",
+        source_table_name="orders",
+        status=StatusOutput(row=row_matches, column=None, schema=None),
+    )
+    reconcile_config = ReconcileConfig(
+        data_source="databricks",
+        report_type="row",
+        secret_scope="scope",
+        database_config=DATABASE_CONFIG,
+        metadata_config=ReconcileMetadataConfig(),
+        table_concurrency=1,
+    )
+    calls = MagicMock()
+    prefix = "databricks.labs.remorph.reconcile.execute"
+    with (
+        patch(f"{prefix}.initialise_data_source", return_value=(MagicMock(), MagicMock())),
+        patch(f"{prefix}.Reconciliation"),
+        patch(f"{prefix}._get_schema", return_value=([], [])),
+        patch(f"{prefix}._apply_watermark", return_value=(table_conf, "8")),
+        patch(f"{prefix}._run_reconcile_data", return_value=DataReconcileOutput()),
+        patch(f"{prefix}.ReconCapture") as recon_capture,
+        patch(f"{prefix}.WatermarkStore") as watermark_store,
+    ):
+        recon_capture.return_value.start.return_value = table_output
+        recon_capture.return_value.get_reconcile_output.return_value = ReconcileOutput("recon", [table_output])
+        calls.attach_mock(recon_capture.return_value.flush, "flush_metrics")
+        calls.attach_mock(watermark_store.return_value.add_watermark, "add_watermark")
+        calls.attach_mock(watermark_store.return_value.flush, "flush_watermarks")
+        table_recon = TableRecon(
+            source_schema="default", target_catalog="spark_catalog", target_schema="default", tables=[table_conf]
+        )
+        if row_matches:
+            recon(MagicMock(), MagicMock(), table_recon, reconcile_config)
+        else:
+            with pytest.raises(ReconciliationException):
+                recon(MagicMock(), MagicMock(), table_recon, reconcile_config)
+
+    # a window that does not match is compared again by the next run
+    saved = ["add_watermark"] if row_matches else []
+    assert [name for name, _, _ in calls.mock_calls] == [*saved, "flush_metrics", "flush_watermarks"]
@@ -710,6 +710,7 @@ def test_configure_reconcile_installation_config_error_continue_install(ws):
                 "catalog": "remorph",
                 "schema": "reconcile",
                 "volume": "reconcile_volume",
+                "intermediate_storage": "volume",
             },
             "version": 1,
         },
@@ -790,6 +791,7 @@ def test_configure_reconcile_no_existing_installation(ws):
                 "catalog": "remorph",
                 "schema": "reconcile",
                 "volume": "reconcile_volume",
+                "intermediate_storage": "volume",
             },
             "version": 1,
         },
@@ -929,6 +931,7 @@ def test_configure_all_override_installation(ws):
                 "catalog": "remorph",
                 "schema": "reconcile",
                 "volume": "reconcile_volume",
+                "intermediate_storage": "volume",
             },
             "version": 1,
         },